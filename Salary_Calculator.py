@@ -1,280 +1,528 @@
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+"""
+Tkinter desktop launcher for the India Salary & Tax Calculator.
 
-def calculate_salary_breakdown(ctc_annual):
-    """
-    Calculates the annual and monthly salary breakdown based on India's
-    New Tax Regime for FY 2025-26, assuming 12 LPA exemption is effectively applied.
+All calculations live in the UI-free ``salary_engine`` package. Importing
+this module neither creates any windows nor loads Tk; tkinter is imported
+and the GUI built by ``main()``, which runs when the file is executed as a
+script.
+"""
 
-    Args:
-        ctc_annual (float): The annual Cost to Company (CTC) in Indian Rupees.
+import logging
+import time
 
-    Returns:
-        dict: A dictionary containing annual and monthly salary breakdown details.
-              Returns None if input is invalid.
-    """
-    results = {}
-
-    # --- Annual Calculations ---
-    
-    # Standard Deduction in New Tax Regime for FY 2025-26
-    # This is a fixed deduction for salaried individuals and pensioners.
-    standard_deduction_annual = 75000
-
-    # PF Contribution (Employee's share: 12% of Basic + DA, capped at Rs. 15,000 basic for calculation purposes)
-    # IMPORTANT SIMPLIFICATION:
-    # In a real-world scenario, CTC is broken down into various components (Basic, HRA, LTA, etc.).
-    # PF is typically calculated on 'Basic Salary' + 'Dearness Allowance (DA)'.
-    # The statutory wage ceiling for PF contribution is ₹15,000 per month (₹1,80,000 annually) for Basic + DA.
-    # For this simplified calculator, we are assuming 'Basic + DA' is 50% of the CTC.
-    # This is a common, but not universal, industry practice. For exact figures,
-    # you would need the precise Basic + DA component of your CTC.
-    
-    pf_basic_limit_annual = 15000 * 12 # Annual statutory limit for Basic + DA for PF calculation
-    assumed_basic_da_annual = ctc_annual * 0.50 # Assuming 50% of CTC is Basic + DA
-
-    if assumed_basic_da_annual > pf_basic_limit_annual:
-        # If assumed Basic+DA exceeds the statutory limit, PF is calculated on the limit.
-        pf_employee_annual = 0.12 * pf_basic_limit_annual
-    else:
-        # Otherwise, PF is calculated on the assumed Basic+DA.
-        pf_employee_annual = 0.12 * assumed_basic_da_annual
-
-    # Taxable Income Calculation (New Regime FY 2025-26)
-    # Under the New Tax Regime, most traditional deductions (like 80C, 80D, HRA exemption)
-    # are not allowed. Only the standard deduction (for salaried) and employer's NPS contribution
-    # (if applicable, not included in this simplified model) are typically considered.
-    # For simplicity, we consider CTC as the starting point and subtract PF and standard deduction.
-    
-    taxable_income_before_rebate = ctc_annual - pf_employee_annual - standard_deduction_annual
-    
-    # Ensure taxable income doesn't go below zero
-    if taxable_income_before_rebate < 0:
-        taxable_income_before_rebate = 0
-
-    # Income Tax Calculation as per New Tax Regime Slabs (FY 2025-26)
-    # Slabs:
-    # Up to ₹4,00,000 – Nil
-    # ₹4,00,001 to ₹8,00,000 – 5%
-    # ₹8,00,001 to ₹12,00,000 – 10%
-    # ₹12,00,001 to ₹16,00,000 – 15%
-    # ₹16,00,001 to ₹20,00,000 – 20%
-    # ₹20,00,001 to ₹24,00,000 – 25%
-    # Above ₹24,00,000 – 30%
-    
-    annual_tax_before_cess = 0
-    income_for_tax_calculation = taxable_income_before_rebate
-
-    # Calculate tax slab by slab, from highest to lowest income bracket
-    if income_for_tax_calculation > 2400000:
-        annual_tax_before_cess += (income_for_tax_calculation - 2400000) * 0.30
-        income_for_tax_calculation = 2400000 # Reduce income to the next slab's upper limit
-    if income_for_tax_calculation > 2000000:
-        annual_tax_before_cess += (income_for_tax_calculation - 2000000) * 0.25
-        income_for_tax_calculation = 2000000
-    if income_for_tax_calculation > 1600000:
-        annual_tax_before_cess += (income_for_tax_calculation - 1600000) * 0.20
-        income_for_tax_calculation = 1600000
-    if income_for_tax_calculation > 1200000:
-        annual_tax_before_cess += (income_for_tax_calculation - 1200000) * 0.15
-        income_for_tax_calculation = 1200000
-    if income_for_tax_calculation > 800000:
-        annual_tax_before_cess += (income_for_tax_calculation - 800000) * 0.10
-        income_for_tax_calculation = 800000
-    if income_for_tax_calculation > 400000:
-        annual_tax_before_cess += (income_for_tax_calculation - 400000) * 0.05
-    # Income up to 4,00,000 is Nil, so no calculation needed for that slab after this point.
-
-    # Section 87A Rebate for FY 2025-26
-    # This rebate ensures that individuals with net taxable income up to ₹12,00,000
-    # pay zero income tax. The maximum rebate is ₹60,000.
-    if taxable_income_before_rebate <= 1200000:
-        annual_tax_before_cess = max(0, annual_tax_before_cess - 60000) # Apply rebate, ensure tax doesn't go negative
-
-    # Surcharge Calculation (Simplified)
-    # Surcharge applies to very high incomes. For this calculator's scope,
-    # we are assuming no surcharge. For incomes > ₹50 Lakhs, surcharge rates apply:
-    # >₹50L to ₹1Cr: 10%
-    # >₹1Cr to ₹2Cr: 15%
-    # >₹2Cr to ₹5Cr: 25%
-    # >₹5Cr: 25% (under new regime, reduced from 37% in old regime)
-    surcharge = 0 
-
-    # Health and Education Cess
-    # A mandatory 4% cess is levied on the income tax (including surcharge, if any).
-    health_cess = annual_tax_before_cess * 0.04
-    
-    total_annual_tax = annual_tax_before_cess + surcharge + health_cess
-
-    # Final In-Hand Salary Calculation (Annual)
-    # This is a simplified "in-hand" calculation.
-    # Actual in-hand salary would also account for other deductions like:
-    # Professional Tax (state-specific), company-specific deductions (e.g., loan repayments,
-    # voluntary deductions, other allowances, etc.).
-    annual_in_hand_salary = ctc_annual - total_annual_tax - pf_employee_annual
-
-    # --- Monthly Calculations ---
-    # Divide annual figures by 12 to get monthly equivalents.
-    monthly_ctc = ctc_annual / 12
-    monthly_pf_deduction = pf_employee_annual / 12
-    monthly_tax = total_annual_tax / 12
-    monthly_in_hand = annual_in_hand_salary / 12
-
-    # Store results in a dictionary
-    results['annual'] = {
-        'Annual CTC': ctc_annual,
-        'Annual Standard Deduction': standard_deduction_annual,
-        'Annual Employee PF Deduction': pf_employee_annual,
-        'Annual Taxable Income (before rebate)': taxable_income_before_rebate,
-        'Total Annual Income Tax': total_annual_tax,
-        'Annual In-Hand Salary': annual_in_hand_salary
-    }
-
-    results['monthly'] = {
-        'Monthly CTC': monthly_ctc,
-        'Monthly Employee PF Deduction': monthly_pf_deduction,
-        'Monthly Income Tax': monthly_tax,
-        'Monthly In-Hand Salary': monthly_in_hand
-    }
-
-    return results
-
-def calculate_and_display():
+from salary_engine import cached_salary_breakdown
+from salary_engine.inverse import solve_ctc_for_in_hand
+
+logger = logging.getLogger(__name__)
+
+# Tkinter is imported by _import_tk() when the first widget is built, so
+# importing this module (for SECTION_HEADINGS or the helpers) does not load Tk.
+tk = ttk = scrolledtext = messagebox = filedialog = None
+
+# Headings shown above each section of the breakdown, in display order.
+SECTION_HEADINGS = {
+    'annual': "--- Annual Breakdown (FY 2025-26, New Regime) ---",
+    'monthly': "\n--- Monthly Breakdown ---",
+}
+
+LIVE_UPDATE_DELAY_MS = 150 # Recalculate this long after the last keystroke
+REPEAT_DELAY_MS = 400 # Hold an adjust button this long before it starts repeating
+REPEAT_INTERVAL_MS = 50 # Then adjust this often while it is held
+
+
+def _import_tk():
+    """Imports tkinter and its submodules into this module's globals on first use."""
+    global tk, ttk, scrolledtext, messagebox, filedialog
+    if tk is None:
+        import tkinter
+        import tkinter.filedialog
+        import tkinter.messagebox
+        import tkinter.scrolledtext
+        import tkinter.ttk
+        ttk, scrolledtext = tkinter.ttk, tkinter.scrolledtext
+        messagebox, filedialog = tkinter.messagebox, tkinter.filedialog
+        tk = tkinter
+
+
+class VirtualTable:
     """
-    Handles the UI interaction: gets CTC input, performs calculations,
-    and displays the results in the text area.
-    Includes error handling for invalid input.
+    A ttk.Treeview that only materializes the rows that are visible.
+
+    Inserting thousands of items into a Treeview is slow, so instead we
+    create ``height`` items once and rewrite their values from the data
+    whenever the view scrolls. A separate scrollbar tracks the position in
+    the full data set.
+
+    Args:
+        parent: Parent widget.
+        headings (dict): Column id -> heading text.
+        row_count (int): Number of rows in the data set.
+        get_row (callable): ``get_row(index)`` returns ``(values, tags)`` for
+            a row.
+        height (int): Number of visible rows.
     """
-    try:
-        ctc_str = ctc_entry.get()
-        if not ctc_str:
-            messagebox.showwarning("Input Error", "Please enter your Annual CTC.")
+
+    def __init__(self, parent, headings, row_count, get_row, height=20):
+        _import_tk()
+        self.row_count = row_count
+        self.get_row = get_row
+        self.offset = 0
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=list(headings), show='headings',
+                                 height=height, selectmode='none')
+        for column, heading in headings.items():
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, anchor='e', width=115, stretch=True)
+        self.tree.tag_configure('cliff', background='#ffe0e0') # Highlight rebate cliff rows
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill='both', expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill='y')
+
+        self.items = [self.tree.insert('', tk.END) for _ in range(min(height, row_count))]
+
+        # Mouse wheel: <MouseWheel> on Windows/macOS, buttons 4/5 on X11
+        self.tree.bind('<MouseWheel>', lambda event: self.scroll_by(-3 if event.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif action == 'scroll':
+            self.scroll_by(int(amount) * (len(self.items) if unit == 'pages' else 1))
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return 'break' # Stop the Treeview from scrolling itself
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.row_count - len(self.items)))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def refresh(self):
+        for position, item in enumerate(self.items):
+            values, tags = self.get_row(self.offset + position)
+            self.tree.item(item, values=values, tags=tags)
+        if self.row_count:
+            self.scrollbar.set(self.offset / self.row_count,
+                               (self.offset + len(self.items)) / self.row_count)
+
+
+class SalaryCalculatorWindow:
+    """Builds the calculator widgets inside a Tk root and handles their events."""
+
+    def __init__(self, root):
+        _import_tk()
+        self.root = root
+        self.displayed_lines = None # Text of each value line currently shown
+        self.line_tags = {} # (section, key) -> tag of that value line
+        self._live_update_id = None
+        self._repeat_id = None
+        self._adjusted_on_press = False # A mouse press adjusted; its click must not again
+        self.build()
+
+    def calculate_and_display(self, live=False):
+        """
+        Handles the UI interaction: gets CTC input, performs calculations,
+        and displays the results in the text area.
+        Includes error handling for invalid input.
+
+        Args:
+            live (bool): True when called while the user is typing. Empty or
+                half-typed input is then ignored instead of showing a dialog.
+
+        Returns:
+            bool: True if the results were updated.
+        """
+        try:
+            ctc_str = self.ctc_entry.get()
+            if not ctc_str:
+                if not live:
+                    messagebox.showwarning("Input Error", "Please enter your Annual CTC.")
+                return False
+
+            ctc_annual = float(ctc_str)
+            if ctc_annual <= 0:
+                if not live:
+                    messagebox.showwarning("Input Error", "Annual CTC must be a positive number.")
+                return False
+
+            start = time.perf_counter()
+            calculations = cached_salary_breakdown(ctc_annual)
+            computed = time.perf_counter()
+            changed_lines = self.render_breakdown(calculations)
+            rendered = time.perf_counter()
+            self.report_timing(computed - start, rendered - computed, changed_lines)
+            return True
+
+        except ValueError:
+            if not live:
+                messagebox.showerror("Input Error", "Please enter a valid numerical value for CTC.")
+        except Exception as e:
+            # Catch any other unexpected errors
+            messagebox.showerror("An Unexpected Error Occurred", str(e))
+        return False
+
+    def render_breakdown(self, calculations):
+        """
+        Shows a breakdown in the output text, rewriting only the lines whose
+        values changed since the last update.
+
+        Every value line gets its own tag (``line_tags`` maps its (section,
+        key) to the tag name), so an update can find the line with
+        ``tag_ranges`` and replace just that text instead of clearing and
+        re-inserting the whole widget. The tag names contain no spaces: Tk
+        would split a tag argument such as 'value:annual:Annual CTC' into
+        several tags.
+
+        Returns:
+            int: Number of lines that were (re)written.
+        """
+        lines = {
+            (section, key): f"{key}: ₹{value:,.2f}" # Format to 2 decimal places with commas
+            for section, values in calculations.items()
+            for key, value in values.items()
+        }
+
+        self.output_text.config(state=tk.NORMAL) # Enable editing to update content
+        if self.displayed_lines is None or lines.keys() != self.displayed_lines.keys():
+            # First result (or a different set of fields): draw everything.
+            self.output_text.delete(1.0, tk.END)
+            self.line_tags = {field: f"value{n}" for n, field in enumerate(lines)}
+            for section, heading in SECTION_HEADINGS.items():
+                self.output_text.insert(tk.END, heading + "\n")
+                for key in calculations[section]:
+                    self.output_text.insert(tk.END, lines[(section, key)], self.line_tags[(section, key)])
+                    self.output_text.insert(tk.END, "\n")
+            changed_lines = len(lines)
+        else:
+            changed_lines = 0
+            for field, text in lines.items():
+                if text == self.displayed_lines[field]:
+                    continue
+                tag = self.line_tags[field]
+                start, end = self.output_text.tag_ranges(tag)
+                self.output_text.delete(start, end)
+                self.output_text.insert(start, text, tag)
+                changed_lines += 1
+        self.output_text.config(state=tk.DISABLED) # Disable editing after displaying results
+
+        self.displayed_lines = lines
+        return changed_lines
+
+    def report_timing(self, compute_seconds, render_seconds, changed_lines):
+        """Shows per-update compute and render time under the results, and logs it."""
+        message = (f"compute {compute_seconds * 1000:.2f} ms · render {render_seconds * 1000:.2f} ms · "
+                   f"{changed_lines} line(s) updated")
+        self.timing_label.config(text=message)
+        logger.debug(message)
+
+    def schedule_live_update(self, event=None):
+        """Debounces typing in the CTC entry: recalculates once typing pauses."""
+        if not self.live_update.get():
+            return
+        if self._live_update_id is not None:
+            self.root.after_cancel(self._live_update_id)
+        self._live_update_id = self.root.after(LIVE_UPDATE_DELAY_MS, self._run_live_update)
+
+    def _run_live_update(self):
+        self._live_update_id = None
+        self.calculate_and_display(live=True)
+
+    def set_ctc_value(self, lacs_per_annum):
+        """Sets the CTC entry to a predefined LPA value."""
+        self.ctc_entry.delete(0, tk.END)
+        self.ctc_entry.insert(0, str(lacs_per_annum * 100000))
+        self.calculate_and_display() # Automatically calculate after setting
+
+    def adjust_ctc_value(self, lacs_to_add, repeating=False):
+        """
+        Adjusts the current CTC value by a given LPA amount.
+
+        Args:
+            lacs_to_add (float): LPA to add (negative to subtract).
+            repeating (bool): True for the auto-repeat while a button is held.
+                No dialogs are shown then: a modal dialog would swallow the
+                button release, and the repeat would never stop.
+
+        Returns:
+            bool: True if the CTC is still positive and the results were
+                  updated, i.e. it makes sense to keep repeating.
+        """
+        try:
+            current_ctc_str = self.ctc_entry.get()
+            if not current_ctc_str:
+                current_ctc = 0.0
+            else:
+                current_ctc = float(current_ctc_str)
+
+            new_ctc = current_ctc + (lacs_to_add * 100000)
+            if new_ctc < 0: # Ensure CTC doesn't go negative
+                new_ctc = 0
+
+            self.ctc_entry.delete(0, tk.END)
+            self.ctc_entry.insert(0, str(new_ctc))
+            # Automatically calculate after adjusting
+            return self.calculate_and_display(live=repeating) and new_ctc > 0
+        except ValueError:
+            if repeating:
+                return False
+            messagebox.showerror("Input Error", "Current CTC is not a valid number. Please enter a number before adjusting.")
+        except Exception as e:
+            if not repeating:
+                messagebox.showerror("An Error Occurred", str(e))
+        return False
+
+    def start_adjusting(self, lacs_to_add):
+        """Adjusts the CTC once, then keeps adjusting while the button is held down."""
+        self.stop_adjusting()
+        self._adjusted_on_press = True
+        if self.adjust_ctc_value(lacs_to_add):
+            self._repeat_id = self.root.after(REPEAT_DELAY_MS, self._repeat_adjust, lacs_to_add)
+
+    def _repeat_adjust(self, lacs_to_add):
+        if self.adjust_ctc_value(lacs_to_add, repeating=True):
+            self._repeat_id = self.root.after(REPEAT_INTERVAL_MS, self._repeat_adjust, lacs_to_add)
+        else:
+            self._repeat_id = None
+
+    def stop_adjusting(self, event=None):
+        if self._repeat_id is not None:
+            self.root.after_cancel(self._repeat_id)
+            self._repeat_id = None
+
+    def release_adjust(self, event=None):
+        self.stop_adjusting()
+        # The button's command runs after this handler for the same release;
+        # forget the press only once it has seen it.
+        self.root.after_idle(self._forget_press)
+
+    def _forget_press(self):
+        self._adjusted_on_press = False
+
+    def adjust_command(self, lacs_to_add):
+        """
+        The button's command: keyboard activation and invoke() adjust once.
+        A mouse click has already adjusted when the button was pressed.
+        """
+        if self._adjusted_on_press:
+            self._adjusted_on_press = False
+            return
+        self.adjust_ctc_value(lacs_to_add)
+
+    def find_ctc_for_in_hand(self):
+        """Solves for the CTC that gives the entered monthly in-hand salary and shows it."""
+        try:
+            target_str = self.in_hand_entry.get()
+            if not target_str:
+                messagebox.showwarning("Input Error", "Please enter the target Monthly In-Hand Salary.")
+                return
+
+            target = float(target_str)
+            if target <= 0:
+                messagebox.showwarning("Input Error", "Monthly In-Hand Salary must be a positive number.")
+                return
+
+            ctc_annual = solve_ctc_for_in_hand(target)
+            self.ctc_entry.delete(0, tk.END)
+            self.ctc_entry.insert(0, f"{ctc_annual:.2f}")
+            self.calculate_and_display() # Show the full breakdown for the solved CTC
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter a valid numerical value for the in-hand salary.")
+        except Exception as e:
+            messagebox.showerror("An Error Occurred", str(e))
+
+    def open_sweep_window(self):
+        """Computes a CTC sweep in one batched call and shows it in a scrollable table."""
+        try:
+            start_lpa = float(self.sweep_from_entry.get())
+            stop_lpa = float(self.sweep_to_entry.get())
+            step_lpa = float(self.sweep_step_entry.get())
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numbers for the sweep range.")
             return
 
-        ctc_annual = float(ctc_str)
-        if ctc_annual <= 0:
-            messagebox.showwarning("Input Error", "Annual CTC must be a positive number.")
+        try:
+            # The sweep uses the NumPy batch engine, which the rest of the app does not need.
+            from salary_engine.sweep import (SWEEP_COLUMNS, format_sweep_row, salary_sweep,
+                                             sweep_points, write_sweep_csv)
+        except ImportError:
+            messagebox.showerror("Missing Dependency", "The sweep needs NumPy: pip install numpy")
             return
 
-        calculations = calculate_salary_breakdown(ctc_annual)
-
-        # Clear previous results in the output text widget
-        output_text.config(state=tk.NORMAL) # Enable editing to clear content
-        output_text.delete(1.0, tk.END)
-
-        # Display Annual Breakdown
-        output_text.insert(tk.END, "--- Annual Breakdown (FY 2025-26, New Regime) ---\n")
-        for key, value in calculations['annual'].items():
-            output_text.insert(tk.END, f"{key}: ₹{value:,.2f}\n") # Format to 2 decimal places with commas
-
-        # Display Monthly Breakdown
-        output_text.insert(tk.END, "\n--- Monthly Breakdown ---\n")
-        for key, value in calculations['monthly'].items():
-            output_text.insert(tk.END, f"{key}: ₹{value:,.2f}\n") # Format to 2 decimal places with commas
-
-        output_text.config(state=tk.DISABLED) # Disable editing after displaying results
-
-    except ValueError:
-        messagebox.showerror("Input Error", "Please enter a valid numerical value for CTC.")
-    except Exception as e:
-        # Catch any other unexpected errors
-        messagebox.showerror("An Unexpected Error Occurred", str(e))
-
-def set_ctc_value(lacs_per_annum):
-    """Sets the CTC entry to a predefined LPA value."""
-    ctc_entry.delete(0, tk.END)
-    ctc_entry.insert(0, str(lacs_per_annum * 100000))
-    calculate_and_display() # Automatically calculate after setting
-
-def adjust_ctc_value(lacs_to_add):
-    """Adjusts the current CTC value by a given LPA amount."""
-    try:
-        current_ctc_str = ctc_entry.get()
-        if not current_ctc_str:
-            current_ctc = 0.0
-        else:
-            current_ctc = float(current_ctc_str)
-        
-        new_ctc = current_ctc + (lacs_to_add * 100000)
-        if new_ctc < 0: # Ensure CTC doesn't go negative
-            new_ctc = 0
-        
-        ctc_entry.delete(0, tk.END)
-        ctc_entry.insert(0, str(new_ctc))
-        calculate_and_display() # Automatically calculate after adjusting
-    except ValueError:
-        messagebox.showerror("Input Error", "Current CTC is not a valid number. Please enter a number before adjusting.")
-    except Exception as e:
-        messagebox.showerror("An Error Occurred", str(e))
-
-
-# --- Tkinter UI Setup ---
-
-# Create the main window
-root = tk.Tk()
-root.title("India Salary & Tax Calculator (FY 2025-26 New Regime)")
-root.geometry("650x650") # Increased height to accommodate new buttons
-root.resizable(False, False) # Prevent resizing for a fixed layout
-
-# Configure styles for a modern look
-style = ttk.Style()
-style.theme_use('clam') # 'clam' or 'alt' often look better than default 'tk'
-style.configure('TLabel', font=('Arial', 10))
-style.configure('TButton', font=('Arial', 10, 'bold'), padding=8)
-style.configure('TEntry', font=('Arial', 10), padding=5)
-style.configure('TLabelFrame.Label', font=('Arial', 11, 'bold'))
-
-# Input Frame: Contains CTC entry and Calculate button
-input_frame = ttk.LabelFrame(root, text="Enter Annual CTC")
-input_frame.pack(padx=20, pady=15, fill="x") # Pad X and Y, fill horizontally
-
-ctc_label = ttk.Label(input_frame, text="Annual CTC (in ₹):")
-ctc_label.pack(side=tk.LEFT, padx=10, pady=10)
-
-ctc_entry = ttk.Entry(input_frame, width=30)
-ctc_entry.pack(side=tk.LEFT, padx=10, pady=10, expand=True, fill='x') # Allow entry to expand
-
-calculate_button = ttk.Button(input_frame, text="Calculate Tax", command=calculate_and_display)
-calculate_button.pack(side=tk.LEFT, padx=10, pady=10)
-
-# Quick Set CTC Buttons Frame
-quick_set_frame = ttk.LabelFrame(root, text="Quick Set CTC")
-quick_set_frame.pack(padx=20, pady=10, fill="x")
-
-btn_10lpa = ttk.Button(quick_set_frame, text="10 LPA", command=lambda: set_ctc_value(10))
-btn_10lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-btn_20lpa = ttk.Button(quick_set_frame, text="20 LPA", command=lambda: set_ctc_value(20))
-btn_20lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-btn_50lpa = ttk.Button(quick_set_frame, text="50 LPA", command=lambda: set_ctc_value(50))
-btn_50lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-# Adjust CTC Buttons Frame
-adjust_ctc_frame = ttk.LabelFrame(root, text="Adjust Current CTC")
-adjust_ctc_frame.pack(padx=20, pady=10, fill="x")
-
-btn_add_5lpa = ttk.Button(adjust_ctc_frame, text="+5 LPA", command=lambda: adjust_ctc_value(5))
-btn_add_5lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-btn_add_2lpa = ttk.Button(adjust_ctc_frame, text="+2 LPA", command=lambda: adjust_ctc_value(2))
-btn_add_2lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-btn_sub_2lpa = ttk.Button(adjust_ctc_frame, text="-2 LPA", command=lambda: adjust_ctc_value(-2))
-btn_sub_2lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-btn_sub_5lpa = ttk.Button(adjust_ctc_frame, text="-5 LPA", command=lambda: adjust_ctc_value(-5))
-btn_sub_5lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
-
-# Output Frame: Displays the calculation results
-output_frame = ttk.LabelFrame(root, text="Calculation Results")
-output_frame.pack(padx=20, pady=10, fill="both", expand=True) # Fill both and expand
-
-# ScrolledText widget for displaying results, allowing scrolling if content is long
-output_text = scrolledtext.ScrolledText(output_frame, wrap=tk.WORD, state=tk.DISABLED, 
-                                        width=70, height=15, font=('Consolas', 10),
-                                        background='#f0f0f0', foreground='#333333')
-output_text.pack(padx=10, pady=10, fill="both", expand=True)
-
-# Run the Tkinter event loop
-root.mainloop()
+        try:
+            start = time.perf_counter()
+            sweep = salary_sweep(sweep_points(start_lpa, stop_lpa, step_lpa))
+            compute_seconds = time.perf_counter() - start
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        def get_row(index):
+            return format_sweep_row(sweep, index), ('cliff',) if sweep['rebate_cliff'][index] else ()
+
+        def export_csv():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension='.csv',
+                                                filetypes=[("CSV files", "*.csv")],
+                                                initialfile="salary_sweep.csv")
+            if path:
+                try:
+                    write_sweep_csv(sweep, path)
+                except OSError as e:
+                    messagebox.showerror("Export Failed", str(e), parent=window)
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Salary Sweep: {start_lpa:g} to {stop_lpa:g} LPA in {step_lpa:g} LPA steps")
+        window.geometry("860x560")
+
+        table = VirtualTable(window, SWEEP_COLUMNS, len(sweep['ctc']), get_row)
+        table.frame.pack(padx=10, pady=10, fill='both', expand=True)
+
+        footer = ttk.Frame(window)
+        footer.pack(padx=10, pady=(0, 10), fill='x')
+        ttk.Label(footer, text=f"{len(sweep['ctc']):,} points computed in {compute_seconds * 1000:.1f} ms · "
+                               f"rows in red are in the 87A rebate cliff").pack(side=tk.LEFT)
+        ttk.Button(footer, text="Export CSV", command=export_csv).pack(side=tk.RIGHT)
+
+    # --- Tkinter UI Setup ---
+
+    def build(self):
+        root = self.root
+        root.title("India Salary & Tax Calculator (FY 2025-26 New Regime)")
+        root.geometry("650x830") # Increased height to accommodate new buttons
+        root.resizable(False, False) # Prevent resizing for a fixed layout
+
+        # Configure styles for a modern look
+        style = ttk.Style()
+        style.theme_use('clam') # 'clam' or 'alt' often look better than default 'tk'
+        style.configure('TLabel', font=('Arial', 10))
+        style.configure('TButton', font=('Arial', 10, 'bold'), padding=8)
+        style.configure('TEntry', font=('Arial', 10), padding=5)
+        style.configure('TLabelFrame.Label', font=('Arial', 11, 'bold'))
+
+        # Input Frame: Contains CTC entry and Calculate button
+        input_frame = ttk.LabelFrame(root, text="Enter Annual CTC")
+        input_frame.pack(padx=20, pady=15, fill="x") # Pad X and Y, fill horizontally
+
+        ctc_label = ttk.Label(input_frame, text="Annual CTC (in ₹):")
+        ctc_label.pack(side=tk.LEFT, padx=10, pady=10)
+
+        self.ctc_entry = ttk.Entry(input_frame, width=30)
+        self.ctc_entry.pack(side=tk.LEFT, padx=10, pady=10, expand=True, fill='x') # Allow entry to expand
+        self.ctc_entry.bind('<KeyRelease>', self.schedule_live_update)
+        self.ctc_entry.bind('<Return>', lambda event: self.calculate_and_display())
+
+        # Live mode: recalculate as you type (debounced)
+        self.live_update = tk.BooleanVar(value=True)
+        live_check = ttk.Checkbutton(input_frame, text="Live", variable=self.live_update)
+        live_check.pack(side=tk.LEFT, padx=(0, 5), pady=10)
+
+        calculate_button = ttk.Button(input_frame, text="Calculate Tax", command=self.calculate_and_display)
+        calculate_button.pack(side=tk.LEFT, padx=10, pady=10)
+
+        # Quick Set CTC Buttons Frame
+        quick_set_frame = ttk.LabelFrame(root, text="Quick Set CTC")
+        quick_set_frame.pack(padx=20, pady=10, fill="x")
+
+        btn_10lpa = ttk.Button(quick_set_frame, text="10 LPA", command=lambda: self.set_ctc_value(10))
+        btn_10lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+
+        btn_20lpa = ttk.Button(quick_set_frame, text="20 LPA", command=lambda: self.set_ctc_value(20))
+        btn_20lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+
+        btn_50lpa = ttk.Button(quick_set_frame, text="50 LPA", command=lambda: self.set_ctc_value(50))
+        btn_50lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+
+        # Adjust CTC Buttons Frame
+        adjust_ctc_frame = ttk.LabelFrame(root, text="Adjust Current CTC")
+        adjust_ctc_frame.pack(padx=20, pady=10, fill="x")
+
+        btn_add_5lpa = ttk.Button(adjust_ctc_frame, text="+5 LPA")
+        btn_add_5lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+        self.bind_repeating_adjust(btn_add_5lpa, 5)
+
+        btn_add_2lpa = ttk.Button(adjust_ctc_frame, text="+2 LPA")
+        btn_add_2lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+        self.bind_repeating_adjust(btn_add_2lpa, 2)
+
+        btn_sub_2lpa = ttk.Button(adjust_ctc_frame, text="-2 LPA")
+        btn_sub_2lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+        self.bind_repeating_adjust(btn_sub_2lpa, -2)
+
+        btn_sub_5lpa = ttk.Button(adjust_ctc_frame, text="-5 LPA")
+        btn_sub_5lpa.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill='x')
+        self.bind_repeating_adjust(btn_sub_5lpa, -5)
+
+        # Inverse Frame: Finds the CTC needed for a target monthly in-hand salary
+        inverse_frame = ttk.LabelFrame(root, text="Find CTC for Monthly In-Hand")
+        inverse_frame.pack(padx=20, pady=10, fill="x")
+
+        in_hand_label = ttk.Label(inverse_frame, text="Monthly In-Hand (in ₹):")
+        in_hand_label.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.in_hand_entry = ttk.Entry(inverse_frame, width=20)
+        self.in_hand_entry.pack(side=tk.LEFT, padx=10, pady=5, expand=True, fill='x')
+
+        find_ctc_button = ttk.Button(inverse_frame, text="Find CTC", command=self.find_ctc_for_in_hand)
+        find_ctc_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        # Sweep Frame: Compares a whole range of CTCs in a table
+        sweep_frame = ttk.LabelFrame(root, text="Sweep CTC Range (LPA)")
+        sweep_frame.pack(padx=20, pady=10, fill="x")
+
+        ttk.Label(sweep_frame, text="From:").pack(side=tk.LEFT, padx=(10, 2), pady=5)
+        self.sweep_from_entry = ttk.Entry(sweep_frame, width=7)
+        self.sweep_from_entry.insert(0, "5")
+        self.sweep_from_entry.pack(side=tk.LEFT, padx=2, pady=5)
+
+        ttk.Label(sweep_frame, text="To:").pack(side=tk.LEFT, padx=(10, 2), pady=5)
+        self.sweep_to_entry = ttk.Entry(sweep_frame, width=7)
+        self.sweep_to_entry.insert(0, "100")
+        self.sweep_to_entry.pack(side=tk.LEFT, padx=2, pady=5)
+
+        ttk.Label(sweep_frame, text="Step:").pack(side=tk.LEFT, padx=(10, 2), pady=5)
+        self.sweep_step_entry = ttk.Entry(sweep_frame, width=7)
+        self.sweep_step_entry.insert(0, "0.5")
+        self.sweep_step_entry.pack(side=tk.LEFT, padx=2, pady=5)
+
+        sweep_button = ttk.Button(sweep_frame, text="Show Sweep", command=self.open_sweep_window)
+        sweep_button.pack(side=tk.RIGHT, padx=10, pady=5)
+
+        # Output Frame: Displays the calculation results
+        output_frame = ttk.LabelFrame(root, text="Calculation Results")
+        output_frame.pack(padx=20, pady=10, fill="both", expand=True) # Fill both and expand
+
+        # ScrolledText widget for displaying results, allowing scrolling if content is long
+        self.output_text = scrolledtext.ScrolledText(output_frame, wrap=tk.WORD, state=tk.DISABLED,
+                                                     width=70, height=15, font=('Consolas', 10),
+                                                     background='#f0f0f0', foreground='#333333')
+        self.output_text.pack(padx=10, pady=10, fill="both", expand=True)
+
+        # Per-update compute and render time
+        self.timing_label = ttk.Label(root, text="", foreground='#777777', font=('Arial', 8))
+        self.timing_label.pack(padx=20, pady=(0, 5), anchor='e')
+
+    def bind_repeating_adjust(self, button, lacs_to_add):
+        """Makes an adjust button repeat while held down, like a spinbox arrow."""
+        button.configure(command=lambda: self.adjust_command(lacs_to_add))
+        button.bind('<ButtonPress-1>', lambda event: self.start_adjusting(lacs_to_add))
+        button.bind('<ButtonRelease-1>', self.release_adjust)
+        button.bind('<Leave>', self.stop_adjusting)
+
+
+def main():
+    _import_tk()
+    # Create the main window
+    root = tk.Tk()
+    SalaryCalculatorWindow(root)
+
+    # Run the Tkinter event loop
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
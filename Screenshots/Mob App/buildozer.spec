@@ -4,7 +4,7 @@ package.name = salarycalculator
 package.domain = com.senkvarghese.salarycalculator
 
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas
+source.include_exts = py,png,jpg,kv,atlas,json
 
 version = 1.0
 requirements = python3,kivy,kivymd
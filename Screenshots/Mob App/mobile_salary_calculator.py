@@ -1,25 +1,137 @@
+import os
+import sys
+import threading
+
+# Only what the first screen needs is imported here. Dialogs, cards and the
+# recycled lists are imported where they are first used, which keeps them
+# off the cold start path on slow devices.
 from kivymd.app import MDApp
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationItem
 from kivymd.uix.textfield import MDTextField
-from kivymd.uix.button import MDRaisedButton, MDIconButton
+from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.card import MDCard
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.button import MDFlatButton
+from kivy.clock import Clock
 from kivy.metrics import dp
 
+# The calculation engine is the repository's top-level salary_engine
+# package. An Android build ships a copy of it next to this file (see
+# README.md); run from a checkout, it is found two directories up. The
+# root is appended, so a copy next to this file takes precedence.
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if os.path.isdir(os.path.join(_REPOSITORY_ROOT, 'salary_engine')):
+    sys.path.append(_REPOSITORY_ROOT)
+
+from salary_engine import cached_salary_breakdown, calculate_salary_breakdown
+from salary_engine.cache import default_cache
+
+SECTION_TITLES = {
+    'annual': "Annual Breakdown",
+    'monthly': "Monthly Breakdown",
+}
+
+HISTORY_SIZE = 50
+MAX_SWEEP_ROWS = 2000
+
+# Recent results and settings, saved in the app's user data directory when
+# the app is paused or closed and loaded again after the first frame.
+STATE_FILE = "salary_calculator_state.json"
+STATE_VERSION = 1
+SAVED_RESULTS = 50
+
+def format_ctc(ctc_annual):
+    """
+    Formats a CTC for the input field so that it parses back to exactly the
+    same number (and so hits the same cache entry): 1000000.0 -> "1000000",
+    1234567.5 -> "1234567.5".
+    """
+    text = repr(float(ctc_annual))
+    return text[:-2] if text.endswith(".0") else text
+
+def create_recycle_list(row_height):
+    """
+    Creates a RecycleView of TwoLineListItems.
+
+    Only the rows on screen (plus a few spare) exist as widgets; scrolling
+    rebinds them to other entries of ``data``, so the list can hold
+    thousands of rows at the cost of a handful of widgets.
+    """
+    from kivy.uix.recycleboxlayout import RecycleBoxLayout
+    from kivy.uix.recycleview import RecycleView
+    from kivymd.uix.list import TwoLineListItem
+
+    recycle_view = RecycleView(viewclass=TwoLineListItem)
+    layout = RecycleBoxLayout(
+        orientation="vertical",
+        default_size=(None, row_height),
+        default_size_hint=(1, None),
+        size_hint_y=None
+    )
+    layout.bind(minimum_height=layout.setter("height"))
+    recycle_view.add_widget(layout)
+    return recycle_view
+
 class SalaryCalculatorApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.dialog = None
+        # Result labels by section and key, created on the first calculation
+        # and only updated afterwards.
+        self.result_labels = {}
+        self.history = []
+        # The History and Sweep tabs are filled in after the first frame.
+        self.history_view = None
+        self.sweep_view = None
 
     def build(self):
         self.theme_cls.theme_style = "Light"
         self.theme_cls.primary_palette = "Blue"
-        
+
         screen = MDScreen()
+        self.navigation = MDBottomNavigation()
+
+        calculate_tab = MDBottomNavigationItem(name="calculate", text="Calculate", icon="calculator")
+        calculate_tab.add_widget(self.build_calculate_tab())
+        self.history_tab = MDBottomNavigationItem(name="history", text="History", icon="history")
+        self.sweep_tab = MDBottomNavigationItem(name="sweep", text="Sweep", icon="chart-line")
+        # In case a tab is pressed before finish_startup has filled it in
+        self.history_tab.bind(on_tab_press=self.build_deferred_tabs)
+        self.sweep_tab.bind(on_tab_press=self.build_deferred_tabs)
+
+        self.navigation.add_widget(calculate_tab)
+        self.navigation.add_widget(self.history_tab)
+        self.navigation.add_widget(self.sweep_tab)
+
+        screen.add_widget(self.navigation)
+        return screen
+
+    def on_start(self):
+        from kivy.core.window import Window
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, window):
+        window.unbind(on_flip=self.on_first_frame)
+        Clock.schedule_once(self.finish_startup)
+
+    def finish_startup(self, *args):
+        """Builds the hidden tabs and loads the saved state, once the first frame is on screen."""
+        self.build_deferred_tabs()
+        threading.Thread(target=self.read_saved_state, daemon=True).start()
+
+    def build_deferred_tabs(self, *args):
+        if self.history_view is not None:
+            return
+        self.history_tab.add_widget(self.build_history_tab())
+        self.sweep_tab.add_widget(self.build_sweep_tab())
+        self.refresh_history_view()
+
+    def show_tab(self, name):
+        self.build_deferred_tabs()
+        self.navigation.switch_tab(name)
+
+    def build_calculate_tab(self):
         main_layout = MDBoxLayout(
             orientation="vertical",
             padding=dp(20),
@@ -50,7 +162,7 @@ class SalaryCalculatorApp(MDApp):
             size_hint_y=None,
             height=dp(40)
         )
-        
+
         for lpa in [10, 20, 50]:
             btn = MDRaisedButton(
                 text=f"{lpa} LPA",
@@ -82,9 +194,44 @@ class SalaryCalculatorApp(MDApp):
         main_layout.add_widget(quick_buttons_layout)
         main_layout.add_widget(calculate_btn)
         main_layout.add_widget(self.results_scroll)
+        return main_layout
 
-        screen.add_widget(main_layout)
-        return screen
+    def build_history_tab(self):
+        layout = MDBoxLayout(orientation="vertical", padding=dp(10))
+        # Tapping an entry loads that CTC back into the calculator.
+        self.history_view = create_recycle_list(dp(72))
+        layout.add_widget(self.history_view)
+        return layout
+
+    def build_sweep_tab(self):
+        layout = MDBoxLayout(orientation="vertical", padding=dp(10), spacing=dp(10))
+
+        inputs_layout = MDBoxLayout(
+            orientation="horizontal",
+            spacing=dp(10),
+            size_hint_y=None,
+            height=dp(56)
+        )
+        self.sweep_from_input = MDTextField(hint_text="From (LPA)", text="5", input_filter="float")
+        self.sweep_to_input = MDTextField(hint_text="To (LPA)", text="50", input_filter="float")
+        self.sweep_step_input = MDTextField(hint_text="Step (LPA)", text="0.5", input_filter="float")
+        inputs_layout.add_widget(self.sweep_from_input)
+        inputs_layout.add_widget(self.sweep_to_input)
+        inputs_layout.add_widget(self.sweep_step_input)
+
+        sweep_btn = MDRaisedButton(
+            text="Sweep CTC Range",
+            size_hint_y=None,
+            height=dp(48),
+            on_release=self.run_sweep
+        )
+
+        self.sweep_view = create_recycle_list(dp(72))
+
+        layout.add_widget(inputs_layout)
+        layout.add_widget(sweep_btn)
+        layout.add_widget(self.sweep_view)
+        return layout
 
     def set_ctc_value(self, lpa):
         self.ctc_input.text = str(lpa * 100000)
@@ -101,93 +248,37 @@ class SalaryCalculatorApp(MDApp):
                 self.show_error("Annual CTC must be positive")
                 return
 
-            results = self.calculate_salary_breakdown(ctc_annual)
+            results = cached_salary_breakdown(ctc_annual)
             self.display_results(results)
+            self.add_to_history(ctc_annual, results)
 
         except ValueError:
             self.show_error("Please enter a valid number")
 
-    def calculate_salary_breakdown(self, ctc_annual):
-        results = {}
-        
-        standard_deduction_annual = 75000
-        pf_basic_limit_annual = 15000 * 12
-        assumed_basic_da_annual = ctc_annual * 0.50
-
-        if assumed_basic_da_annual > pf_basic_limit_annual:
-            pf_employee_annual = 0.12 * pf_basic_limit_annual
-        else:
-            pf_employee_annual = 0.12 * assumed_basic_da_annual
-
-        taxable_income_before_rebate = max(0, ctc_annual - pf_employee_annual - standard_deduction_annual)
-
-        annual_tax_before_cess = 0
-        income_for_tax_calculation = taxable_income_before_rebate
-
-        if income_for_tax_calculation > 2400000:
-            annual_tax_before_cess += (income_for_tax_calculation - 2400000) * 0.30
-            income_for_tax_calculation = 2400000
-        if income_for_tax_calculation > 2000000:
-            annual_tax_before_cess += (income_for_tax_calculation - 2000000) * 0.25
-            income_for_tax_calculation = 2000000
-        if income_for_tax_calculation > 1600000:
-            annual_tax_before_cess += (income_for_tax_calculation - 1600000) * 0.20
-            income_for_tax_calculation = 1600000
-        if income_for_tax_calculation > 1200000:
-            annual_tax_before_cess += (income_for_tax_calculation - 1200000) * 0.15
-            income_for_tax_calculation = 1200000
-        if income_for_tax_calculation > 800000:
-            annual_tax_before_cess += (income_for_tax_calculation - 800000) * 0.10
-            income_for_tax_calculation = 800000
-        if income_for_tax_calculation > 400000:
-            annual_tax_before_cess += (income_for_tax_calculation - 400000) * 0.05
-
-        if taxable_income_before_rebate <= 1200000:
-            annual_tax_before_cess = max(0, annual_tax_before_cess - 60000)
-
-        health_cess = annual_tax_before_cess * 0.04
-        total_annual_tax = annual_tax_before_cess + health_cess
-        annual_in_hand_salary = ctc_annual - total_annual_tax - pf_employee_annual
-
-        results['annual'] = {
-            'Annual CTC': ctc_annual,
-            'Annual Standard Deduction': standard_deduction_annual,
-            'Annual Employee PF Deduction': pf_employee_annual,
-            'Annual Taxable Income (before rebate)': taxable_income_before_rebate,
-            'Total Annual Income Tax': total_annual_tax,
-            'Annual In-Hand Salary': annual_in_hand_salary
-        }
-
-        results['monthly'] = {
-            'Monthly CTC': ctc_annual / 12,
-            'Monthly Employee PF Deduction': pf_employee_annual / 12,
-            'Monthly Income Tax': total_annual_tax / 12,
-            'Monthly In-Hand Salary': annual_in_hand_salary / 12
-        }
-
-        return results
-
     def display_results(self, results):
-        self.results_layout.clear_widgets()
+        if not self.result_labels:
+            for section, data in results.items():
+                self.results_layout.add_widget(self.create_results_card(section, data))
 
-        annual_card = self.create_results_card("Annual Breakdown", results['annual'])
-        self.results_layout.add_widget(annual_card)
+        # Only the label texts change; the cards and labels are reused.
+        for section, data in results.items():
+            for key, value in data.items():
+                self.result_labels[section][key].text = f"{key}: ₹{value:,.2f}"
 
-        monthly_card = self.create_results_card("Monthly Breakdown", results['monthly'])
-        self.results_layout.add_widget(monthly_card)
+    def create_results_card(self, section, data):
+        from kivymd.uix.card import MDCard
 
-    def create_results_card(self, title, data):
         card = MDCard(
             size_hint_y=None,
-            height=dp(200),
+            height=dp(60) + dp(30) * len(data),
             padding=dp(15),
             elevation=2
         )
-        
+
         layout = MDBoxLayout(orientation="vertical", spacing=dp(5))
-        
+
         title_label = MDLabel(
-            text=title,
+            text=SECTION_TITLES.get(section, section.title()),
             theme_text_color="Primary",
             size_hint_y=None,
             height=dp(30),
@@ -195,19 +286,147 @@ class SalaryCalculatorApp(MDApp):
         )
         layout.add_widget(title_label)
 
-        for key, value in data.items():
+        labels = self.result_labels[section] = {}
+        for key in data:
             result_label = MDLabel(
-                text=f"{key}: ₹{value:,.2f}",
                 size_hint_y=None,
                 height=dp(25)
             )
             layout.add_widget(result_label)
+            labels[key] = result_label
 
         card.add_widget(layout)
         return card
 
+    def add_to_history(self, ctc_annual, results):
+        if self.history and self.history[0][0] == ctc_annual:
+            return
+        monthly_in_hand = results['monthly']['Monthly In-Hand Salary']
+        self.history.insert(0, (ctc_annual, monthly_in_hand))
+        del self.history[HISTORY_SIZE:]
+        self.refresh_history_view()
+
+    def refresh_history_view(self):
+        if self.history_view is None:
+            return
+        self.history_view.data = [
+            {
+                "text": f"CTC ₹{ctc:,.0f}",
+                "secondary_text": f"In-hand ₹{in_hand:,.2f} / month",
+                "on_release": lambda ctc=ctc: self.load_from_history(ctc),
+            }
+            for ctc, in_hand in self.history
+        ]
+
+    def load_from_history(self, ctc_annual):
+        self.ctc_input.text = format_ctc(ctc_annual)
+        self.calculate_salary()
+        self.show_tab("calculate")
+
+    def run_sweep(self, *args):
+        try:
+            start_lpa = float(self.sweep_from_input.text)
+            stop_lpa = float(self.sweep_to_input.text)
+            step_lpa = float(self.sweep_step_input.text)
+        except ValueError:
+            self.show_error("Please enter valid numbers for the sweep range")
+            return
+        if step_lpa <= 0 or start_lpa < 0 or stop_lpa < start_lpa:
+            self.show_error("Sweep range must satisfy 0 <= From <= To, with a positive Step")
+            return
+        count = int(round((stop_lpa - start_lpa) / step_lpa, 9)) + 1
+        if count > MAX_SWEEP_ROWS:
+            self.show_error(f"Sweep would have {count:,} rows; the limit is {MAX_SWEEP_ROWS:,}")
+            return
+
+        rows = []
+        for i in range(count):
+            ctc_annual = (start_lpa + step_lpa * i) * 100000
+            results = calculate_salary_breakdown(ctc_annual)
+            tax = results['annual']['Total Annual Income Tax']
+            effective_rate = tax / ctc_annual if ctc_annual else 0.0
+            rows.append({
+                "text": f"CTC ₹{ctc_annual:,.0f}: ₹{results['monthly']['Monthly In-Hand Salary']:,.2f} / month",
+                "secondary_text": f"Tax ₹{tax:,.2f} / year ({effective_rate:.2%} of CTC)",
+            })
+        # One assignment: the RecycleView rebinds its existing row widgets.
+        self.sweep_view.data = rows
+        self.sweep_view.scroll_y = 1
+
+    # --- Saved state ---
+
+    def state_path(self):
+        return os.path.join(self.user_data_dir, STATE_FILE)
+
+    def read_saved_state(self):
+        """Reads the saved state on a background thread and hands it to the UI thread."""
+        import json
+
+        try:
+            with open(self.state_path(), encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != STATE_VERSION:
+                return
+            # Thread-safe; entries for outdated tax rules are skipped.
+            default_cache.import_entries(state.get("results", []))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return  # No saved state yet, or an unreadable file: start fresh
+        Clock.schedule_once(lambda dt: self.apply_saved_state(state))
+
+    def apply_saved_state(self, state):
+        try:
+            settings = state.get("settings", {})
+            self.sweep_from_input.text = str(settings.get("sweep_from", self.sweep_from_input.text))
+            self.sweep_to_input.text = str(settings.get("sweep_to", self.sweep_to_input.text))
+            self.sweep_step_input.text = str(settings.get("sweep_step", self.sweep_step_input.text))
+            if not self.history:
+                self.history = [(float(ctc), float(in_hand))
+                                for ctc, in_hand in state.get("history", [])][:HISTORY_SIZE]
+                self.refresh_history_view()
+            last_ctc = settings.get("last_ctc")
+            # Restore exactly what was typed, and don't overwrite anything the
+            # user typed while the state was loading.
+            if isinstance(last_ctc, str) and last_ctc and not self.ctc_input.text:
+                self.ctc_input.text = last_ctc
+                self.calculate_salary() # Served from the restored cache
+        except (TypeError, ValueError):
+            pass
+
+    def save_state(self):
+        import json
+
+        settings = {"last_ctc": self.ctc_input.text}
+        if self.sweep_view is not None:
+            settings["sweep_from"] = self.sweep_from_input.text
+            settings["sweep_to"] = self.sweep_to_input.text
+            settings["sweep_step"] = self.sweep_step_input.text
+        state = {
+            "version": STATE_VERSION,
+            "settings": settings,
+            "history": self.history,
+            "results": default_cache.export_entries(limit=SAVED_RESULTS),
+        }
+        path = self.state_path()
+        try:
+            # Write to a temporary file first so a crash never leaves half a file.
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+    def on_pause(self):
+        self.save_state()
+        return True
+
+    def on_stop(self):
+        self.save_state()
+
     def show_error(self, message):
         if not self.dialog:
+            from kivymd.uix.button import MDFlatButton
+            from kivymd.uix.dialog import MDDialog
+
             self.dialog = MDDialog(
                 title="Error",
                 text=message,
@@ -227,4 +446,4 @@ class SalaryCalculatorApp(MDApp):
             self.dialog.dismiss()
 
 if __name__ == "__main__":
-    SalaryCalculatorApp().run()
\ No newline at end of file
+    SalaryCalculatorApp().run()
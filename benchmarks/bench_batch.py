@@ -0,0 +1,66 @@
+"""
+Benchmark: vectorized batch engine vs. the scalar loop.
+
+Generates a synthetic payroll of CTCs, runs it through
+``calculate_salary_breakdown`` one row at a time and through
+``calculate_salary_breakdown_batch`` in one call, checks that both agree
+to the paisa and prints rows per second for each.
+
+Usage:
+    python benchmarks/bench_batch.py [--rows 200000] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine import calculate_salary_breakdown
+from salary_engine.batch import calculate_salary_breakdown_batch
+
+
+def synthetic_payroll(rows, seed):
+    """Returns an array of CTCs between 1 LPA and 2 Cr, rounded to the rupee."""
+    rng = np.random.default_rng(seed)
+    return np.round(rng.uniform(100000, 20000000, size=rows))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    ctcs = synthetic_payroll(args.rows, args.seed)
+    ctc_list = ctcs.tolist()
+
+    start = time.perf_counter()
+    scalar = [calculate_salary_breakdown(ctc)['annual'] for ctc in ctc_list]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_salary_breakdown_batch(ctcs)
+    batch_seconds = time.perf_counter() - start
+
+    in_hand = np.array([row['Annual In-Hand Salary'] for row in scalar])
+    tax = np.array([row['Total Annual Income Tax'] for row in scalar])
+    max_diff = max(np.abs(in_hand - batch['in_hand']).max(),
+                   np.abs(tax - batch['total_tax']).max())
+
+    print(f"rows:            {args.rows:,}")
+    print(f"scalar loop:     {args.rows / scalar_seconds:,.0f} rows/s ({scalar_seconds:.3f} s)")
+    print(f"vectorized:      {args.rows / batch_seconds:,.0f} rows/s ({batch_seconds:.3f} s)")
+    print(f"speedup:         {scalar_seconds / batch_seconds:,.1f}x")
+    print(f"max difference:  ₹{max_diff:.10f}")
+    if max_diff >= 0.005:
+        print("ERROR: batch results differ from the scalar function by a paisa or more")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark and reconciliation check: exact integer-paise mode vs floats.
+
+Runs a synthetic payroll (CTCs with paise) through the float batch engine
+and through ``calculate_salary_breakdown_paise_batch`` and reports:
+
+    speed          rows/s of both batch paths
+    agreement      the int64 batch against the scalar paise function on a
+                   sample of rows (must be identical)
+    reconciliation for both paths, whether every employee's figures, as
+                   printed to the paisa on the payslip, add up (CTC =
+                   in-hand + tax + PF), and how far the payroll totals
+                   drift from the sum of the printed figures (for the
+                   paise path, the scalar function's figures for the
+                   sampled rows, rounded independently of the batch)
+
+The exact mode must reconcile to the paisa on every row and in total; the
+script exits with 1 if it does not.
+
+Usage:
+    python benchmarks/bench_exact.py [--rows 200000] [--regime new] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.exact import (calculate_salary_breakdown_paise, calculate_salary_breakdown_paise_batch,
+                                 to_rupees)
+
+# (paise column, scalar key) compared against the scalar function.
+CHECKED = (
+    ('pf', 'Annual Employee PF Deduction'),
+    ('taxable_income', 'Annual Taxable Income (before rebate)'),
+    ('total_tax', 'Total Annual Income Tax'),
+    ('in_hand', 'Annual In-Hand Salary'),
+)
+
+
+def best_of(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def printed(values):
+    """The figures as a payslip prints them (``:.2f``), as exact Decimals."""
+    return [Decimal(f"{value:.2f}") for value in values.tolist()]
+
+
+def reconcile_floats(columns):
+    """Returns (rows whose printed figures do not add up, total drift in rupees)."""
+    ctc, in_hand, tax, pf = (printed(columns[name]) for name in ('ctc', 'in_hand', 'total_tax', 'pf'))
+    broken = sum(c != i + t + p for c, i, t, p in zip(ctc, in_hand, tax, pf))
+    drift = abs(Decimal(repr(float(np.sum(columns['in_hand'])))) - sum(in_hand))
+    return broken, drift
+
+
+def reconcile_paise(columns, sample, scalar_in_hand):
+    """Like ``reconcile_floats``; the drift is over the sampled rows, against the scalar payslips."""
+    broken = int(np.count_nonzero(columns['ctc'] != columns['in_hand'] + columns['total_tax'] + columns['pf']))
+    drift = abs(to_rupees(int(np.sum(columns['in_hand'][sample]))) - sum(map(to_rupees, scalar_in_hand)))
+    return broken, drift
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--regime', default='new', choices=('new', 'old'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--check', type=int, default=5000, help="Rows to compare with the scalar function")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ctcs = np.round(rng.lognormal(np.log(1500000), 0.8, size=args.rows), 2)
+    declarations = None
+    if args.regime == 'old':
+        declarations = {
+            'investments_80c': np.round(rng.uniform(0, 200000, size=args.rows)),
+            'health_insurance_80d': np.round(rng.uniform(0, 60000, size=args.rows), 2),
+            'rent_paid': np.round(rng.uniform(0, 900000, size=args.rows)),
+            'metro': rng.random(args.rows) < 0.5,
+        }
+
+    float_seconds = best_of(lambda: calculate_salary_breakdown_batch(
+        ctcs, regime=args.regime, declarations=declarations), args.repeat)
+    paise_seconds = best_of(lambda: calculate_salary_breakdown_paise_batch(
+        ctcs, regime=args.regime, declarations=declarations), args.repeat)
+    floats = calculate_salary_breakdown_batch(ctcs, regime=args.regime, declarations=declarations)
+    paise = calculate_salary_breakdown_paise_batch(ctcs, regime=args.regime, declarations=declarations)
+
+    sample = rng.choice(args.rows, size=min(args.check, args.rows), replace=False)
+    mismatches = 0
+    scalar_in_hand = []
+    for i in sample.tolist():
+        row_declarations = ({field: values[i].item() for field, values in declarations.items()}
+                            if declarations else None)
+        annual = calculate_salary_breakdown_paise(ctcs[i].item(), regime=args.regime,
+                                                  declarations=row_declarations)['annual']
+        mismatches += any(annual[key] != paise[column][i] for column, key in CHECKED)
+        scalar_in_hand.append(annual['Annual In-Hand Salary'])
+
+    float_broken, float_drift = reconcile_floats(floats)
+    paise_broken, paise_drift = reconcile_paise(paise, sample, scalar_in_hand)
+    largest_difference = np.max(np.abs(paise['total_tax'] / 100 - floats['total_tax']))
+
+    print(f"rows:             {args.rows:,} ({args.regime} regime)")
+    print(f"float batch:      {args.rows / float_seconds:,.0f} rows/s")
+    print(f"paise batch:      {args.rows / paise_seconds:,.0f} rows/s "
+          f"({float_seconds / paise_seconds:.2f}x the float path)")
+    print(f"scalar vs batch:  {mismatches} mismatches in {len(sample):,} sampled rows")
+    print(f"{'':<18}{'rows not adding up':>20}{'total drift':>16}")
+    print(f"{'float':<18}{float_broken:>20,}{'₹' + format(float_drift, ','):>16}")
+    print(f"{'paise':<18}{paise_broken:>20,}{'₹' + format(paise_drift, ','):>16}")
+    print(f"tax rounding:     largest difference from the float tax ₹{largest_difference:,.2f}")
+    return 1 if mismatches or paise_broken or paise_drift else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Benchmark: import time of the salary engine.
+
+Runs ``python -X importtime -c "import salary_engine"`` in a fresh
+interpreter a few times, reports the cumulative import time of the
+``salary_engine`` package and checks that importing it does not pull in
+tkinter or kivy.
+
+Usage:
+    python benchmarks/bench_import.py [--runs 5] [--module salary_engine]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GUI_MODULES = ('tkinter', '_tkinter', 'kivy', 'kivymd')
+
+
+def measure_import(module):
+    """
+    Imports ``module`` in a fresh interpreter.
+
+    Returns:
+        tuple: (cumulative import time in microseconds, list of GUI modules
+               that were imported along with it)
+    """
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {GUI_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                               capture_output=True, text=True, env=env, check=True)
+
+    cumulative_us = None
+    for line in completed.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    gui_modules = [m for m in completed.stdout.strip().split(',') if m]
+    return cumulative_us, gui_modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--module', default='salary_engine')
+    args = parser.parse_args(argv)
+
+    timings = []
+    for _ in range(args.runs):
+        cumulative_us, gui_modules = measure_import(args.module)
+        timings.append(cumulative_us)
+
+    timings.sort()
+    print(f"module:        {args.module}")
+    print(f"best:          {timings[0] / 1000:.2f} ms")
+    print(f"median:        {timings[len(timings) // 2] / 1000:.2f} ms")
+    print(f"GUI imports:   {', '.join(gui_modules) or 'none'}")
+    if gui_modules:
+        print(f"ERROR: importing {args.module} pulled in GUI toolkits")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
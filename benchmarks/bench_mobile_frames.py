@@ -0,0 +1,167 @@
+"""
+Benchmark: frame times of the Kivy mobile app.
+
+Starts the mobile app in a real Kivy window with the frame rate cap
+disabled and drives it from the Kivy clock, one action per frame:
+
+    results   press Calculate with a different CTC every frame
+    history   fill the history list and scroll through it
+    sweep     run a sweep and scroll through its rows
+
+For each phase it prints the median, p95 and worst frame time and the
+number of frames over the 60 fps budget (16.7 ms). Kivy needs an X
+display; on a headless Linux box the script re-runs itself under
+``xvfb-run`` when no ``DISPLAY`` is set.
+
+Usage:
+    python benchmarks/bench_mobile_frames.py [--calculations 300] [--sweep-step 0.05]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOBILE_APP_DIR = os.path.join(ROOT, 'Screenshots', 'Mob App')
+
+FRAME_BUDGET = 1 / 60
+
+
+def ensure_display():
+    """Returns None if Kivy can open a window, else an exit code after re-running under Xvfb."""
+    if os.environ.get('DISPLAY') or sys.platform != 'linux':
+        return None
+    xvfb_run = shutil.which('xvfb-run')
+    if xvfb_run is None:
+        print("ERROR: no DISPLAY and xvfb-run is not installed (apt install xvfb)")
+        return 2
+    command = [xvfb_run, '-a', '-s', '-screen 0 1280x1024x24', sys.executable] + sys.argv
+    return subprocess.call(command)
+
+
+class FrameDriver:
+    """
+    Runs one step of the scenario per frame and records frame times.
+
+    Each phase is a generator yielding once per action; the time between
+    two consecutive clock ticks is the frame time, so it includes the action,
+    layout and drawing.
+    """
+
+    def __init__(self, app, phases):
+        self.app = app
+        self.phases = list(phases)
+        self.frame_times = {name: [] for name, _ in self.phases}
+        self.current = None
+        self.last_tick = None
+
+    def tick(self, dt):
+        now = time.perf_counter()
+        if self.current is not None and self.last_tick is not None:
+            self.frame_times[self.current[0]].append(now - self.last_tick)
+        self.last_tick = now
+
+        while True:
+            if self.current is None:
+                if not self.phases:
+                    self.app.stop()
+                    return False
+                self.current = self.phases.pop(0)
+            try:
+                next(self.current[1])
+                return True
+            except StopIteration:
+                self.current = None
+
+
+def results_phase(app, calculations):
+    app.show_tab('calculate')
+    yield
+    for i in range(calculations):
+        app.ctc_input.text = str(500000 + 25000 * i)
+        app.calculate_salary()
+        yield
+
+
+def scroll_phase(app, tab, recycle_view, steps):
+    app.show_tab(tab)
+    yield
+    for i in range(steps + 1):
+        recycle_view.scroll_y = 1 - i / steps
+        yield
+
+
+def sweep_phase(app, sweep_step):
+    app.show_tab('sweep')
+    app.sweep_from_input.text = '5'
+    app.sweep_to_input.text = '100'
+    app.sweep_step_input.text = str(sweep_step)
+    yield
+    app.run_sweep()
+    yield
+
+
+def report(frame_times):
+    print(f"{'phase':<10} {'frames':>7} {'median':>9} {'p95':>9} {'worst':>9} {'> 16.7ms':>9}")
+    for name, times in frame_times.items():
+        if not times:
+            continue
+        times = sorted(times)
+        median = times[len(times) // 2]
+        p95 = times[min(len(times) - 1, int(0.95 * len(times)))]
+        slow = sum(t > FRAME_BUDGET for t in times)
+        print(f"{name:<10} {len(times):>7} {median * 1000:>7.2f}ms {p95 * 1000:>7.2f}ms "
+              f"{times[-1] * 1000:>7.2f}ms {slow:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--calculations', type=int, default=300,
+                        help="Calculate presses in the results phase")
+    parser.add_argument('--scroll-steps', type=int, default=300)
+    parser.add_argument('--sweep-step', type=float, default=0.05,
+                        help="Sweep step in LPA (5 to 100 LPA; 0.05 gives 1,901 rows)")
+    args = parser.parse_args(argv)
+
+    exit_code = ensure_display()
+    if exit_code is not None:
+        return exit_code
+
+    # Kivy reads these at import time.
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    from kivy.config import Config
+    Config.set('graphics', 'maxfps', '0')
+    Config.set('graphics', 'width', '400')
+    Config.set('graphics', 'height', '800')
+    from kivy.clock import Clock
+
+    sys.path.insert(0, MOBILE_APP_DIR)
+    from mobile_salary_calculator import SalaryCalculatorApp
+
+    app = SalaryCalculatorApp()
+
+    def start(dt):
+        app.build_deferred_tabs()
+        driver = FrameDriver(app, [
+            ('results', results_phase(app, args.calculations)),
+            ('history', scroll_phase(app, 'history', app.history_view, args.scroll_steps)),
+            ('sweep', sweep_phase(app, args.sweep_step)),
+            ('scroll', scroll_phase(app, 'sweep', app.sweep_view, args.scroll_steps)),
+        ])
+        app.frame_times = driver.frame_times
+        Clock.schedule_interval(driver.tick, 0)
+
+    # Give the window a second to settle before measuring.
+    Clock.schedule_once(start, 1)
+    app.run()
+
+    report(app.frame_times)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Benchmark: cold start time of the Kivy mobile app.
+
+Launches the mobile app in a fresh interpreter several times and records,
+measured from the moment the process is spawned:
+
+    imports       mobile_salary_calculator imported (Kivy, KivyMD, engine)
+    build         SalaryCalculatorApp.build() returned
+    first_frame   the first frame is on screen
+    deferred      the work moved after the first frame is done (hidden tabs
+                  built, saved state load started)
+
+``--compare REV`` runs the same measurement on the app as it was at a git
+revision, so before/after numbers come from the same machine, e.g.
+
+    python benchmarks/bench_mobile_startup.py --compare HEAD~1
+
+Like bench_mobile_frames.py it needs an X display and re-runs itself under
+``xvfb-run`` on a headless Linux box.
+
+Usage:
+    python benchmarks/bench_mobile_startup.py [--runs 5] [--compare REV]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_mobile_frames import MOBILE_APP_DIR, ROOT, ensure_display
+
+APP_FILE = 'mobile_salary_calculator.py'
+METRICS = ('imports', 'build', 'first_frame', 'deferred')
+
+
+def run_child(app_dir):
+    """Starts the app from ``app_dir``, prints its startup timings as JSON and exits."""
+    spawned = float(os.environ['BENCH_SPAWNED'])
+    timings = {}
+
+    def mark(name):
+        timings[name] = time.time() - spawned
+
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    from kivy.config import Config
+    Config.set('graphics', 'width', '400')
+    Config.set('graphics', 'height', '800')
+
+    sys.path.insert(0, app_dir)
+    # A checked-out older app cannot find the engine from its temporary directory.
+    sys.path.append(ROOT)
+    import mobile_salary_calculator
+    mark('imports')
+
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+
+    app = mobile_salary_calculator.SalaryCalculatorApp()
+    build = app.build
+
+    def timed_build():
+        root = build()
+        mark('build')
+        return root
+    app.build = timed_build
+
+    # Older versions of the app do all their work before the first frame.
+    finish_startup = getattr(app, 'finish_startup', None)
+    if finish_startup is not None:
+        def timed_finish_startup(*args):
+            finish_startup(*args)
+            mark('deferred')
+        app.finish_startup = timed_finish_startup
+
+    def on_first_frame(window):
+        window.unbind(on_flip=on_first_frame)
+        mark('first_frame')
+        Clock.schedule_once(lambda dt: app.stop(), 0.5)
+    Window.bind(on_flip=on_first_frame)
+
+    app.run()
+    timings.setdefault('deferred', timings['first_frame'])
+    print(json.dumps(timings))
+    return 0
+
+
+def measure(app_dir, runs):
+    """Returns {metric: [seconds per run]} for the app in ``app_dir``."""
+    results = {metric: [] for metric in METRICS}
+    for _ in range(runs):
+        env = dict(os.environ, BENCH_SPAWNED=repr(time.time()))
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', app_dir],
+            capture_output=True, text=True, env=env, check=True)
+        timings = json.loads(completed.stdout.strip().splitlines()[-1])
+        for metric in METRICS:
+            results[metric].append(timings[metric])
+    return results
+
+
+def checkout_app(revision, directory):
+    """Writes the app as of ``revision`` to ``directory``; it runs on the current engine."""
+    source = subprocess.run(
+        ['git', 'show', f"{revision}:Screenshots/Mob App/{APP_FILE}"],
+        cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    with open(os.path.join(directory, APP_FILE), 'w', encoding='utf-8') as f:
+        f.write(source)
+    return directory
+
+
+def median_ms(values):
+    return sorted(values)[len(values) // 2] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--compare', metavar='REV',
+                        help="Also measure the app as of this git revision")
+    parser.add_argument('--child', metavar='APP_DIR', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return run_child(args.child)
+
+    exit_code = ensure_display()
+    if exit_code is not None:
+        return exit_code
+
+    columns = {'current': measure(MOBILE_APP_DIR, args.runs)}
+    if args.compare:
+        with tempfile.TemporaryDirectory() as directory:
+            columns[args.compare] = measure(checkout_app(args.compare, directory), args.runs)
+
+    print(f"median of {args.runs} runs, ms since process spawn")
+    print(f"{'':<12}" + ''.join(f"{name:>12}" for name in columns))
+    for metric in METRICS:
+        print(f"{metric:<12}" + ''.join(f"{median_ms(results[metric]):>12.1f}"
+                                        for results in columns.values()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Benchmark: scaling of the process-pool runner from 1 to N cores.
+
+Runs a synthetic payroll through ``calculate_salary_breakdown_batch`` once
+(the serial reference) and through ``calculate_salary_breakdown_parallel``
+with 1, 2, 4, ... workers, checks that every run is bit-identical to the
+serial result and prints rows per second and speedup for each.
+
+Usage:
+    python benchmarks/bench_parallel.py [--rows 1000000] [--max-workers N] [--chunk-size 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine.batch import BATCH_COLUMNS, calculate_salary_breakdown_batch
+from salary_engine.parallel import DEFAULT_CHUNK_SIZE, calculate_salary_breakdown_parallel
+
+
+def worker_counts(max_workers):
+    count = 1
+    while count < max_workers:
+        yield count
+        count *= 2
+    yield max_workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ctcs = np.round(rng.uniform(100000, 20000000, size=args.rows))
+
+    start = time.perf_counter()
+    serial = calculate_salary_breakdown_batch(ctcs)
+    serial_seconds = time.perf_counter() - start
+    print(f"rows: {args.rows:,}, chunk size: {args.chunk_size:,}")
+    print(f"serial batch:   {args.rows / serial_seconds:>14,.0f} rows/s")
+
+    failed = False
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        result = calculate_salary_breakdown_parallel(ctcs, workers=workers,
+                                                     chunk_size=args.chunk_size)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        identical = all(np.array_equal(result[name], serial[name]) for name in BATCH_COLUMNS)
+        failed = failed or not identical
+        print(f"{workers:>3} worker(s):  {args.rows / seconds:>14,.0f} rows/s  "
+              f"speedup {baseline / seconds:5.2f}x  "
+              f"{'identical' if identical else 'MISMATCH'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
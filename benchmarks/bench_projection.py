@@ -0,0 +1,82 @@
+"""
+Benchmark: month-wise TDS projection for a whole company.
+
+Projects a synthetic company for the year, then drops in an appraisal-cycle
+file (a raise for every employee from October) and a small file of bonuses,
+timing each incremental re-projection against projecting the whole year
+again from scratch. Checks that:
+
+    - the incremental schedule is identical to the one from scratch,
+    - with no events after April, the year's TDS adds up to the annual tax
+      of the batch engine.
+
+Usage:
+    python benchmarks/bench_projection.py [--employees 200000] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.projection import MONTHS, PayrollProjection
+
+
+def timed_apply(projection, events):
+    """Applies a file of events and brings the schedules up to date; returns the seconds taken."""
+    start = time.perf_counter()
+    projection.apply_events(*events)
+    projection.update()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--employees', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--appraisal-month', default='Oct')
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    count = args.employees
+    ids = [f"E{i:07d}" for i in range(count)]
+    ctcs = np.round(rng.lognormal(np.log(1500000), 0.7, size=count))
+    appraisal_month = MONTHS.index(args.appraisal_month)
+    raises = np.round(ctcs * rng.uniform(1.0, 1.25, size=count))
+    bonus_ids = [ids[i] for i in rng.choice(count, size=count // 100, replace=False)]
+    files = [
+        ('year start', ids, ['ctc'] * count, np.zeros(count, dtype=int), ctcs),
+        ('appraisal', ids, ['ctc'] * count, np.full(count, appraisal_month), raises),
+        ('1% bonuses', bonus_ids, ['bonus'] * len(bonus_ids),
+         np.full(len(bonus_ids), MONTHS.index('Dec')), np.full(len(bonus_ids), 100000.0)),
+    ]
+
+    projection = PayrollProjection()
+    print(f"employees:        {count:,}")
+    for name, *events in files:
+        seconds = timed_apply(projection, events)
+        if name == 'year start':
+            flat_tax = projection.columns()['tds'].sum(axis=1)
+        print(f"{name + ':':<18}{seconds:.3f} s")
+
+    from_scratch = PayrollProjection()
+    everything = [np.concatenate([np.asarray(events[i]) for _, *events in files]) for i in range(4)]
+    scratch = timed_apply(from_scratch, everything)
+    print(f"{'from scratch:':<18}{scratch:.3f} s (all three files at once)")
+
+    incremental, fresh = projection.columns(), from_scratch.columns()
+    identical = all(np.array_equal(incremental[name], fresh[name]) for name in incremental)
+    annual_tax = calculate_salary_breakdown_batch(ctcs)['total_tax']
+    flat_error = np.max(np.abs(flat_tax - annual_tax))
+    print(f"identical:        {'yes' if identical else 'NO'} (incremental vs from scratch)")
+    print(f"flat year:        max |sum of TDS - annual tax| = ₹{flat_error:.2e}")
+    return 0 if identical and flat_error < 1e-6 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Benchmark: Old vs New Regime comparison for a whole payroll.
+
+Generates a payroll with random 80C, 80D, rent and metro declarations and
+times ``compare_regimes_batch`` against one pass of the batch engine, the
+cost the comparison should stay close to. A sample of rows is checked
+against the scalar ``compare_regimes``, and for each sampled employee the
+break-even deductions must be the least that bring the Old Regime tax
+down to the New Regime tax.
+
+Usage:
+    python benchmarks/bench_regimes.py [--rows 100000] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.core import income_tax
+from salary_engine.regimes import compare_regimes, compare_regimes_batch
+from salary_engine.rules import load_rules
+
+# compare_regimes_batch reads taxes off fitted lines; see its docstring.
+TOLERANCE = 1e-6
+
+
+def best_of(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--check', type=int, default=2000, help="Rows to compare with the scalar engine")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ctcs = np.round(rng.lognormal(np.log(1500000), 0.8, size=args.rows))
+    declarations = {
+        'investments_80c': np.round(rng.uniform(0, 200000, size=args.rows)),
+        'health_insurance_80d': np.round(rng.uniform(0, 60000, size=args.rows)),
+        'rent_paid': np.round(rng.uniform(0, 900000, size=args.rows)),
+        'metro': rng.random(args.rows) < 0.5,
+    }
+
+    engine = best_of(lambda: calculate_salary_breakdown_batch(ctcs), args.repeat)
+    compare = best_of(lambda: compare_regimes_batch(ctcs, declarations), args.repeat)
+    columns = compare_regimes_batch(ctcs, declarations)
+
+    old_rules = load_rules(regime='old')
+    sample = rng.choice(args.rows, size=min(args.check, args.rows), replace=False)
+    mismatches = 0
+    break_even_errors = 0
+    for i in sample.tolist():
+        result = compare_regimes(ctcs[i].item(), {field: values[i].item()
+                                                  for field, values in declarations.items()})
+        if (abs(result['new']['annual']['Total Annual Income Tax'] - columns['new_total_tax'][i]) > TOLERANCE
+                or abs(result['old']['annual']['Total Annual Income Tax'] - columns['old_total_tax'][i]) > TOLERANCE
+                or abs(result['break_even_deductions'] - columns['break_even_deductions'][i]) > TOLERANCE
+                or (result['recommended'] == 'old') != columns['recommend_old'][i]):
+            mismatches += 1
+
+        # The break-even deductions are the least that keep the Old Regime tax at
+        # or below the New Regime tax: deducting them does, one rupee less does
+        # not. (With a jump in the Old Regime tax, such as the 87A rebate cliff,
+        # the taxes need not be equal there.)
+        break_even = result['break_even_deductions']
+        if break_even > 0:
+            new_tax = result['new']['annual']['Total Annual Income Tax']
+            # PF is part of 80C under the Old Regime, so it is in break_even.
+            taxable = max(ctcs[i].item() - old_rules.standard_deduction - break_even, 0)
+            if (sum(income_tax(taxable, old_rules)) > new_tax + TOLERANCE
+                    or sum(income_tax(taxable + 1, old_rules)) <= new_tax - TOLERANCE):
+                break_even_errors += 1
+
+    print(f"rows:             {args.rows:,}")
+    print(f"engine, one pass: {engine * 1000:.1f} ms")
+    print(f"comparison:       {compare * 1000:.1f} ms ({compare / engine:.2f}x one pass)")
+    print(f"recommend old:    {np.count_nonzero(columns['recommend_old']):,} employees")
+    print(f"mismatches:       {mismatches} of {len(sample):,} sampled rows")
+    print(f"break-even wrong: {break_even_errors} of {len(sample):,} sampled rows")
+    return 1 if mismatches or break_even_errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark: payroll with per-grade salary structures.
+
+Writes a set of synthetic grade structures to a temporary directory,
+generates a payroll of employees spread across them and runs it through
+``calculate_structure_breakdown_batch`` twice: once cold (every structure
+parsed and compiled on first use) and once warm (all from the structure
+cache). A sample of rows is checked against the scalar
+``calculate_structure_breakdown``, which must agree exactly.
+
+Usage:
+    python benchmarks/bench_structures.py [--rows 300000] [--grades 36] [--seed 42]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine import structures
+from salary_engine.batch import calculate_structure_breakdown_batch
+from salary_engine.structures import calculate_structure_breakdown
+
+
+def grade_structure(grade):
+    """A plausible structure for a grade: the Basic share falls and NPS appears as grades rise."""
+    components = [
+        {"name": "basic", "label": "Basic + DA", "type": "earning",
+         "rate": round(0.50 - 0.005 * grade, 4), "basic_da": True},
+        {"name": "hra", "label": "House Rent Allowance", "type": "earning",
+         "rate": 0.40 if grade % 2 else 0.50, "of": "basic"},
+        {"name": "conveyance", "label": "Conveyance", "type": "earning",
+         "rate": 0.02, "max": 19200},
+        {"name": "employer_pf", "label": "Employer PF", "type": "employer_pf"},
+        {"name": "gratuity", "label": "Gratuity", "type": "retiral", "rate": 0.0481, "of": "basic"},
+    ]
+    if grade >= 10:
+        components.append({"name": "employer_nps", "label": "Employer NPS", "type": "employer_nps",
+                           "rate": 0.10, "of": "basic"})
+    components.append({"name": "special", "label": "Special Allowance", "type": "earning",
+                       "balance": True})
+    return {
+        "id": f"grade-{grade:02d}",
+        "version": f"grade-{grade:02d}.1",
+        "pf": {"capped": grade < 20},
+        "professional_tax_annual": 2500,
+        "components": components,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--grades', type=int, default=36)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--check', type=int, default=2000, help="Rows to compare with the scalar engine")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    grades = rng.integers(0, args.grades, size=args.rows)
+    # Higher grades earn more: 3 LPA for grade 0 up to ~1.5 Cr at the top.
+    ctcs = np.round(300000 * 1.12 ** grades * rng.uniform(0.8, 1.25, size=args.rows))
+    structure_ids = np.array([f"grade-{grade:02d}" for grade in range(args.grades)])[grades]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for grade in range(args.grades):
+            with open(os.path.join(directory, f"grade-{grade:02d}.json"), 'w') as handle:
+                json.dump(grade_structure(grade), handle)
+
+        start = time.perf_counter()
+        calculate_structure_breakdown_batch(ctcs, structure_ids, directory=directory)
+        cold = time.perf_counter() - start
+        compiled = sum(1 for key in structures._loaded_structures if key[0] == directory)
+
+        start = time.perf_counter()
+        columns = calculate_structure_breakdown_batch(ctcs, structure_ids, directory=directory)
+        warm = time.perf_counter() - start
+
+        sample = rng.choice(args.rows, size=min(args.check, args.rows), replace=False)
+        start = time.perf_counter()
+        mismatches = 0
+        for i in sample.tolist():
+            results = calculate_structure_breakdown(ctcs[i].item(), str(structure_ids[i]),
+                                                    directory=directory)
+            if (results['annual']['Annual In-Hand Salary'] != columns['in_hand'][i]
+                    or results['annual']['Total Annual Income Tax'] != columns['total_tax'][i]):
+                mismatches += 1
+        scalar = (time.perf_counter() - start) / len(sample)
+
+    print(f"rows:             {args.rows:,} across {args.grades} structures")
+    print(f"compiled:         {compiled} structures (once each)")
+    print(f"batch, cold:      {args.rows / cold:,.0f} rows/s ({cold:.3f} s)")
+    print(f"batch, warm:      {args.rows / warm:,.0f} rows/s ({warm:.3f} s)")
+    print(f"scalar:           {1 / scalar:,.0f} rows/s")
+    print(f"mismatches:       {mismatches} of {len(sample):,} sampled rows")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
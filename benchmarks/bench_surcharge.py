@@ -0,0 +1,55 @@
+"""
+Micro-benchmark for surcharge and marginal relief.
+
+Reports per-call latency of the scalar engine below and above the 87A limit
+and the surcharge thresholds, and batch throughput, so the relief logic can
+be checked for regressions. The correctness properties (batch equals
+scalar, tax never decreases with income, relief caps, band-rate ceiling)
+are tested in ``tests/test_surcharge.py``.
+
+Usage:
+    python benchmarks/bench_surcharge.py [--seed 7]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine import calculate_salary_breakdown
+from salary_engine.batch import calculate_salary_breakdown_batch
+
+
+def per_call_ns(ctc, repeats=50000):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        calculate_salary_breakdown(ctc)
+    return (time.perf_counter() - start) / repeats * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    for label, ctc in (("no surcharge (₹15L)", 1500000),
+                       ("87A marginal relief (₹13L)", 1300000),
+                       ("surcharge relief (₹51L)", 5150000),
+                       ("25% surcharge (₹3Cr)", 30000000)):
+        print(f"scalar, {label:<28} {per_call_ns(ctc):>8,.0f} ns/call")
+
+    ctcs = rng.uniform(100000, 300000000, 1000000)
+    start = time.perf_counter()
+    calculate_salary_breakdown_batch(ctcs)
+    seconds = time.perf_counter() - start
+    print(f"batch, 1M rows                       {len(ctcs) / seconds:>12,.0f} rows/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Benchmark and check: the audit trail (``salary_engine.trace``).
+
+Reports the cost of the engine with tracing off (the default), with only
+the stage timers on, and with full records, for single calls and for a
+batch, then checks that:
+
+    - the batch records are identical to the scalar records for the same
+      CTCs (both regimes, and a batch that mixes financial years),
+    - the records explain the result (slab tax - rebate - relief =
+      tax before cess, and so on),
+    - a log written in several chunks reads back as the same records.
+
+Exits with 1 if a check fails.
+
+Usage:
+    python benchmarks/bench_trace.py [--rows 200000] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.trace import TRACE_COLUMNS, CalculationTrace, read_trace_log
+
+
+def best_of(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scalar_records(ctcs, years, regime, declarations):
+    trace = CalculationTrace()
+    for i, (ctc, year) in enumerate(zip(ctcs.tolist(), years)):
+        row_declarations = ({field: values[i].item() for field, values in declarations.items()}
+                            if declarations else None)
+        calculate_salary_breakdown(ctc, year, regime, row_declarations, trace=trace)
+    return trace.to_records()
+
+
+def batch_records(ctcs, years, regime, declarations):
+    trace = CalculationTrace()
+    calculate_salary_breakdown_batch(ctcs, np.asarray(years), regime, declarations, trace=trace)
+    records = trace.to_records()
+    # Grouped by year in the batch; put them back in input order.
+    return records[np.argsort(records['row'], kind='stable')]
+
+
+def differences(scalar, batch):
+    """Columns where the scalar and batch records differ (call numbers aside)."""
+    return [name for name in TRACE_COLUMNS if name not in ('call', 'row')
+            and not np.array_equal(scalar[name], batch[name])]
+
+
+def unexplained(records):
+    """Rows whose figures do not add up from the recorded steps."""
+    tax = records['slab_tax'] - records['rebate_87a'] - records['rebate_relief']
+    full_surcharge = tax * records['surcharge_rate']
+    broken = ~np.isclose(records['total_tax'], tax + records['surcharge'] + records['cess'], rtol=0, atol=1e-6)
+    broken |= ~np.isclose(full_surcharge - records['surcharge_relief'], records['surcharge'], rtol=0, atol=1e-6)
+    broken |= records['pf_capped'] != (records['pf'] < records['assumed_basic_da'] * 0.12)
+    return int(np.count_nonzero(broken))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--calls', type=int, default=20000, help="Single calls to time")
+    parser.add_argument('--check', type=int, default=5000, help="Rows to compare with the scalar records")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ctcs = np.round(rng.lognormal(np.log(1500000), 0.8, size=args.rows))
+
+    single = ctcs[:args.calls].tolist()
+    off = best_of(lambda: [calculate_salary_breakdown(ctc) for ctc in single], args.repeat)
+    scalar_trace = CalculationTrace()
+    on = best_of(lambda: [calculate_salary_breakdown(ctc, trace=scalar_trace) for ctc in single], args.repeat)
+    print(f"single call:      {off / len(single) * 1e6:.2f} µs untraced, "
+          f"{on / len(single) * 1e6:.2f} µs recorded ({on / off - 1:+.0%})")
+
+    off = best_of(lambda: calculate_salary_breakdown_batch(ctcs), args.repeat)
+    timers = CalculationTrace(records=False)
+    timed = best_of(lambda: calculate_salary_breakdown_batch(ctcs, trace=timers), args.repeat)
+    recorded = best_of(lambda: calculate_salary_breakdown_batch(ctcs, trace=CalculationTrace()), args.repeat)
+    print(f"batch of {args.rows:,}: {off * 1e3:.1f} ms untraced, {timed * 1e3:.1f} ms timed "
+          f"({timed / off - 1:+.0%}), {recorded * 1e3:.1f} ms recorded ({recorded / off - 1:+.0%})")
+    for stage, calls, rows, seconds, rate in timers.stage_report():
+        print(f"  {stage:<16}{seconds / calls * 1e3:>8.2f} ms/call {rate:>16,.0f} rows/s")
+
+    failures = 0
+    sample = ctcs[:args.check]
+    years = rng.choice(['2024-25', '2025-26'], size=len(sample)).tolist()
+    old_declarations = {
+        'investments_80c': np.round(rng.uniform(0, 200000, size=len(sample))),
+        'health_insurance_80d': np.round(rng.uniform(0, 60000, size=len(sample))),
+        'rent_paid': np.round(rng.uniform(0, 900000, size=len(sample))),
+        'metro': rng.random(len(sample)) < 0.5,
+    }
+    for regime, declarations in (('new', None), ('old', old_declarations)):
+        scalar = scalar_records(sample, years, regime, declarations)
+        batch = batch_records(sample, years, regime, declarations)
+        differing = differences(scalar, batch)
+        broken = unexplained(batch)
+        failures += bool(differing) + bool(broken)
+        print(f"{regime} regime:       scalar vs batch records: "
+              f"{', '.join(differing) if differing else 'identical'}; {broken} rows not explained")
+
+    trace = CalculationTrace()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'payroll.trace')
+        expected = []
+        for chunk in np.array_split(ctcs, 4):
+            calculate_salary_breakdown_batch(chunk, trace=trace)
+            expected.append(trace.to_records())
+            trace.write(path)
+        start = time.perf_counter()
+        log = read_trace_log(path)
+        seconds = time.perf_counter() - start
+        round_trip = np.array_equal(log, np.concatenate(expected))
+        size = os.path.getsize(path)
+    failures += not round_trip
+    print(f"log:              {len(log):,} records, {size / len(log):.0f} bytes each, "
+          f"read back in {seconds * 1e3:.1f} ms: {'identical' if round_trip else 'DIFFERENT'}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
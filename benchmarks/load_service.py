@@ -0,0 +1,125 @@
+"""
+Load generator and benchmark for the HTTP calculation service.
+
+Opens a number of keep-alive connections to the service and sends
+``POST /breakdown`` requests over each as fast as responses come back,
+then prints sustained throughput, client-side latency percentiles and the
+server's own ``/metrics``. Everything runs against localhost, offline.
+
+Usage:
+    # against a service that is already running
+    python benchmarks/load_service.py --port 8080
+
+    # start a local service, benchmark it, then stop it
+    python benchmarks/load_service.py --spawn [--connections 64] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                 .encode('ascii') + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    data = await reader.readexactly(length)
+    return int(status_line.split()[1]), json.loads(data)
+
+
+async def client(host, port, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random()
+    try:
+        while time.perf_counter() < deadline:
+            ctc = rng.choice((5, 10, 12, 15, 20, 25, 30, 50, 100)) * 100000
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', '/breakdown', {'ctc': ctc})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def wait_for_port(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run(args):
+    await wait_for_port(args.host, args.port)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(args.host, args.port, deadline, latencies, errors)
+                           for _ in range(args.connections)))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await request(reader, writer, 'GET', '/metrics')
+    writer.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0
+    print(f"connections:        {args.connections}")
+    print(f"requests:           {len(latencies):,} in {seconds:.1f} s ({len(errors)} errors)")
+    print(f"throughput:         {len(latencies) / seconds:,.0f} requests/s")
+    print(f"client latency:     p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"server metrics:     {json.dumps(metrics, indent=2)}")
+    return 1 if errors else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--spawn', action='store_true',
+                        help="Start a local service for the duration of the benchmark.")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'salary_engine', 'serve', '--host', args.host, '--port', str(args.port)],
+            cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        return asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Benchmark suite with machine-readable results and regression checks.
+
+Runs a fixed set of cases and reports each as seconds per operation (the
+best of several repeats, which is the least noisy figure on a shared
+machine):
+
+    scalar_call     one calculate_salary_breakdown call, no cache
+    batch_1k        calculate_salary_breakdown_batch, per row, on 1,000,
+    batch_100k      100,000 and 1,000,000 CTCs
+    batch_1m
+    cache_hit       BreakdownCache.get_breakdown for a cached CTC
+    cache_miss      ... for a new CTC (compute, freeze and insert)
+    tk_render       SalaryCalculatorWindow.calculate_and_display plus the
+                    redraw, in a real Tk window (needs tkinter and a display;
+                    re-runs under xvfb-run on a headless Linux box)
+
+Besides timings it records fingerprints of the results (a hash of the
+scalar and batch breakdowns over a fixed grid of CTCs, and of the scalar
+breakdown computed by the mobile app's copy of the engine), so a change
+that alters any figure is caught too.
+
+Results are written as JSON (``--output``). Against a stored baseline
+(``--baseline``, by default benchmarks/baseline.json) the suite exits with
+1 if any case got slower by more than ``--threshold`` (default 25%) or any
+fingerprint changed. Timings only compare on the same machine: when the
+baseline's recorded environment differs from the current one, only the
+fingerprints are checked. Refresh the baseline with ``--save-baseline``.
+
+``--profile ENTRY`` runs the suite with the cProfile hook of
+``salary_engine.profiling`` on that engine entry point (repeatable) and
+writes the stats to ``--profile-dir``. Timings are then inflated, so no
+regression check is made.
+
+Usage:
+    python benchmarks/suite.py [--cases batch_100k cache_hit] [--output results.json]
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --profile batch.calculate_salary_breakdown_batch --cases batch_1m
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOBILE_APP_DIR = os.path.join(ROOT, 'Screenshots', 'Mob App')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+SUITE_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+# Exit code of a child process that cannot run its case here.
+SKIPPED = 3
+
+# CTCs the fingerprints are computed on: every rupee amount matters, so the
+# grid is irregular and covers the rebate, surcharge and PF-ceiling edges.
+FINGERPRINT_CTCS = [round(i * 2503.7, 2) for i in range(0, 20000, 7)]
+
+
+def measure(function, number, repeat):
+    """Returns the per-operation seconds of each repeat of ``number`` calls to ``function``."""
+    function()  # warm up caches, rule tables and NumPy
+    times = []
+    # Like timeit, keep the garbage collector from landing in one repeat.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return times
+
+
+# --- Cases: each returns a list of seconds per operation, one per repeat ---
+
+def case_scalar_call():
+    from salary_engine.core import calculate_salary_breakdown
+
+    ctcs = [300000 + 4999.5 * i for i in range(1000)]
+
+    def run():
+        for ctc in ctcs:
+            calculate_salary_breakdown(ctc)
+    return [seconds / len(ctcs) for seconds in measure(run, 2, 15)]
+
+
+def batch_case(rows, number, repeat):
+    def case():
+        import numpy as np
+        from salary_engine.batch import calculate_salary_breakdown_batch
+
+        ctcs = np.random.default_rng(42).lognormal(np.log(1500000), 0.8, size=rows)
+        return [seconds / rows for seconds in
+                measure(lambda: calculate_salary_breakdown_batch(ctcs), number, repeat)]
+    return case
+
+
+def case_cache_hit():
+    from salary_engine.cache import BreakdownCache
+
+    cache = BreakdownCache(maxsize=2000)
+    ctcs = [300000 + 5000 * i for i in range(1000)]
+    for ctc in ctcs:
+        cache.get_breakdown(ctc)
+
+    def run():
+        for ctc in ctcs:
+            cache.get_breakdown(ctc)
+    return [seconds / len(ctcs) for seconds in measure(run, 5, 15)]
+
+
+def case_cache_miss():
+    from salary_engine.cache import BreakdownCache
+
+    ctcs = [300000 + 5000 * i for i in range(1000)]
+
+    def run():
+        cache = BreakdownCache(maxsize=2000)
+        for ctc in ctcs:
+            cache.get_breakdown(ctc)
+    return [seconds / len(ctcs) for seconds in measure(run, 2, 15)]
+
+
+def case_tk_render():
+    return run_child('tk', needs_display=True)
+
+
+CASES = {
+    'scalar_call': case_scalar_call,
+    'batch_1k': batch_case(1000, 50, 15),
+    'batch_100k': batch_case(100000, 2, 15),
+    'batch_1m': batch_case(1000000, 1, 5),
+    'cache_hit': case_cache_hit,
+    'cache_miss': case_cache_miss,
+    'tk_render': case_tk_render,
+}
+
+
+class Skipped(Exception):
+    """A case that cannot run here (no tkinter, no display)."""
+
+
+def run_child(mode, *arguments, needs_display=False):
+    """Runs ``mode`` of this script in a fresh interpreter and returns its JSON output."""
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, *arguments]
+    if needs_display and not os.environ.get('DISPLAY') and sys.platform == 'linux':
+        xvfb_run = shutil.which('xvfb-run')
+        if xvfb_run is None:
+            raise Skipped("no DISPLAY and xvfb-run is not installed (apt install xvfb)")
+        command = [xvfb_run, '-a', '-s', '-screen 0 1280x1024x24'] + command
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode == SKIPPED:
+        raise Skipped(completed.stdout.strip())
+    if completed.returncode != 0:
+        raise RuntimeError(f"{mode} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def child_tk():
+    """Times calculate_and_display plus the redraw it causes, in a real window."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # ImportError, or TclError without a display
+        print(f"tkinter unavailable: {e}")
+        return SKIPPED
+
+    sys.path.insert(0, ROOT)
+    from Salary_Calculator import SalaryCalculatorWindow
+
+    window = SalaryCalculatorWindow(root)
+    root.update()
+    ctcs = [500000 + 25000 * i for i in range(200)]
+    position = iter(range(10 ** 9))
+
+    def render():
+        window.ctc_entry.delete(0, tk.END)
+        window.ctc_entry.insert(0, str(ctcs[next(position) % len(ctcs)]))
+        window.calculate_and_display()
+        root.update()
+    print(json.dumps(measure(render, len(ctcs), 5)))
+    root.destroy()
+    return 0
+
+
+def child_fingerprint(engine_dir):
+    """
+    Prints the scalar fingerprint as computed by the engine the app in
+    ``engine_dir`` imports: a bundled copy next to it, else the repository's.
+    """
+    sys.path.insert(0, engine_dir)
+    sys.path.append(ROOT)
+    from salary_engine.core import calculate_salary_breakdown
+
+    print(json.dumps(scalar_fingerprint(calculate_salary_breakdown)))
+    return 0
+
+
+def scalar_fingerprint(calculate_salary_breakdown):
+    digest = hashlib.sha256()
+    for ctc in FINGERPRINT_CTCS:
+        digest.update(json.dumps(calculate_salary_breakdown(ctc), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def fingerprints():
+    import numpy as np
+    from salary_engine.batch import calculate_salary_breakdown_batch
+    from salary_engine.core import calculate_salary_breakdown
+
+    columns = calculate_salary_breakdown_batch(np.array(FINGERPRINT_CTCS))
+    batch = hashlib.sha256()
+    for name in sorted(columns):
+        batch.update(name.encode() + columns[name].tobytes())
+    return {
+        'scalar': scalar_fingerprint(calculate_salary_breakdown),
+        'batch': batch.hexdigest(),
+        'mobile_engine': run_child('fingerprint', MOBILE_APP_DIR),
+    }
+
+
+def environment():
+    import numpy as np
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run_case(name):
+    """Returns the case's result entry: its timings, or why it was skipped."""
+    try:
+        times = CASES[name]()
+    except Skipped as e:
+        print(f"{name:<14} skipped: {e}", file=sys.stderr)
+        return {'skipped': str(e)}
+    print(f"{name:<14} {format_seconds(min(times)):>12}", file=sys.stderr)
+    return {'seconds': min(times), 'median': statistics.median(times), 'repeats': times}
+
+
+def run_suite(names):
+    return {'suite_version': SUITE_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'environment': environment(),
+            'cases': {name: run_case(name) for name in names},
+            'fingerprints': fingerprints()}
+
+
+def same_environment(results, baseline):
+    """True if the baseline's timings were taken in the current environment."""
+    return baseline.get('environment') == results['environment']
+
+
+def confirm_regressions(results, baseline, threshold):
+    """Re-runs every case over the threshold once and keeps its better time, to rule out noise."""
+    for name, case in results['cases'].items():
+        before = baseline.get('cases', {}).get(name, {})
+        if 'seconds' in case and 'seconds' in before and case['seconds'] > before['seconds'] * (1 + threshold):
+            print(f"{name} looks slower; measuring again", file=sys.stderr)
+            again = run_case(name)
+            if again.get('seconds', float('inf')) < case['seconds']:
+                results['cases'][name] = again
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(results, baseline, threshold):
+    """Prints the comparison with a baseline; returns a list of failures."""
+    failures = []
+    if not same_environment(results, baseline):
+        print("The baseline was recorded in a different environment; comparing fingerprints only.")
+        timings = {}
+    else:
+        timings = baseline.get('cases', {})
+    print(f"{'case':<14} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, case in results['cases'].items():
+        before = timings.get(name, {})
+        if 'seconds' not in case or 'seconds' not in before:
+            print(f"{name:<14} {'-':>12} {format_seconds(case['seconds']) if 'seconds' in case else '-':>12}")
+            continue
+        change = case['seconds'] / before['seconds'] - 1
+        flag = ''
+        if change > threshold:
+            failures.append(f"{name} is {change:.0%} slower than the baseline")
+            flag = '  REGRESSION'
+        print(f"{name:<14} {format_seconds(before['seconds']):>12} "
+              f"{format_seconds(case['seconds']):>12} {change:>+8.1%}{flag}")
+
+    for name, value in results['fingerprints'].items():
+        expected = baseline.get('fingerprints', {}).get(name)
+        if expected is not None and value != expected:
+            failures.append(f"{name} results differ from the baseline")
+    return failures
+
+
+def write_json(results, path):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2)
+        handle.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the baseline.")
+    parser.add_argument('--profile', action='append', metavar='ENTRY',
+                        help="Profile this engine entry point, e.g. core.calculate_salary_breakdown.")
+    parser.add_argument('--profile-dir', default='profiles', help="Where --profile writes .prof files.")
+    parser.add_argument('--child', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        mode, *arguments = args.child
+        return child_tk() if mode == 'tk' else child_fingerprint(*arguments)
+
+    sys.path.insert(0, ROOT)
+    if args.profile:
+        from salary_engine.profiling import profile_entry_points
+
+        with profile_entry_points(args.profile, args.profile_dir):
+            results = run_suite(args.cases)
+        print(f"Wrote profiles to {args.profile_dir}/ (timings include profiling overhead)",
+              file=sys.stderr)
+    else:
+        results = run_suite(args.cases)
+
+    baseline = None
+    if not (args.profile or args.save_baseline) and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        if same_environment(results, baseline):
+            confirm_regressions(results, baseline, args.threshold)
+
+    if args.output:
+        write_json(results, args.output)
+    if args.save_baseline:
+        write_json(results, args.baseline)
+        print(f"Saved the baseline to {args.baseline}", file=sys.stderr)
+    if baseline is None:
+        return 0
+
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Salary calculation engine for the India Salary & Tax Calculator.
+
+The scalar API is always available. The vectorized batch API lives in
+``salary_engine.batch`` and needs NumPy, which is an optional dependency.
+"""
+
+from salary_engine.cache import BreakdownCache, cached_salary_breakdown
+from salary_engine.core import calculate_salary_breakdown
+
+__all__ = ['BreakdownCache', 'cached_salary_breakdown', 'calculate_salary_breakdown']
@@ -0,0 +1,176 @@
+"""
+Memoizing cache in front of the scalar engine.
+
+Most CTCs in practice fall on a small set of values (round-lakh offers, band
+midpoints, the quick-set buttons in the UIs), so recomputing them and
+building new result dicts every time is wasted work. ``BreakdownCache`` keeps
+a bounded number of results keyed on the normalized CTC and the version of
+the tax rules used, and counts hits, misses and evictions so the size can be
+tuned from real traffic.
+
+Cached results are read-only mappings; callers cannot modify an entry that
+other callers will later receive.
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+EVICTION_POLICIES = ('lru', 'fifo')
+
+DEFAULT_MAXSIZE = 4096
+
+
+def normalize_ctc(ctc_annual):
+    """Rounds a CTC to the paisa so equal amounts share one cache entry."""
+    return round(float(ctc_annual), 2)
+
+
+def freeze_breakdown(results):
+    """Returns a read-only copy of a ``calculate_salary_breakdown`` result."""
+    return MappingProxyType({
+        section: MappingProxyType(dict(values)) for section, values in results.items()
+    })
+
+
+class BreakdownCache:
+    """
+    Bounded, thread-safe cache of salary breakdowns.
+
+    Args:
+        maxsize (int): Maximum number of entries kept.
+        policy (str): 'lru' evicts the least recently used entry, 'fifo'
+            evicts the oldest inserted entry regardless of use.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, policy='lru'):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive number")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of: {', '.join(EVICTION_POLICIES)}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_breakdown(self, ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR):
+        """
+        Returns the breakdown for a CTC, computing it only on a cache miss.
+
+        Args:
+            ctc_annual (float): The annual CTC in Indian Rupees.
+            financial_year (str): Financial year whose tax rules to apply.
+
+        Returns:
+            Mapping: Same shape as ``calculate_salary_breakdown``, read-only.
+        """
+        ctc = normalize_ctc(ctc_annual)
+        key = (ctc, load_rules(financial_year).version)
+
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self.hits += 1
+                if self.policy == 'lru':
+                    self._entries.move_to_end(key)
+                return results
+            self.misses += 1
+
+        # Compute outside the lock so concurrent misses do not serialize.
+        results = freeze_breakdown(calculate_salary_breakdown(ctc, financial_year))
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = results
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return results
+
+    def export_entries(self, limit=None):
+        """
+        Returns cached entries as plain data, e.g. to persist them on disk.
+
+        Args:
+            limit (int): Only export the ``limit`` most recently used (or, for
+                'fifo', most recently inserted) entries.
+
+        Returns:
+            list: ``[ctc, rules_version, breakdown]`` lists, oldest first;
+                  ``breakdown`` is a plain dict that ``json`` can serialize.
+        """
+        with self._lock:
+            items = list(self._entries.items())
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        return [[ctc, version, {section: dict(values) for section, values in results.items()}]
+                for (ctc, version), results in items]
+
+    def import_entries(self, entries, financial_year=DEFAULT_FINANCIAL_YEAR):
+        """
+        Adds entries previously returned by ``export_entries``.
+
+        Entries computed with other tax rules than the current ones for
+        ``financial_year`` are skipped, so a rules update never serves stale
+        figures. Imported entries are treated as the oldest in the cache, so
+        they are the first to be evicted.
+
+        Returns:
+            int: The number of entries added.
+        """
+        version = load_rules(financial_year).version
+        imported = []
+        for ctc, entry_version, results in entries:
+            if entry_version == version:
+                imported.append(((normalize_ctc(ctc), version), freeze_breakdown(results)))
+
+        added = 0
+        with self._lock:
+            for key, results in reversed(imported):
+                if key in self._entries or len(self._entries) >= self.maxsize:
+                    continue
+                self._entries[key] = results
+                self._entries.move_to_end(key, last=False)
+                added += 1
+        return added
+
+    def clear(self):
+        """Drops all entries. The counters are kept; see ``reset_stats``."""
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Returns the counters and current size as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'policy': self.policy,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared cache used by the UIs and by cached_salary_breakdown().
+default_cache = BreakdownCache()
+
+
+def cached_salary_breakdown(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """``calculate_salary_breakdown`` through the shared ``default_cache``."""
+    return default_cache.get_breakdown(ctc_annual, financial_year)
@@ -0,0 +1,446 @@
+"""
+Headless command-line interface for the salary engine.
+
+Runs payroll files through the batch engine without any GUI, so it can be
+used on servers and in scheduled jobs:
+
+    python -m salary_engine payroll employees.csv results.csv
+
+The input is read and processed in fixed-size chunks and each chunk is
+written out before the next one is read, so memory use stays flat no
+matter how large the file is. CSV is always supported; Parquet and Arrow
+IPC files are supported when pyarrow is installed.
+"""
+
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from salary_engine.batch import (BATCH_COLUMNS, STRUCTURE_COLUMNS, calculate_salary_breakdown_batch,
+                                  calculate_structure_breakdown_batch)
+from salary_engine.inverse import solve_ctc_for_in_hand_batch
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR
+from salary_engine.structures import STRUCTURES_DIR
+from salary_engine.trace import CalculationTrace
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Output columns: the employee ID followed by the batch engine columns.
+OUTPUT_COLUMNS = ('employee_id',) + BATCH_COLUMNS + ('monthly_in_hand',)
+
+# Output columns when every employee has a salary structure.
+STRUCTURE_OUTPUT_COLUMNS = ('employee_id',) + STRUCTURE_COLUMNS + ('monthly_in_hand',)
+
+FILE_FORMATS = ('csv', 'parquet', 'arrow')
+
+
+def detect_format(path):
+    """Guesses the file format from the file extension, defaulting to CSV."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    if extension in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    return 'csv'
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise SystemExit("Parquet and Arrow files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _amount(text):
+    """argparse type for a rupee amount: a finite, non-negative number."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid amount: {text!r}")
+    if not (math.isfinite(value) and value >= 0):
+        raise argparse.ArgumentTypeError(f"amount must be a non-negative number: {text!r}")
+    return value
+
+
+# --- Readers: each yields (employee_ids, ctcs, structure_ids) of at most
+# chunk_size rows; structure_ids is None unless a structure column is given ---
+
+def read_csv_chunks(path, chunk_size, id_column, ctc_column, structure_column=None):
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.DictReader(handle)
+        required = {id_column, ctc_column} | ({structure_column} if structure_column else set())
+        missing = required - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(sorted(missing))}")
+
+        ids, ctcs, structures = [], [], []
+        for row in reader:
+            if row[ctc_column] is None:
+                # DictReader fills the columns missing from a short row with None.
+                raise ValueError(f"{path}:{reader.line_num}: missing CTC (row has too few columns)")
+            try:
+                ctc = float(row[ctc_column])
+            except ValueError:
+                ctc = -1.0
+            # Negative, NaN and infinite CTCs would give meaningless rows.
+            if not (math.isfinite(ctc) and ctc >= 0):
+                raise ValueError(f"{path}:{reader.line_num}: invalid CTC {row[ctc_column]!r}")
+            ctcs.append(ctc)
+            ids.append(row[id_column])
+            if structure_column:
+                structures.append(row[structure_column])
+            if len(ctcs) == chunk_size:
+                yield ids, ctcs, structures if structure_column else None
+                ids, ctcs, structures = [], [], []
+        if ctcs:
+            yield ids, ctcs, structures if structure_column else None
+
+
+def read_arrow_chunks(path, chunk_size, id_column, ctc_column, file_format, structure_column=None):
+    pyarrow = _import_pyarrow()
+    columns = [id_column, ctc_column] + ([structure_column] if structure_column else [])
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns)
+    else:
+        import pyarrow.ipc as ipc
+        reader = ipc.open_file(pyarrow.memory_map(path, 'r'))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+
+    rows = 0
+    for batch in batches:
+        # IPC record batches keep the size they were written with, so slice
+        # them down to chunk_size to keep memory bounded.
+        for offset in range(0, batch.num_rows, chunk_size):
+            part = batch.slice(offset, chunk_size)
+            ids = part.column(part.schema.get_field_index(id_column)).to_pylist()
+            ctcs = part.column(part.schema.get_field_index(ctc_column)).to_numpy()
+            invalid = np.flatnonzero(~(np.isfinite(ctcs) & (ctcs >= 0)))
+            if invalid.size:
+                raise ValueError(f"{path}: row {rows + invalid[0] + 1}: invalid CTC {ctcs[invalid[0]].item()!r}")
+            rows += len(ctcs)
+            structures = None
+            if structure_column:
+                structures = part.column(part.schema.get_field_index(structure_column)).to_pylist()
+            yield ids, ctcs, structures
+
+
+# --- Writers: each has write(employee_ids, columns) and close() ---
+
+class CsvWriter:
+    def __init__(self, path, output_columns=OUTPUT_COLUMNS):
+        self.output_columns = output_columns
+        self.handle = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.handle)
+        self.writer.writerow(output_columns)
+
+    def write(self, employee_ids, columns):
+        values = [columns[name].tolist() for name in self.output_columns[1:]]
+        self.writer.writerows(
+            [employee_id] + [f"{value:.2f}" for value in row]
+            for employee_id, row in zip(employee_ids, zip(*values))
+        )
+
+    def close(self):
+        self.handle.close()
+
+
+class ArrowWriter:
+    def __init__(self, path, file_format, output_columns=OUTPUT_COLUMNS):
+        self.pyarrow = _import_pyarrow()
+        self.path = path
+        self.file_format = file_format
+        self.output_columns = output_columns
+        self.writer = None
+
+    def write(self, employee_ids, columns):
+        pa = self.pyarrow
+        arrays = [pa.array(employee_ids)] + [pa.array(columns[name]) for name in self.output_columns[1:]]
+        batch = pa.RecordBatch.from_arrays(arrays, names=list(self.output_columns))
+        if self.writer is None:
+            if self.file_format == 'parquet':
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, batch.schema)
+            else:
+                import pyarrow.ipc as ipc
+                self.writer = ipc.new_file(self.path, batch.schema)
+        if self.file_format == 'parquet':
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_reader(path, file_format, chunk_size, id_column, ctc_column, structure_column=None):
+    if file_format == 'csv':
+        return read_csv_chunks(path, chunk_size, id_column, ctc_column, structure_column)
+    return read_arrow_chunks(path, chunk_size, id_column, ctc_column, file_format, structure_column)
+
+
+def open_writer(path, file_format, output_columns=OUTPUT_COLUMNS):
+    if file_format == 'csv':
+        return CsvWriter(path, output_columns)
+    return ArrowWriter(path, file_format, output_columns)
+
+
+def process_payroll(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE,
+                    input_format=None, output_format=None,
+                    id_column='employee_id', ctc_column='ctc', structure_column=None,
+                    structures_dir=STRUCTURES_DIR, trace_path=None):
+    """
+    Streams a payroll file through the batch engine and writes the results.
+
+    Args:
+        input_path (str): File with one row per employee.
+        output_path (str): Where to write the breakdown, one row per employee.
+        chunk_size (int): Number of rows read, computed and written at a time.
+        input_format (str): 'csv', 'parquet' or 'arrow'. Guessed from the
+            file extension when None.
+        output_format (str): Same as input_format, for the output file.
+        id_column (str): Name of the employee ID column in the input.
+        ctc_column (str): Name of the annual CTC column in the input.
+        structure_column (str): Name of the salary structure (grade) column
+            in the input. When given, every row is split into components
+            with its structure (see ``salary_engine.structures``) and the
+            output has ``STRUCTURE_OUTPUT_COLUMNS``.
+        structures_dir (str): Directory holding the structure files.
+        trace_path (str): If given, every calculation is appended to this
+            trace log (see ``salary_engine.trace``) as its chunk is written;
+            a record's 'call' is the chunk number and its 'row' the row
+            within the chunk. Not available with ``structure_column``.
+
+    Returns:
+        dict: 'rows', 'chunks' and 'seconds' for the whole run, and 'stages'
+              (``CalculationTrace.stage_report()``) when tracing.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive number")
+    if trace_path and structure_column:
+        raise ValueError("tracing is not available with salary structures")
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+
+    trace = CalculationTrace() if trace_path else None
+    start = time.perf_counter()
+    rows = chunks = 0
+    writer = open_writer(output_path, output_format,
+                         STRUCTURE_OUTPUT_COLUMNS if structure_column else OUTPUT_COLUMNS)
+    try:
+        for employee_ids, ctcs, structure_ids in open_reader(input_path, input_format, chunk_size,
+                                                             id_column, ctc_column, structure_column):
+            if structure_column:
+                columns = calculate_structure_breakdown_batch(ctcs, structure_ids,
+                                                              directory=structures_dir)
+            else:
+                columns = calculate_salary_breakdown_batch(ctcs, trace=trace)
+            columns['monthly_in_hand'] = columns['in_hand'] / 12
+            writer.write(employee_ids, columns)
+            if trace is not None:
+                trace.write(trace_path)
+            rows += len(employee_ids)
+            chunks += 1
+    finally:
+        writer.close()
+
+    stats = {'rows': rows, 'chunks': chunks, 'seconds': time.perf_counter() - start}
+    if trace is not None:
+        stats['stages'] = trace.stage_report()
+    return stats
+
+
+def run_payroll(args):
+    try:
+        stats = process_payroll(args.input, args.output, chunk_size=args.chunk_size,
+                                input_format=args.input_format,
+                                output_format=args.output_format,
+                                id_column=args.id_column, ctc_column=args.ctc_column,
+                                structure_column=args.structure_column,
+                                structures_dir=args.structures_dir or STRUCTURES_DIR,
+                                trace_path=args.trace)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    seconds = stats['seconds']
+    rate = stats['rows'] / seconds if seconds > 0 else float('inf')
+    print(f"Processed {stats['rows']:,} rows in {stats['chunks']:,} chunk(s) "
+          f"in {seconds:.2f} s ({rate:,.0f} rows/s)", file=sys.stderr)
+    for stage, calls, rows, seconds, rate in stats.get('stages', ()):
+        print(f"  {stage:<16}{seconds:>8.3f} s {rate:>16,.0f} rows/s", file=sys.stderr)
+    return 0
+
+
+def run_inverse(args):
+    try:
+        ctcs = solve_ctc_for_in_hand_batch(args.monthly_in_hand, args.financial_year)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{'Monthly In-Hand':>18}  {'Required Annual CTC':>20}")
+    for target, ctc in zip(args.monthly_in_hand, ctcs.tolist()):
+        print(f"{target:>18,.2f}  {ctc:>20,.2f}")
+    return 0
+
+
+def run_serve(args):
+    from salary_engine.service import run_service
+
+    print(f"Serving on http://{args.host}:{args.port} (Ctrl+C to stop)", file=sys.stderr)
+    run_service(args.host, args.port, batch_window=args.batch_window_ms / 1000,
+                max_batch=args.max_batch)
+    return 0
+
+
+def run_build_index(args):
+    from salary_engine.lookup import INDEX_DIR, build_index, index_path
+
+    years = args.financial_year or [DEFAULT_FINANCIAL_YEAR]
+    for financial_year in years:
+        start = time.perf_counter()
+        try:
+            path = index_path(financial_year, args.output_dir or INDEX_DIR)
+            build_index(financial_year, path, step=args.step, max_ctc=args.max_ctc)
+        except (OSError, ValueError) as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {path} ({os.path.getsize(path):,} bytes) "
+              f"in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 0
+
+
+def run_sweep(args):
+    from salary_engine.sweep import (SWEEP_COLUMNS, format_sweep_row, salary_sweep,
+                                     sweep_points, write_sweep_csv)
+
+    try:
+        sweep = salary_sweep(sweep_points(args.start, args.stop, args.step), args.financial_year)
+        if args.output:
+            write_sweep_csv(sweep, args.output)
+            print(f"Wrote {len(sweep['ctc']):,} rows to {args.output}", file=sys.stderr)
+            return 0
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    widths = [max(len(heading), 16) for heading in SWEEP_COLUMNS.values()]
+    print("  ".join(heading.rjust(width) for heading, width in zip(SWEEP_COLUMNS.values(), widths)))
+    for index in range(len(sweep['ctc'])):
+        print("  ".join(value.rjust(width) for value, width in zip(format_sweep_row(sweep, index), widths)))
+    return 0
+
+
+def run_project(args):
+    from salary_engine.projection import PayrollProjection, read_events_csv, write_schedule_csv
+
+    try:
+        projection = PayrollProjection(args.financial_year)
+        # Each file is applied on top of the previous ones, and only the
+        # employees and months it changes are recomputed.
+        for path in args.events:
+            start = time.perf_counter()
+            projection.apply_events(*read_events_csv(path))
+            updated = projection.update()
+            print(f"{path}: re-projected {updated:,} employee(s) "
+                  f"in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+        write_schedule_csv(projection, args.output)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote the schedule of {len(projection):,} employee(s) to {args.output}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m salary_engine',
+        description="India Salary & Tax Calculator (FY 2025-26 New Regime), headless mode.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    payroll = commands.add_parser('payroll', help="Compute the breakdown for every row of a payroll file.")
+    payroll.add_argument('input', help="Input file with employee IDs and annual CTCs.")
+    payroll.add_argument('output', help="Output file for the breakdown.")
+    payroll.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help=f"Rows per chunk (default: {DEFAULT_CHUNK_SIZE}).")
+    payroll.add_argument('--input-format', choices=FILE_FORMATS,
+                         help="Input format (default: from the file extension).")
+    payroll.add_argument('--output-format', choices=FILE_FORMATS,
+                         help="Output format (default: from the file extension).")
+    payroll.add_argument('--id-column', default='employee_id',
+                         help="Employee ID column name (default: employee_id).")
+    payroll.add_argument('--ctc-column', default='ctc',
+                         help="Annual CTC column name (default: ctc).")
+    payroll.add_argument('--structure-column',
+                         help="Salary structure (grade) column; splits each CTC into components.")
+    payroll.add_argument('--structures-dir',
+                         help="Directory of salary structure files (default: salary_engine/structures).")
+    payroll.add_argument('--trace', metavar='FILE',
+                         help="Append an audit record of every calculation to this trace log "
+                              "and print the time spent in each engine stage.")
+    payroll.set_defaults(handler=run_payroll)
+
+    inverse = commands.add_parser('inverse', help="Find the annual CTC needed for a target monthly in-hand salary.")
+    inverse.add_argument('monthly_in_hand', type=_amount, nargs='+',
+                         help="One or more target Monthly In-Hand Salaries (in ₹).")
+    inverse.add_argument('--financial-year', default=DEFAULT_FINANCIAL_YEAR,
+                         help=f"Financial year of the tax rules (default: {DEFAULT_FINANCIAL_YEAR}).")
+    inverse.set_defaults(handler=run_inverse)
+
+    serve = commands.add_parser('serve', help="Run the HTTP/JSON calculation service.")
+    serve.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1).")
+    serve.add_argument('--port', type=int, default=8080, help="Port to listen on (default: 8080).")
+    serve.add_argument('--batch-window-ms', type=float, default=2.0,
+                       help="How long to collect single-CTC requests into one batch (default: 2).")
+    serve.add_argument('--max-batch', type=int, default=4096,
+                       help="Flush a batch early once this many requests are waiting (default: 4096).")
+    serve.set_defaults(handler=run_serve)
+
+    sweep = commands.add_parser('sweep', help="Compare in-hand pay and tax rates across a CTC range.")
+    sweep.add_argument('--from', dest='start', type=_amount, default=5, help="First CTC in LPA (default: 5).")
+    sweep.add_argument('--to', dest='stop', type=_amount, default=100, help="Last CTC in LPA (default: 100).")
+    sweep.add_argument('--step', type=_amount, default=0.5, help="Step in LPA (default: 0.5).")
+    sweep.add_argument('--financial-year', default=DEFAULT_FINANCIAL_YEAR,
+                       help=f"Financial year of the tax rules (default: {DEFAULT_FINANCIAL_YEAR}).")
+    sweep.add_argument('--output', help="Write the sweep to this CSV file instead of printing it.")
+    sweep.set_defaults(handler=run_sweep)
+
+    project = commands.add_parser('project', help="Project month-wise TDS, PF and in-hand from salary events.")
+    project.add_argument('events', nargs='+',
+                         help="Event CSV files (employee_id, month, kind, amount), applied in order.")
+    project.add_argument('--output', required=True, help="CSV file for the month-wise schedule.")
+    project.add_argument('--financial-year', default=DEFAULT_FINANCIAL_YEAR,
+                         help=f"Financial year of the tax rules (default: {DEFAULT_FINANCIAL_YEAR}).")
+    project.set_defaults(handler=run_project)
+
+    build_index = commands.add_parser('build-index', help="Precompute the memory-mapped CTC lookup index.")
+    build_index.add_argument('--financial-year', action='append',
+                             help=f"Financial year to build; repeat for several (default: {DEFAULT_FINANCIAL_YEAR}).")
+    build_index.add_argument('--step', type=int, default=1000, help="Grid spacing in ₹ (default: 1000).")
+    build_index.add_argument('--max-ctc', type=int, default=50000000, help="Highest CTC on the grid (default: 5 Cr).")
+    build_index.add_argument('--output-dir', help="Directory for the index files (default: salary_engine/indexes).")
+    build_index.set_defaults(handler=run_build_index)
+
+    return parser
+
+
+def main(argv=None):
+    from salary_engine.profiling import profile_from_environment
+
+    args = build_parser().parse_args(argv)
+    try:
+        profiling = profile_from_environment()
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    with profiling:
+        return args.handler(args)
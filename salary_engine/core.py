@@ -0,0 +1,240 @@
+"""
+Scalar salary breakdown engine.
+
+This module holds the tax and take-home calculation used by both the
+Tkinter desktop app and the KivyMD mobile app. It has no UI dependencies
+so it can be imported by scripts, batch jobs and worker processes.
+"""
+
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, DEFAULT_REGIME, load_rules
+
+# Keys of the ``declarations`` dict: what an employee declares for the old
+# regime. All amounts are annual; 'metro' is True for a metro city (Delhi,
+# Mumbai, Kolkata, Chennai), which raises the HRA exemption limit.
+DECLARATION_FIELDS = ('investments_80c', 'health_insurance_80d', 'rent_paid', 'metro')
+
+# (financial year, regime, rules) of the previous calculate_salary_breakdown
+# call. A payroll uses the same year and regime for every employee, so the
+# rules are usually resolved without even a cache lookup.
+_last_rules = (None, None, None)
+
+
+def income_tax(taxable_income, rules):
+    """
+    Calculates the income tax on a taxable income, after the Section 87A
+    rebate and marginal relief.
+
+    Args:
+        taxable_income (float): Annual taxable income in Indian Rupees.
+        rules (TaxRules): Compiled rule set, see ``salary_engine.rules``.
+
+    Returns:
+        tuple: (tax before cess, surcharge, health and education cess).
+    """
+    # Income Tax Calculation as per the New Tax Regime slabs.
+    # The slabs come from the rule file for the financial year (for FY 2025-26:
+    # nil up to ₹4L, then 5%/10%/15%/20%/25% per ₹4L band, 30% above ₹24L) and
+    # are precompiled into a cumulative table, so this is one lookup.
+    annual_tax_before_cess = rules.slab_tax(taxable_income)
+
+    # Section 87A Rebate
+    # This rebate ensures that individuals with net taxable income up to the
+    # rebate limit (₹12,00,000 for FY 2025-26) pay zero income tax.
+    # The maximum rebate is ₹60,000 for FY 2025-26.
+    if taxable_income <= rules.rebate_income_limit:
+        annual_tax_before_cess = max(0, annual_tax_before_cess - rules.rebate_max) # Apply rebate, ensure tax doesn't go negative
+    elif rules.rebate_marginal_relief:
+        # Marginal relief: just above the limit, tax cannot exceed the income
+        # earned above the limit (e.g. ₹12,10,000 pays at most ₹10,000).
+        annual_tax_before_cess = min(annual_tax_before_cess,
+                                     taxable_income - rules.rebate_income_limit)
+
+    # Surcharge Calculation
+    # Surcharge applies to very high incomes. Under the New Regime:
+    # >₹50L to ₹1Cr: 10%
+    # >₹1Cr to ₹2Cr: 15%
+    # >₹2Cr: 25% (capped at 25% under the new regime, vs 37% in the old regime)
+    # Marginal relief ensures that crossing a threshold never costs more in
+    # tax + surcharge than the income earned above that threshold.
+    surcharge = rules.surcharge(taxable_income, annual_tax_before_cess)
+
+    # Health and Education Cess
+    # A mandatory 4% cess is levied on the income tax (including surcharge, if any).
+    health_cess = (annual_tax_before_cess + surcharge) * rules.cess_rate
+
+    return annual_tax_before_cess, surcharge, health_cess
+
+
+def regime_deductions(rules, basic_da_annual, pf_employee_annual, declarations=None):
+    """
+    Calculates the exemptions and deductions a regime allows on top of the
+    standard deduction. All of them are 0 under the New Regime.
+
+    Args:
+        rules (TaxRules): Compiled rule set.
+        basic_da_annual (float): Annual Basic + DA.
+        pf_employee_annual (float): Annual employee PF contribution, which
+            counts towards Section 80C.
+        declarations (dict): Declared amounts, see ``DECLARATION_FIELDS``.
+
+    Returns:
+        tuple: (HRA exemption, 80C deduction, 80D deduction).
+    """
+    declarations = declarations or {}
+
+    # HRA exemption, Section 10(13A): the least of the HRA received, rent paid
+    # above 10% of Basic + DA, and 50% (metro) or 40% of Basic + DA.
+    hra_exemption = 0
+    if rules.hra_exemption:
+        hra_received = basic_da_annual * rules.hra_assumed_share
+        city_share = rules.hra_metro_share if declarations.get('metro') else rules.hra_non_metro_share
+        hra_exemption = max(0, min(hra_received,
+                                   declarations.get('rent_paid', 0) - rules.hra_rent_excess * basic_da_annual,
+                                   city_share * basic_da_annual))
+
+    # Section 80C: employee PF plus declared investments (PPF, ELSS, life
+    # insurance, ...), up to the limit. Section 80D: health insurance.
+    deduction_80c = min(pf_employee_annual + declarations.get('investments_80c', 0), rules.deduction_80c_limit)
+    deduction_80d = min(declarations.get('health_insurance_80d', 0), rules.deduction_80d_limit)
+    return hra_exemption, deduction_80c, deduction_80d
+
+
+def calculate_salary_breakdown(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR,
+                               regime=DEFAULT_REGIME, declarations=None, trace=None):
+    """
+    Calculates the annual and monthly salary breakdown based on India's
+    New Tax Regime, assuming 12 LPA exemption is effectively applied
+    (FY 2025-26 by default), or on the Old Regime.
+
+    Args:
+        ctc_annual (float): The annual Cost to Company (CTC) in Indian Rupees.
+        financial_year (str): Financial year whose tax rules to apply,
+            e.g. '2025-26'. See ``salary_engine.rules``.
+        regime (str): 'new' (default) or 'old'.
+        declarations (dict): Old Regime only: declared 80C investments, 80D
+            premiums and rent, see ``DECLARATION_FIELDS``. Under the Old
+            Regime the annual breakdown also lists the HRA exemption and the
+            80C and 80D deductions.
+        trace (CalculationTrace): If given, the intermediate figures (slab,
+            PF cap, 87A rebate, surcharge relief, cess) are recorded for the
+            audit trail, see ``salary_engine.trace``.
+
+    Returns:
+        dict: A dictionary containing annual and monthly salary breakdown details.
+              Returns None if input is invalid.
+    """
+    global _last_rules
+    last_year, last_regime, rules = _last_rules
+    if financial_year != last_year or regime != last_regime:
+        rules = load_rules(financial_year, regime)
+        _last_rules = (financial_year, regime, rules)
+
+    # --- Annual Calculations ---
+    
+    # Standard Deduction in the New Tax Regime.
+    # This is a fixed deduction for salaried individuals and pensioners.
+    standard_deduction_annual = rules.standard_deduction
+
+    # PF Contribution (Employee's share: 12% of Basic + DA, capped at Rs. 15,000 basic for calculation purposes)
+    # IMPORTANT SIMPLIFICATION:
+    # In a real-world scenario, CTC is broken down into various components (Basic, HRA, LTA, etc.).
+    # PF is typically calculated on 'Basic Salary' + 'Dearness Allowance (DA)'.
+    # The statutory wage ceiling for PF contribution is ₹15,000 per month (₹1,80,000 annually) for Basic + DA.
+    # For this simplified calculator, we are assuming 'Basic + DA' is 50% of the CTC.
+    # This is a common, but not universal, industry practice. For exact figures,
+    # you would need the precise Basic + DA component of your CTC; see
+    # salary_engine.structures for configurable salary structures.
+    
+    pf_basic_limit_annual = rules.pf_wage_ceiling_annual # Annual statutory limit for Basic + DA for PF calculation
+    assumed_basic_da_annual = ctc_annual * rules.assumed_basic_da_share # Assuming 50% of CTC is Basic + DA
+
+    if assumed_basic_da_annual > pf_basic_limit_annual:
+        # If assumed Basic+DA exceeds the statutory limit, PF is calculated on the limit.
+        pf_employee_annual = rules.pf_rate * pf_basic_limit_annual
+    else:
+        # Otherwise, PF is calculated on the assumed Basic+DA.
+        pf_employee_annual = rules.pf_rate * assumed_basic_da_annual
+
+    # Taxable Income Calculation (New Regime)
+    # Under the New Tax Regime, most traditional deductions (like 80C, 80D, HRA exemption)
+    # are not allowed. Only the standard deduction (for salaried) and employer's NPS contribution
+    # (if applicable, not included in this simplified model; see salary_engine.structures)
+    # are typically considered.
+    # For simplicity, we consider CTC as the starting point and subtract PF and standard deduction.
+    
+    # Under the Old Regime, PF is not deducted here: it counts towards 80C
+    # below, together with the declared investments, and only up to the limit.
+    if rules.pf_in_80c:
+        taxable_income_before_rebate = ctc_annual - standard_deduction_annual
+    else:
+        taxable_income_before_rebate = ctc_annual - pf_employee_annual - standard_deduction_annual
+
+    # The Old Regime also allows the HRA exemption and Chapter VI-A deductions
+    # (80C, which includes the employee's own PF contribution, and 80D).
+    if rules.allows_deductions:
+        hra_exemption, deduction_80c, deduction_80d = regime_deductions(
+            rules, assumed_basic_da_annual, pf_employee_annual, declarations)
+        taxable_income_before_rebate = (taxable_income_before_rebate - hra_exemption
+                                        - deduction_80c - deduction_80d)
+    
+    # Ensure taxable income doesn't go below zero
+    if taxable_income_before_rebate < 0:
+        taxable_income_before_rebate = 0
+
+    # Slab tax, 87A rebate, surcharge and cess.
+    annual_tax_before_cess, surcharge, health_cess = income_tax(taxable_income_before_rebate, rules)
+
+    total_annual_tax = annual_tax_before_cess + surcharge + health_cess
+
+    # Final In-Hand Salary Calculation (Annual)
+    # This is a simplified "in-hand" calculation.
+    # Actual in-hand salary would also account for other deductions like:
+    # Professional Tax (state-specific), company-specific deductions (e.g., loan repayments,
+    # voluntary deductions, other allowances, etc.).
+    annual_in_hand_salary = ctc_annual - total_annual_tax - pf_employee_annual
+
+    if trace is not None:
+        trace.record(rules, ctc_annual, assumed_basic_da_annual, pf_employee_annual,
+                     (hra_exemption, deduction_80c, deduction_80d) if rules.allows_deductions else (0, 0, 0),
+                     taxable_income_before_rebate, annual_tax_before_cess, surcharge, health_cess,
+                     total_annual_tax, annual_in_hand_salary)
+
+    # --- Monthly Calculations ---
+    # Divide annual figures by 12 to get monthly equivalents.
+    monthly_ctc = ctc_annual / 12
+    monthly_pf_deduction = pf_employee_annual / 12
+    monthly_tax = total_annual_tax / 12
+    monthly_in_hand = annual_in_hand_salary / 12
+
+    # Store results in a dictionary
+    if rules.allows_deductions:
+        annual = {
+            'Annual CTC': ctc_annual,
+            'Annual Standard Deduction': standard_deduction_annual,
+            'Annual HRA Exemption': hra_exemption,
+            'Annual 80C Deduction': deduction_80c,
+            'Annual 80D Deduction': deduction_80d,
+            'Annual Employee PF Deduction': pf_employee_annual,
+            'Annual Taxable Income (before rebate)': taxable_income_before_rebate,
+            'Total Annual Income Tax': total_annual_tax,
+            'Annual In-Hand Salary': annual_in_hand_salary
+        }
+    else:
+        annual = {
+            'Annual CTC': ctc_annual,
+            'Annual Standard Deduction': standard_deduction_annual,
+            'Annual Employee PF Deduction': pf_employee_annual,
+            'Annual Taxable Income (before rebate)': taxable_income_before_rebate,
+            'Total Annual Income Tax': total_annual_tax,
+            'Annual In-Hand Salary': annual_in_hand_salary
+        }
+
+    return {
+        'annual': annual,
+        'monthly': {
+            'Monthly CTC': monthly_ctc,
+            'Monthly Employee PF Deduction': monthly_pf_deduction,
+            'Monthly Income Tax': monthly_tax,
+            'Monthly In-Hand Salary': monthly_in_hand
+        },
+    }
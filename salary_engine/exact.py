@@ -0,0 +1,400 @@
+"""
+Exact salary breakdown in integer paise.
+
+``calculate_salary_breakdown`` works in floats and leaves rounding to the
+display (``:,.2f``). Each figure is then off by a fraction of a paisa, and
+across a large payroll the summed totals drift away from what finance
+reconciles to: the sum of the figures actually printed on the payslips.
+
+This module computes the same breakdown with every amount an integer
+number of paise. Rates are held as integer basis points, and every rounding
+happens at a fixed, documented point (``ROUNDING``), always half up:
+
+    Basic + DA, HRA      to the paisa
+    employee PF          to the rupee (EPF contributions are whole rupees)
+    taxable income       to the nearest ₹10 (Section 288A)
+    surcharge, cess      to the rupee
+    total tax            to the nearest ₹10 (Section 288B)
+    monthly figures      annual / 12 to the paisa
+
+As a result, every figure is exact and repeatable, and CTC = in-hand + tax
++ PF holds to the paisa for every employee and for any total. Figures can
+differ from the float engine by the rounding above, a few rupees at most.
+
+``calculate_salary_breakdown_paise`` handles one CTC without NumPy (the
+apps can use it). ``calculate_salary_breakdown_paise_batch`` does the same
+arithmetic on int64 NumPy arrays and gives identical results.
+"""
+
+from bisect import bisect_left, bisect_right
+from decimal import ROUND_HALF_UP, Decimal
+
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, DEFAULT_REGIME, load_rules
+
+PAISE_PER_RUPEE = 100
+
+# Rates are integer parts per RATE_SCALE (basis points): 12% == 1200.
+RATE_SCALE = 10000
+
+# Rounding unit of every rounded figure, in paise. All rounding is half up.
+ROUNDING = {
+    'basic_da': 1,
+    'hra_exemption': 1,
+    'pf': 100,
+    'taxable_income': 1000,
+    'surcharge': 100,
+    'cess': 100,
+    'total_tax': 1000,
+}
+
+# Largest CTC accepted, in rupees: keeps every intermediate product of a
+# paise amount and a rate well inside int64.
+MAX_CTC = 10 ** 11
+
+# Columns returned by calculate_salary_breakdown_paise_batch, in output
+# order (the batch engine's columns, in paise).
+PAISE_COLUMNS = (
+    'ctc',
+    'pf',
+    'taxable_income',
+    'tax_before_cess',
+    'surcharge',
+    'cess',
+    'total_tax',
+    'in_hand',
+)
+
+# Extra columns under regimes that allow exemptions and deductions.
+PAISE_DEDUCTION_COLUMNS = ('hra_exemption', 'deduction_80c', 'deduction_80d')
+
+_compiled_rules = {}
+
+
+def to_paise(amount):
+    """
+    Converts a rupee amount to integer paise, rounding half up.
+
+    ints, Decimals and strings are converted exactly. A float is converted
+    as the binary value it holds, the same way the batch function converts
+    float arrays (amounts are expected to be non-negative).
+    """
+    if isinstance(amount, int):
+        return amount * PAISE_PER_RUPEE
+    if isinstance(amount, (Decimal, str)):
+        return int((Decimal(amount) * PAISE_PER_RUPEE).to_integral_value(ROUND_HALF_UP))
+    return int(amount * PAISE_PER_RUPEE + 0.5)
+
+
+def to_rupees(paise):
+    """Returns an amount in paise as an exact Decimal number of rupees."""
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def _divide(numerator, denominator):
+    # Integer division rounding half up. Floor division makes this the same
+    # for Python ints and NumPy int64 arrays, negative numerators included.
+    return (numerator + denominator // 2) // denominator
+
+
+def _round(paise, unit):
+    return _divide(paise, unit) * unit
+
+
+def _apply_rate(paise, rate, unit=1):
+    """``paise`` times a basis-point rate, rounded half up to ``unit`` paise."""
+    return _divide(paise * rate, RATE_SCALE * unit) * unit
+
+
+def _exact_int(value, scale, what, version):
+    scaled = round(value * scale)
+    if abs(scaled - value * scale) > 1e-6:
+        raise ValueError(f"{version}: {what} {value!r} cannot be represented exactly in integers")
+    return scaled
+
+
+class PaiseRules:
+    """
+    A ``TaxRules`` with every amount in paise and every rate in basis points.
+
+    Attributes have the same names and meaning as on ``TaxRules``.
+    """
+
+    def __init__(self, rules):
+        version = rules.version
+        self.version = version
+        self.allows_deductions = rules.allows_deductions
+        self.pf_in_80c = rules.pf_in_80c
+        self.hra_exemption = rules.hra_exemption
+        self.rebate_marginal_relief = rules.rebate_marginal_relief
+
+        def paise(value, what):
+            return _exact_int(value, PAISE_PER_RUPEE, what, version)
+
+        def rate(value, what):
+            return _exact_int(value, RATE_SCALE, what, version)
+
+        self.standard_deduction = paise(rules.standard_deduction, 'standard deduction')
+        self.pf_rate = rate(rules.pf_rate, 'PF rate')
+        self.pf_wage_ceiling_annual = paise(rules.pf_wage_ceiling_annual, 'PF wage ceiling')
+        self.assumed_basic_da_share = rate(rules.assumed_basic_da_share, 'Basic + DA share')
+        self.rebate_income_limit = paise(rules.rebate_income_limit, '87A income limit')
+        self.rebate_max = paise(rules.rebate_max, '87A rebate')
+        self.deduction_80c_limit = paise(rules.deduction_80c_limit, '80C limit')
+        self.deduction_80d_limit = paise(rules.deduction_80d_limit, '80D limit')
+        self.hra_assumed_share = rate(rules.hra_assumed_share, 'HRA share')
+        self.hra_metro_share = rate(rules.hra_metro_share, 'HRA metro share')
+        self.hra_non_metro_share = rate(rules.hra_non_metro_share, 'HRA non-metro share')
+        self.hra_rent_excess = rate(rules.hra_rent_excess, 'HRA rent excess')
+        self.cess_rate = rate(rules.cess_rate, 'cess rate')
+
+        self.thresholds = tuple(paise(threshold, 'slab threshold') for threshold in rules.thresholds)
+        self.rates = tuple(rate(value, 'slab rate') for value in rules.rates)
+        base_tax = [0]
+        for i in range(1, len(self.thresholds)):
+            base_tax.append(base_tax[-1] + _apply_rate(self.thresholds[i] - self.thresholds[i - 1],
+                                                       self.rates[i - 1]))
+        self.base_tax = tuple(base_tax)
+        # base_tax - threshold * rate, scaled by RATE_SCALE: the slab tax is
+        # (slab_intercept + income * rate) / RATE_SCALE, with one rounding.
+        self.slab_intercepts = tuple(tax * RATE_SCALE - threshold * rate for tax, threshold, rate
+                                     in zip(self.base_tax, self.thresholds, self.rates))
+
+        self.surcharge_thresholds = tuple(paise(threshold, 'surcharge threshold')
+                                          for threshold in rules.surcharge_thresholds)
+        self.surcharge_rates = tuple(rate(value, 'surcharge rate') for value in rules.surcharge_rates)
+        self.surcharge_caps = tuple(
+            _apply_rate(self.slab_tax(threshold), RATE_SCALE + (self.surcharge_rates[i - 1] if i else 0))
+            for i, threshold in enumerate(self.surcharge_thresholds))
+
+    def __repr__(self):
+        return f"PaiseRules({self.version!r})"
+
+    def slab_tax(self, income):
+        if income <= 0:
+            return 0
+        i = bisect_right(self.thresholds, income) - 1
+        return self.base_tax[i] + _apply_rate(income - self.thresholds[i], self.rates[i])
+
+
+def load_paise_rules(financial_year=DEFAULT_FINANCIAL_YEAR, regime=DEFAULT_REGIME):
+    """Returns the rule set for a year and regime in paise; cached per rule-set version."""
+    rules = load_rules(financial_year, regime)
+    compiled = _compiled_rules.get(rules.version)
+    if compiled is None:
+        compiled = _compiled_rules[rules.version] = PaiseRules(rules)
+    return compiled
+
+
+def income_tax_paise(taxable_income, rules):
+    """
+    ``salary_engine.core.income_tax`` in paise.
+
+    Args:
+        taxable_income (int): Taxable income in paise, already rounded to ₹10.
+        rules (PaiseRules): Rule set from ``load_paise_rules``.
+
+    Returns:
+        tuple: (tax before cess, surcharge, cess), each in paise.
+    """
+    tax = rules.slab_tax(taxable_income)
+    if taxable_income <= rules.rebate_income_limit:
+        tax = max(0, tax - rules.rebate_max)
+    elif rules.rebate_marginal_relief:
+        tax = min(tax, taxable_income - rules.rebate_income_limit)
+
+    surcharge = 0
+    i = bisect_left(rules.surcharge_thresholds, taxable_income) - 1
+    if i >= 0:
+        relieved = rules.surcharge_caps[i] + (taxable_income - rules.surcharge_thresholds[i]) - tax
+        surcharge = _round(min(_apply_rate(tax, rules.surcharge_rates[i]), relieved), ROUNDING['surcharge'])
+
+    cess = _apply_rate(tax + surcharge, rules.cess_rate, ROUNDING['cess'])
+    return tax, surcharge, cess
+
+
+def calculate_salary_breakdown_paise(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR,
+                                     regime=DEFAULT_REGIME, declarations=None):
+    """
+    Exact ``calculate_salary_breakdown``: same keys, every value in paise.
+
+    Args:
+        ctc_annual (int, float, Decimal or str): Annual CTC in rupees; see
+            ``to_paise``.
+        financial_year (str): Financial year whose tax rules to apply.
+        regime (str): 'new' (default) or 'old'.
+        declarations (dict): Old Regime declarations in rupees, see
+            ``salary_engine.core.DECLARATION_FIELDS``.
+
+    Returns:
+        dict: 'annual' and 'monthly' dicts as ``calculate_salary_breakdown``
+              returns, with int values in paise (``to_rupees`` converts).
+
+    Raises:
+        ValueError: If the CTC is negative or above ``MAX_CTC``.
+    """
+    rules = load_paise_rules(financial_year, regime)
+    ctc = to_paise(ctc_annual)
+    if not 0 <= ctc <= MAX_CTC * PAISE_PER_RUPEE:
+        raise ValueError(f"CTC must be between 0 and {MAX_CTC:,} rupees")
+
+    basic_da = _apply_rate(ctc, rules.assumed_basic_da_share, ROUNDING['basic_da'])
+    pf = _apply_rate(min(basic_da, rules.pf_wage_ceiling_annual), rules.pf_rate, ROUNDING['pf'])
+
+    # Under the Old Regime PF is deducted as part of 80C instead.
+    taxable_income = ctc - rules.standard_deduction if rules.pf_in_80c else ctc - pf - rules.standard_deduction
+    if rules.allows_deductions:
+        declarations = declarations or {}
+        hra_exemption = 0
+        if rules.hra_exemption:
+            city_share = rules.hra_metro_share if declarations.get('metro') else rules.hra_non_metro_share
+            hra_exemption = max(0, min(
+                _apply_rate(basic_da, rules.hra_assumed_share, ROUNDING['hra_exemption']),
+                to_paise(declarations.get('rent_paid', 0))
+                - _apply_rate(basic_da, rules.hra_rent_excess, ROUNDING['hra_exemption']),
+                _apply_rate(basic_da, city_share, ROUNDING['hra_exemption'])))
+        deduction_80c = min(pf + to_paise(declarations.get('investments_80c', 0)), rules.deduction_80c_limit)
+        deduction_80d = min(to_paise(declarations.get('health_insurance_80d', 0)), rules.deduction_80d_limit)
+        taxable_income = taxable_income - hra_exemption - deduction_80c - deduction_80d
+    taxable_income = _round(max(taxable_income, 0), ROUNDING['taxable_income'])
+
+    tax, surcharge, cess = income_tax_paise(taxable_income, rules)
+    total_tax = _round(tax + surcharge + cess, ROUNDING['total_tax'])
+    in_hand = ctc - total_tax - pf
+
+    return {
+        'annual': {
+            'Annual CTC': ctc,
+            'Annual Standard Deduction': rules.standard_deduction,
+            **({
+                'Annual HRA Exemption': hra_exemption,
+                'Annual 80C Deduction': deduction_80c,
+                'Annual 80D Deduction': deduction_80d,
+            } if rules.allows_deductions else {}),
+            'Annual Employee PF Deduction': pf,
+            'Annual Taxable Income (before rebate)': taxable_income,
+            'Total Annual Income Tax': total_tax,
+            'Annual In-Hand Salary': in_hand,
+        },
+        'monthly': {
+            'Monthly CTC': _divide(ctc, 12),
+            'Monthly Employee PF Deduction': _divide(pf, 12),
+            'Monthly Income Tax': _divide(total_tax, 12),
+            'Monthly In-Hand Salary': _divide(in_hand, 12),
+        },
+    }
+
+
+def calculate_salary_breakdown_paise_batch(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR,
+                                           regime=DEFAULT_REGIME, declarations=None):
+    """
+    Vectorized ``calculate_salary_breakdown_paise`` on int64 arrays. Needs NumPy.
+
+    Args:
+        ctc_annual (array_like): Annual CTCs in rupees. Integer arrays are
+            converted exactly, float arrays as ``to_paise`` converts floats.
+        financial_year (str): Financial year whose tax rules to apply (one
+            for the whole batch).
+        regime (str): 'new' (default) or 'old'.
+        declarations (dict): Old Regime declarations in rupees, one value
+            for everybody or one per CTC.
+
+    Returns:
+        dict: Column name -> int64 array in paise with the keys of
+              ``PAISE_COLUMNS`` (plus ``PAISE_DEDUCTION_COLUMNS`` under the
+              Old Regime); identical to the scalar function's figures.
+
+    Raises:
+        ValueError: If a CTC is negative or above ``MAX_CTC``.
+    """
+    import numpy as np
+
+    rules = load_paise_rules(financial_year, regime)
+    ctc = _to_paise_array(np, ctc_annual)
+    if ctc.size and (ctc.min() < 0 or ctc.max() > MAX_CTC * PAISE_PER_RUPEE):
+        raise ValueError(f"CTC must be between 0 and {MAX_CTC:,} rupees")
+
+    basic_da = _apply_rate(ctc, rules.assumed_basic_da_share, ROUNDING['basic_da'])
+    pf = _apply_rate(np.minimum(basic_da, rules.pf_wage_ceiling_annual), rules.pf_rate, ROUNDING['pf'])
+
+    # Under the Old Regime PF is deducted as part of 80C instead.
+    taxable_income = ctc - rules.standard_deduction if rules.pf_in_80c else ctc - pf - rules.standard_deduction
+    if rules.allows_deductions:
+        declarations = {key: (np.asarray(value, dtype=bool) if key == 'metro' else _to_paise_array(np, value))
+                        for key, value in (declarations or {}).items()}
+        zeros = np.zeros_like(ctc)
+        hra_exemption = zeros
+        if rules.hra_exemption:
+            # Rounding is monotonic, so the lesser of the HRA received and the
+            # city limit (both shares of Basic + DA) is one rounding of the
+            # lesser share; the same result as the scalar path's two.
+            share = np.where(declarations.get('metro', False),
+                             min(rules.hra_assumed_share, rules.hra_metro_share),
+                             min(rules.hra_assumed_share, rules.hra_non_metro_share))
+            hra_exemption = np.maximum(0, np.minimum(
+                _apply_rate(basic_da, share, ROUNDING['hra_exemption']),
+                declarations.get('rent_paid', zeros)
+                - _apply_rate(basic_da, rules.hra_rent_excess, ROUNDING['hra_exemption'])))
+        deduction_80c = np.minimum(pf + declarations.get('investments_80c', zeros), rules.deduction_80c_limit)
+        deduction_80d = np.minimum(declarations.get('health_insurance_80d', zeros) + zeros,
+                                   rules.deduction_80d_limit)
+        taxable_income = taxable_income - hra_exemption - deduction_80c - deduction_80d
+    taxable_income = _round(np.maximum(taxable_income, 0), ROUNDING['taxable_income'])
+
+    tax, surcharge, cess = _income_tax_paise_batch(np, taxable_income, rules)
+    total_tax = _round(tax + surcharge + cess, ROUNDING['total_tax'])
+
+    columns = {
+        'ctc': ctc,
+        'pf': pf,
+        'taxable_income': taxable_income,
+        'tax_before_cess': tax,
+        'surcharge': surcharge,
+        'cess': cess,
+        'total_tax': total_tax,
+        'in_hand': ctc - total_tax - pf,
+    }
+    if rules.allows_deductions:
+        columns.update(zip(PAISE_DEDUCTION_COLUMNS, (hra_exemption, deduction_80c, deduction_80d)))
+    return columns
+
+
+def _to_paise_array(np, amounts):
+    amounts = np.asarray(amounts)
+    if amounts.dtype.kind in 'iub':
+        return amounts.astype(np.int64) * PAISE_PER_RUPEE
+    # Truncating after adding half is to_paise's int(); cheaper than np.floor.
+    return (amounts.astype(np.float64) * PAISE_PER_RUPEE + 0.5).astype(np.int64)
+
+
+def _income_tax_paise_batch(np, taxable_income, rules):
+    # One comparison per threshold finds the slab faster than searchsorted
+    # for a handful of slabs.
+    slab = np.zeros(taxable_income.shape, dtype=np.intp)
+    for threshold in rules.thresholds[1:]:
+        slab += taxable_income >= threshold
+    # base_tax + (income - threshold) * rate, all over RATE_SCALE and rounded
+    # once; equal to the scalar slab_tax since base_tax is whole paise.
+    tax = _divide(np.array(rules.slab_intercepts, dtype=np.int64)[slab]
+                  + taxable_income * np.array(rules.rates, dtype=np.int64)[slab], RATE_SCALE)
+
+    below_limit = taxable_income <= rules.rebate_income_limit
+    tax = np.where(below_limit, np.maximum(tax - rules.rebate_max, 0),
+                   np.minimum(tax, taxable_income - rules.rebate_income_limit)
+                   if rules.rebate_marginal_relief else tax)
+
+    surcharge = np.zeros_like(tax)
+    if rules.surcharge_thresholds:
+        # Most payrolls have few incomes above the first threshold; only
+        # those rows are worked out.
+        rows = np.flatnonzero(taxable_income > rules.surcharge_thresholds[0])
+        if len(rows):
+            surcharge_thresholds = np.array(rules.surcharge_thresholds, dtype=np.int64)
+            income, band_tax = taxable_income[rows], tax[rows]
+            band = np.searchsorted(surcharge_thresholds, income, side='left') - 1
+            relieved = (np.array(rules.surcharge_caps, dtype=np.int64)[band]
+                        + (income - surcharge_thresholds[band]) - band_tax)
+            full = _apply_rate(band_tax, np.array(rules.surcharge_rates, dtype=np.int64)[band])
+            surcharge[rows] = _round(np.minimum(full, relieved), ROUNDING['surcharge'])
+
+    cess = _apply_rate(tax + surcharge, rules.cess_rate, ROUNDING['cess'])
+    return tax, surcharge, cess
@@ -0,0 +1,188 @@
+"""
+Inverse solver: the CTC needed for a target monthly in-hand salary.
+
+In-hand salary is a piecewise-linear function of CTC. It bends where the PF
+wage ceiling is reached, where taxable income crosses a slab or surcharge
+threshold, where the Section 87A rebate stops covering the full tax and
+where marginal relief (above the rebate limit and above each surcharge
+threshold) stops applying. Inside a marginal relief zone every extra rupee
+of income is taxed at 100% plus cess, so in-hand salary actually falls as
+CTC rises; without marginal relief there is instead a sharp drop just
+above the rebate limit (the "rebate cliff").
+
+Instead of searching with repeated forward calculations, we compile each
+rule set once into its list of linear segments (start CTC, end CTC, slope,
+intercept). A query then finds the first segment whose in-hand range
+contains the target and inverts that one line.
+
+Because of these dips, some in-hand amounts are reachable from two or more
+different CTCs (one just below a limit and others further above it). The
+solver always returns the lowest CTC that gives the target, i.e. the
+cheapest offer for the employer.
+"""
+
+from bisect import bisect_right
+
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+_compiled_segments = {}
+
+# Slack on the low end of each segment's range, to absorb floating point
+# error in the fitted lines (e.g. an intercept of -1e-11 at CTC 0).
+_TOLERANCE = 1e-6
+
+
+def ctc_for_taxable_income(rules, taxable_income):
+    """Inverts taxable income -> CTC (taxable income is increasing in CTC)."""
+    pf_kink_ctc = rules.pf_wage_ceiling_annual / rules.assumed_basic_da_share
+    pf_max = rules.pf_rate * rules.pf_wage_ceiling_annual
+    taxable_at_kink = pf_kink_ctc - pf_max - rules.standard_deduction
+    if taxable_income <= taxable_at_kink:
+        return (taxable_income + rules.standard_deduction) / (1 - rules.pf_rate * rules.assumed_basic_da_share)
+    return taxable_income + pf_max + rules.standard_deduction
+
+
+def _taxable_income_for_slab_tax(rules, tax):
+    """Inverts the cumulative slab table: the taxable income whose slab tax is ``tax``."""
+    for i in range(len(rules.thresholds) - 1, -1, -1):
+        if rules.base_tax[i] <= tax and rules.rates[i] > 0:
+            return rules.thresholds[i] + (tax - rules.base_tax[i]) / rules.rates[i]
+    return 0
+
+
+def _crossing(rules, start, extra_rate, offset):
+    """
+    First taxable income above ``start`` where the line ``offset + (income -
+    start)`` catches up with ``slab_tax * (1 + extra_rate)``, i.e. where a
+    marginal relief cap stops binding. Returns None if it never does.
+    """
+    candidates = []
+    for i, (threshold, rate, base) in enumerate(zip(rules.thresholds, rules.rates, rules.base_tax)):
+        slope = rate * (1 + extra_rate) - 1
+        if slope == 0:
+            continue
+        # Solve (base + (x - threshold) * rate) * (1 + extra_rate) == offset + x - start,
+        # and keep the solution only if it falls inside this slab.
+        income = (offset - start - (base - threshold * rate) * (1 + extra_rate)) / slope
+        if income > start and bisect_right(rules.thresholds, income) - 1 == i:
+            candidates.append(income)
+    return min(candidates) if candidates else None
+
+
+def taxable_income_breakpoints(rules):
+    """Taxable incomes at which the tax function changes slope or jumps."""
+    points = set(rules.thresholds)
+    points.add(rules.rebate_income_limit)
+    # Inside the rebate zone, tax stays nil until the slab tax exceeds the rebate.
+    nil_tax_limit = _taxable_income_for_slab_tax(rules, rules.rebate_max)
+    if nil_tax_limit < rules.rebate_income_limit:
+        points.add(nil_tax_limit)
+    if rules.rebate_marginal_relief:
+        points.add(_crossing(rules, rules.rebate_income_limit, 0, 0))
+    for threshold, rate, cap in zip(rules.surcharge_thresholds, rules.surcharge_rates,
+                                    rules.surcharge_caps):
+        points.add(threshold)
+        points.add(_crossing(rules, threshold, rate, cap))
+    points.discard(None)
+    return points
+
+
+def ctc_breakpoints(financial_year=DEFAULT_FINANCIAL_YEAR):
+    """Sorted CTCs at which any figure of the breakdown changes slope or jumps."""
+    rules = load_rules(financial_year)
+    breakpoints = {rules.pf_wage_ceiling_annual / rules.assumed_basic_da_share}
+    breakpoints.update(ctc_for_taxable_income(rules, t) for t in taxable_income_breakpoints(rules))
+    return sorted(b for b in breakpoints if b >= 0)
+
+
+def _in_hand(ctc, financial_year):
+    return calculate_salary_breakdown(ctc, financial_year)['annual']['Annual In-Hand Salary']
+
+
+def compile_segments(financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Returns the linear segments of annual in-hand salary as a function of CTC.
+
+    Each segment is a tuple ``(start_ctc, end_ctc, slope, intercept,
+    in_hand_low, in_hand_high)`` covering CTCs in ``(start_ctc, end_ctc]``
+    (the first segment also includes 0); ``end_ctc`` of the last segment is
+    infinity. ``in_hand_low``/``in_hand_high`` are the range of in-hand
+    salary over the segment (the slope is negative in marginal relief
+    zones). Segments are cached per rule-set version.
+    """
+    rules = load_rules(financial_year)
+    segments = _compiled_segments.get(rules.version)
+    if segments is not None:
+        return segments
+
+    breakpoints = [0.0] + [b for b in ctc_breakpoints(financial_year) if b > 0]
+
+    segments = []
+    for start, end in zip(breakpoints, breakpoints[1:] + [float('inf')]):
+        # The function is linear strictly inside the segment, so two interior
+        # points pin down the line even when there is a jump at either end.
+        width = (end - start) if end != float('inf') else 1000000.0
+        p, q = start + 0.25 * width, start + 0.75 * width
+        in_hand_p, in_hand_q = _in_hand(p, financial_year), _in_hand(q, financial_year)
+        slope = (in_hand_q - in_hand_p) / (q - p)
+        intercept = in_hand_p - slope * p
+        in_hand_start = slope * start + intercept
+        in_hand_end = slope * end + intercept if end != float('inf') else float('inf')
+        segments.append((start, end, slope, intercept,
+                         min(in_hand_start, in_hand_end), max(in_hand_start, in_hand_end)))
+
+    segments = tuple(segments)
+    _compiled_segments[rules.version] = segments
+    return segments
+
+
+def solve_ctc_for_in_hand(monthly_in_hand, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Calculates the lowest annual CTC that gives a target monthly in-hand salary.
+
+    Args:
+        monthly_in_hand (float): Target Monthly In-Hand Salary in Indian Rupees.
+        financial_year (str): Financial year whose tax rules to apply.
+
+    Returns:
+        float: The annual CTC in Indian Rupees.
+
+    Raises:
+        ValueError: If the target is negative.
+    """
+    if monthly_in_hand < 0:
+        raise ValueError("Monthly in-hand salary cannot be negative.")
+    target = monthly_in_hand * 12
+    for start, end, slope, intercept, in_hand_low, in_hand_high in compile_segments(financial_year):
+        if in_hand_low - _TOLERANCE <= target <= in_hand_high:
+            return min(max((target - intercept) / slope, start), end)
+    # Unreachable: the last segment is unbounded and the first starts at 0.
+    raise ValueError(f"No CTC gives a monthly in-hand salary of {monthly_in_hand}")
+
+
+def solve_ctc_for_in_hand_batch(monthly_in_hand, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Vectorized ``solve_ctc_for_in_hand`` for many targets at once.
+
+    Needs NumPy. Negative targets give NaN.
+
+    Args:
+        monthly_in_hand (array_like): Target Monthly In-Hand Salaries.
+        financial_year (str): Financial year whose tax rules to apply.
+
+    Returns:
+        numpy.ndarray: Annual CTCs, one per target.
+    """
+    import numpy as np
+
+    target = np.asarray(monthly_in_hand, dtype=np.float64) * 12
+    ctc = np.full_like(target, np.nan)
+    unsolved = target >= 0
+    for start, end, slope, intercept, in_hand_low, in_hand_high in compile_segments(financial_year):
+        mask = unsolved & (target >= in_hand_low - _TOLERANCE) & (target <= in_hand_high)
+        ctc[mask] = np.clip((target[mask] - intercept) / slope, start, end)
+        unsolved &= ~mask
+        if not unsolved.any():
+            break
+    return ctc
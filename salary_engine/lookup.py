@@ -0,0 +1,210 @@
+"""
+Precomputed, memory-mapped CTC -> breakdown lookup index.
+
+For dashboards and the mobile app, every field of
+``calculate_salary_breakdown`` is precomputed on a fixed CTC grid (₹0 to
+₹5 Cr in ₹1,000 steps by default) and written to a binary file of
+fixed-width float64 columns, one file per financial year / regime:
+
+    python -m salary_engine build-index --financial-year 2025-26
+
+The reader ``mmap``s the file and wraps each column in a zero-copy
+``memoryview``, so opening even a multi-megabyte index costs next to
+nothing. A query finds its grid cell by direct indexing and interpolates
+linearly between the two grid points. Every field is linear between the
+engine's breakpoints (PF ceiling, slab and surcharge thresholds, rebate
+limit, ends of the marginal relief zones), so this is exact for every cell
+that does not contain a breakpoint. The few cells that do are recorded in
+the file and answered by the engine instead. CTCs outside the grid also
+fall back to the engine.
+
+File layout:
+    8 bytes   magic b'SALIDX01'
+    4 bytes   header length N (little-endian uint32)
+    N bytes   JSON header (rules version, grid step, row count, fields,
+              byte order, ...)
+    padding   to an 8-byte boundary
+    columns   one float64 array of ``count`` values per field, in order
+    cells     int64 indices of the grid cells that contain a breakpoint
+
+The columns and cells are in the native byte order of the host that built
+the file, so they can be mapped without conversion. The header records it
+('little' or 'big'), and an index from a host of the other byte order is
+rejected on open; rebuild it there.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.inverse import ctc_breakpoints
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+MAGIC = b'SALIDX01'
+DEFAULT_STEP = 1000
+DEFAULT_MAX_CTC = 50000000
+
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indexes')
+
+
+def index_path(financial_year=DEFAULT_FINANCIAL_YEAR, directory=INDEX_DIR):
+    rules = load_rules(financial_year)
+    return os.path.join(directory, f"fy{rules.financial_year}_{rules.regime}.idx")
+
+
+def _breakdown_fields(financial_year):
+    sample = calculate_salary_breakdown(0, financial_year)
+    return [(section, key) for section, values in sample.items() for key in values]
+
+
+def build_index(financial_year=DEFAULT_FINANCIAL_YEAR, path=None, step=DEFAULT_STEP,
+                max_ctc=DEFAULT_MAX_CTC):
+    """
+    Precomputes the breakdown grid for one rule set and writes it to disk.
+
+    Args:
+        financial_year (str): Financial year whose tax rules to apply.
+        path (str): Output file. Defaults to ``index_path(financial_year)``.
+        step (int): Grid spacing in rupees.
+        max_ctc (int): Highest CTC on the grid.
+
+    Returns:
+        str: The path that was written.
+    """
+    import json
+    from array import array
+
+    if step <= 0 or max_ctc <= 0:
+        raise ValueError("step and max_ctc must be positive numbers")
+    rules = load_rules(financial_year)
+    path = path or index_path(financial_year)
+    count = int(max_ctc // step) + 1
+    fields = _breakdown_fields(financial_year)
+
+    columns = [array('d', bytes(8 * count)) for _ in fields]
+    for row in range(count):
+        results = calculate_salary_breakdown(row * step, financial_year)
+        for column, (section, key) in zip(columns, fields):
+            column[row] = results[section][key]
+
+    # Cells (grid[i], grid[i + 1]] that contain a breakpoint, or start at one
+    # (a jump at grid[i] means the stored value there is the left limit).
+    cells = array('q', sorted({int(b // step) for b in ctc_breakpoints(financial_year)
+                               if b < max_ctc}))
+
+    header = json.dumps({
+        'rules_version': rules.version,
+        'financial_year': rules.financial_year,
+        'regime': rules.regime,
+        'step': step,
+        'count': count,
+        'fields': [[section, key] for section, key in fields],
+        'breakpoint_cells': len(cells),
+        'byteorder': sys.byteorder,
+    }).encode('utf-8')
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as handle:
+        handle.write(MAGIC + struct.pack('<I', len(header)) + header)
+        handle.write(b'\0' * (-handle.tell() % 8))
+        for column in columns:
+            handle.write(column.tobytes())
+        handle.write(cells.tobytes())
+    return path
+
+
+class BreakdownIndex:
+    """
+    Read-only view of an index file built by ``build_index``.
+
+    Args:
+        path (str): Index file. Defaults to the file for ``financial_year``.
+        financial_year (str): Used to find the default file and to check that
+            the index was built from the current rules.
+    """
+
+    def __init__(self, path=None, financial_year=DEFAULT_FINANCIAL_YEAR):
+        import json
+
+        self.financial_year = financial_year
+        self.path = path or index_path(financial_year)
+        with open(self.path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        if buffer[:8] != MAGIC:
+            raise ValueError(f"{self.path} is not a salary breakdown index")
+        (header_length,) = struct.unpack_from('<I', buffer, 8)
+        header = json.loads(bytes(buffer[12:12 + header_length]))
+        if header['rules_version'] != load_rules(financial_year).version:
+            raise ValueError(f"{self.path} was built for tax rules {header['rules_version']}; "
+                             f"rebuild it with 'python -m salary_engine build-index'")
+        # Files written before the byte order was recorded came from little-endian hosts.
+        if header.get('byteorder', 'little') != sys.byteorder:
+            raise ValueError(f"{self.path} was built on a {header.get('byteorder', 'little')}-endian "
+                             f"host; rebuild it with 'python -m salary_engine build-index'")
+
+        self.step = header['step']
+        self.count = header['count']
+        self.max_ctc = (self.count - 1) * self.step
+        self.fields = [tuple(field) for field in header['fields']]
+
+        offset = 12 + header_length
+        offset += -offset % 8
+        size = 8 * self.count
+        # memoryview.cast gives typed, zero-copy access to the mapped pages.
+        self.columns = {}
+        for field in self.fields:
+            self.columns[field] = buffer[offset:offset + size].cast('d')
+            offset += size
+        self._breakpoint_cells = frozenset(
+            buffer[offset:offset + 8 * header['breakpoint_cells']].cast('q').tolist())
+
+    def close(self):
+        self.columns.clear()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _cell(self, ctc_annual):
+        """Returns (row, fraction) for an in-grid CTC, or None to use the engine."""
+        if not 0 <= ctc_annual <= self.max_ctc:
+            return None
+        position = ctc_annual / self.step
+        row = int(position)
+        if row == self.count - 1:
+            return row, 0.0
+        if position != row and row in self._breakpoint_cells:
+            return None
+        return row, position - row
+
+    def value(self, ctc_annual, section, key):
+        """Returns one field, e.g. ``value(1500000, 'monthly', 'Monthly In-Hand Salary')``."""
+        cell = self._cell(ctc_annual)
+        if cell is None:
+            return calculate_salary_breakdown(ctc_annual, self.financial_year)[section][key]
+        row, fraction = cell
+        column = self.columns[(section, key)]
+        if not fraction:
+            return column[row]
+        low = column[row]
+        return low + (column[row + 1] - low) * fraction
+
+    def get(self, ctc_annual):
+        """Returns the full breakdown, in the same shape as ``calculate_salary_breakdown``."""
+        cell = self._cell(ctc_annual)
+        if cell is None:
+            return calculate_salary_breakdown(ctc_annual, self.financial_year)
+        row, fraction = cell
+        results = {}
+        for (section, key), column in self.columns.items():
+            low = column[row]
+            value = low + (column[row + 1] - low) * fraction if fraction else low
+            results.setdefault(section, {})[key] = value
+        return results
@@ -0,0 +1,69 @@
+"""
+Multi-core batch runner.
+
+Splits a payroll into chunks, runs each chunk through
+``calculate_salary_breakdown_batch`` in a ``ProcessPoolExecutor`` and joins
+the results back together in input order. Each chunk is computed with
+exactly the same code as the serial batch path, so the output is
+bit-identical to a single ``calculate_salary_breakdown_batch`` call.
+
+NumPy is required for this module (``pip install numpy``).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from salary_engine.batch import BATCH_COLUMNS, calculate_salary_breakdown_batch
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR
+
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def _run_chunk(args):
+    ctc, financial_year = args
+    return calculate_salary_breakdown_batch(ctc, financial_year)
+
+
+def calculate_salary_breakdown_parallel(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR,
+                                        workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calculates the annual salary breakdown for many CTCs on several cores.
+
+    Args:
+        ctc_annual (array_like): Annual CTCs in Indian Rupees.
+        financial_year (str or array_like): One financial year for the whole
+            batch or one per CTC, as in ``calculate_salary_breakdown_batch``.
+        workers (int): Number of worker processes. Defaults to the number of
+            CPUs. With 1 worker everything runs in the calling process.
+        chunk_size (int): Number of CTCs sent to a worker at a time.
+
+    Returns:
+        dict: Column name -> float64 array, in the same order as the input,
+              with the keys listed in ``BATCH_COLUMNS``.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive number")
+    workers = workers or os.cpu_count() or 1
+    ctc = np.asarray(ctc_annual, dtype=np.float64)
+    per_row_years = not isinstance(financial_year, str)
+    if per_row_years:
+        financial_year = np.asarray(financial_year)
+
+    chunks = []
+    for start in range(0, len(ctc), chunk_size):
+        years = financial_year[start:start + chunk_size] if per_row_years else financial_year
+        chunks.append((ctc[start:start + chunk_size], years))
+
+    if workers == 1 or len(chunks) <= 1:
+        parts = [_run_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            # map() yields results in submission order, which keeps the
+            # output aligned with the input.
+            parts = list(executor.map(_run_chunk, chunks))
+
+    if not parts:
+        return calculate_salary_breakdown_batch(ctc, DEFAULT_FINANCIAL_YEAR)
+    return {name: np.concatenate([part[name] for part in parts]) for name in BATCH_COLUMNS}
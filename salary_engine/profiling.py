@@ -0,0 +1,125 @@
+"""
+Optional cProfile hook for engine entry points.
+
+Any engine function can be profiled without editing it: name it by its
+dotted path (``salary_engine.`` may be left out) and every call made while
+the hook is on runs under cProfile.
+
+    from salary_engine.profiling import profile_entry_points
+
+    with profile_entry_points(['batch.calculate_salary_breakdown_batch'], output_dir='profiles'):
+        process_payroll('employees.csv', 'results.csv')
+
+writes ``profiles/batch.calculate_salary_breakdown_batch.prof`` (open it
+with ``python -m pstats`` or snakeviz). For the command line, set
+``SALARY_ENGINE_PROFILE`` to a comma-separated list of entry points
+(and optionally ``SALARY_ENGINE_PROFILE_DIR``) and
+``python -m salary_engine`` profiles them for the duration of the command.
+
+When the hook is off nothing is patched, so it costs nothing.
+"""
+
+import cProfile
+import importlib
+import os
+import sys
+from contextlib import contextmanager
+
+PROFILE_ENV = 'SALARY_ENGINE_PROFILE'
+PROFILE_DIR_ENV = 'SALARY_ENGINE_PROFILE_DIR'
+
+PACKAGE = 'salary_engine'
+
+
+def resolve_entry_point(name):
+    """Returns (module, attribute name, function) for a dotted entry point name."""
+    full_name = name if name.split('.')[0] == PACKAGE else f"{PACKAGE}.{name}"
+    module_name, _, attribute = full_name.rpartition('.')
+    try:
+        module = importlib.import_module(module_name)
+        function = getattr(module, attribute)
+    except (ImportError, AttributeError):
+        raise ValueError(f"Unknown entry point: {name}")
+    if not callable(function):
+        raise ValueError(f"Not a function: {name}")
+    return module, attribute, function
+
+
+def _profiled(function, profile):
+    active = []
+
+    def wrapper(*args, **kwargs):
+        # A profiler cannot be enabled twice, so recursive or nested calls
+        # of the same entry point are profiled as part of the outer call.
+        if active:
+            return function(*args, **kwargs)
+        active.append(True)
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            active.pop()
+
+    wrapper.__wrapped__ = function
+    wrapper.__name__ = getattr(function, '__name__', 'wrapper')
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+@contextmanager
+def profile_entry_points(names, output_dir=None):
+    """
+    Profiles every call of the named entry points inside the ``with`` block.
+
+    The function is replaced in its own module and in every loaded module
+    that imported it by name (``from salary_engine.core import ...``), and
+    restored on exit.
+
+    Args:
+        names (iterable of str): Dotted entry point names, e.g.
+            'core.calculate_salary_breakdown'.
+        output_dir (str): If given, each entry point's stats are written to
+            ``<output_dir>/<name>.prof`` on exit.
+
+    Yields:
+        dict: Entry point name -> its ``cProfile.Profile``.
+
+    Raises:
+        ValueError: If a name does not resolve to a function.
+    """
+    profiles = {}
+    patches = []
+    try:
+        for name in names:
+            function = resolve_entry_point(name)[2]
+            profile = profiles[name] = cProfile.Profile()
+            wrapper = _profiled(function, profile)
+            for loaded in list(sys.modules.values()):
+                namespace = getattr(loaded, '__dict__', None)
+                if namespace is None:
+                    continue
+                for key, value in list(namespace.items()):
+                    if value is function:
+                        patches.append((namespace, key, function))
+                        namespace[key] = wrapper
+        yield profiles
+    finally:
+        for namespace, key, function in reversed(patches):
+            namespace[key] = function
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            for name, profile in profiles.items():
+                profile.dump_stats(os.path.join(output_dir, f"{name}.prof"))
+
+
+def profile_from_environment():
+    """
+    ``profile_entry_points`` for the entry points named in ``SALARY_ENGINE_PROFILE``, if any.
+
+    Raises:
+        ValueError: If a name does not resolve to a function (checked now,
+            not when the ``with`` block is entered).
+    """
+    names = [name.strip() for name in os.environ.get(PROFILE_ENV, '').split(',') if name.strip()]
+    for name in names:
+        resolve_entry_point(name)
+    return profile_entry_points(names, os.environ.get(PROFILE_DIR_ENV, '.') if names else None)
@@ -0,0 +1,284 @@
+"""
+Month-by-month payroll projection with TDS recomputed every month.
+
+The breakdown functions spread the annual tax evenly (monthly tax = annual
+tax / 12), which is only right when the salary is the same all year. A real
+payroll recomputes TDS each month from the year's actuals: salary and
+bonuses paid so far, plus the current salary projected over the remaining
+months. The tax still due is then spread over the months left, so a raise
+in October raises the TDS from October on, and a bonus is taxed from the
+month it is paid.
+
+Salary changes arrive as events: ``('ctc', month, annual_ctc)`` sets the
+annual CTC from that month until the employee's next CTC event, whichever
+file that came in (joining partway through the year is a CTC event in the
+joining month, leaving is a CTC of 0) and ``('bonus', month, amount)`` pays
+a one-off amount in that month. Months are numbered 0 (April) to 11 (March)
+of the financial year.
+
+``PayrollProjection`` keeps the whole company's schedule in (12 x employees)
+arrays together with the running totals (paid, PF and TDS) through every
+month. An event in month ``m`` cannot change anything before ``m``, so only
+the months from ``m`` on are recomputed for the employees it touches,
+starting from the running totals already cached for month ``m - 1``. All
+employees touched by a file of events are recomputed together, one
+vectorized step per month.
+
+Event files (CSV with ``employee_id``, ``month``, ``kind`` and ``amount``
+columns) are read by ``read_events_csv``; ``python -m salary_engine project``
+applies one or more of them in turn and writes the month-wise schedule.
+
+NumPy is required for this module (``pip install numpy``).
+"""
+
+import csv
+
+import numpy as np
+
+from salary_engine.batch import _income_tax, _pf
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+MONTHS = ('Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb', 'Mar')
+
+EVENT_KINDS = ('ctc', 'bonus')
+
+# Month-wise columns returned by PayrollProjection.columns() and schedule().
+SCHEDULE_COLUMNS = ('ctc', 'salary', 'bonus', 'employee_pf', 'projected_tax', 'tds', 'in_hand')
+
+# Marks an employee whose schedule is up to date.
+_CLEAN = len(MONTHS)
+
+
+class PayrollProjection:
+    """
+    Month-wise salary, PF, TDS and in-hand schedule for a set of employees.
+
+    Employees are added by their first event. Each month's TDS is the
+    projected annual tax, less the TDS already deducted, divided by the
+    months left including the current one; it is never negative, so an
+    over-deduction (after a pay cut, say) is not refunded by payroll. The
+    projected annual tax is computed as in the batch engine: the year's pay
+    so far plus the current monthly salary for the remaining months, less
+    employee PF and the standard deduction. Bonuses carry no PF.
+
+    Args:
+        financial_year (str): Financial year whose tax rules to apply.
+        regime (str): Tax regime, 'new' or 'old'. Old Regime declarations
+            are not taken into account.
+    """
+
+    def __init__(self, financial_year=DEFAULT_FINANCIAL_YEAR, regime='new'):
+        self.rules = load_rules(financial_year, regime)
+        self.employee_ids = []
+        self._rows = {}
+        self._allocate(0)
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def _allocate(self, capacity):
+        # Month-major, so that one month of every employee is contiguous.
+        shape = (len(MONTHS), capacity)
+        self._arrays = {name: np.zeros(shape) for name in
+                        SCHEDULE_COLUMNS + ('paid_to_date', 'pf_to_date', 'tds_to_date')}
+        self._dirty_from = np.full(capacity, _CLEAN)
+        # Months in which each employee's CTC was set by an event.
+        self._ctc_set = np.zeros(shape, dtype=bool)
+
+    def _grow(self, count):
+        capacity = len(self._dirty_from)
+        if count <= capacity:
+            return
+        arrays, dirty_from, ctc_set = self._arrays, self._dirty_from, self._ctc_set
+        self._allocate(max(count, 2 * capacity, 1024))
+        for name, values in arrays.items():
+            self._arrays[name][:, :capacity] = values
+        self._dirty_from[:capacity] = dirty_from
+        self._ctc_set[:, :capacity] = ctc_set
+
+    def _row_numbers(self, employee_ids):
+        rows = np.empty(len(employee_ids), dtype=np.intp)
+        for i, employee_id in enumerate(employee_ids):
+            row = self._rows.get(employee_id)
+            if row is None:
+                row = self._rows[employee_id] = len(self.employee_ids)
+                self.employee_ids.append(employee_id)
+            rows[i] = row
+        self._grow(len(self.employee_ids))
+        return rows
+
+    def apply_events(self, employee_ids, kinds, months, amounts):
+        """
+        Applies a batch of salary events, e.g. an appraisal-cycle file.
+
+        Events for the same employee and month are applied in order, so a
+        later CTC event replaces an earlier one and bonuses add up.
+        Schedules are brought up to date lazily, on the next read.
+
+        Args:
+            employee_ids (sequence): Employee ID of every event.
+            kinds (sequence of str): 'ctc' or 'bonus' for every event.
+            months (array_like of int): Month of every event, 0 (April) to 11.
+            amounts (array_like of float): Annual CTC or bonus amount.
+
+        Raises:
+            ValueError: If the arguments differ in length, or an event has
+                an unknown kind, a month outside 0-11 or a negative amount.
+        """
+        kinds = np.asarray(kinds)
+        months = np.asarray(months, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if not len(employee_ids) == len(kinds) == len(months) == len(amounts):
+            raise ValueError("employee_ids, kinds, months and amounts must have the same length")
+        unknown = set(np.unique(kinds).tolist()) - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown event kind(s): {', '.join(sorted(unknown))}")
+        if len(months) and (months.min() < 0 or months.max() >= len(MONTHS)):
+            raise ValueError("Event months must be between 0 (April) and 11 (March)")
+        if np.any(amounts < 0):
+            raise ValueError("Event amounts cannot be negative")
+
+        rows = self._row_numbers(employee_ids)
+        is_bonus = kinds == 'bonus'
+        np.add.at(self._arrays['bonus'], (months[is_bonus], rows[is_bonus]), amounts[is_bonus])
+        self._set_ctc(rows[~is_bonus], months[~is_bonus], amounts[~is_bonus])
+        np.minimum.at(self._dirty_from, rows, months)
+
+    def _set_ctc(self, rows, months, amounts):
+        if not len(rows):
+            return
+        # Each CTC event holds from its month until the employee's next CTC
+        # event, whichever batch that came in, so write the events over the
+        # touched employees' (employees x 12) CTCs, where the months set by
+        # earlier events still hold those events' amounts, and carry every
+        # set month forward with a running maximum over month numbers.
+        touched, local = np.unique(rows, return_inverse=True)
+        ctc = self._arrays['ctc']
+        changes = ctc[:, touched].T
+        changed = self._ctc_set[:, touched].T
+        order = np.lexsort((np.arange(len(rows)), months, local))
+        # With the events sorted, the last write to a cell is the latest event.
+        changes[local[order], months[order]] = amounts[order]
+        changed[local[order], months[order]] = True
+        latest = np.maximum.accumulate(np.where(changed, np.arange(len(MONTHS)), -1), axis=1)
+        ctc[:, touched] = np.where(latest >= 0,
+                                   np.take_along_axis(changes, np.maximum(latest, 0), axis=1),
+                                   changes).T
+        self._ctc_set[:, touched] = changed.T
+
+    def update(self):
+        """Recomputes every out-of-date schedule from its first changed month; returns the rows touched."""
+        dirty = np.flatnonzero(self._dirty_from < _CLEAN)
+        if not len(dirty):
+            return 0
+        dirty = dirty[np.argsort(self._dirty_from[dirty], kind='stable')]
+        starts = np.searchsorted(self._dirty_from[dirty], np.arange(len(MONTHS)), side='right')
+        for month in range(self._dirty_from[dirty[0]], len(MONTHS)):
+            # Employees whose first changed month is this one or earlier; a
+            # slice when that is everybody, which saves the gathers.
+            rows = dirty[:starts[month]]
+            self._project_month(slice(0, len(rows)) if len(rows) == len(self.employee_ids) else rows, month)
+        self._dirty_from[dirty] = _CLEAN
+        return len(dirty)
+
+    def _project_month(self, rows, month):
+        a = {name: values[month] for name, values in self._arrays.items()}
+        rules = self.rules
+        ctc = a['ctc'][rows]
+        bonus = a['bonus'][rows]
+        salary = ctc / 12
+        pf = _pf(ctc, rules)[1] / 12
+        if month:
+            paid_before = self._arrays['paid_to_date'][month - 1][rows]
+            pf_before = self._arrays['pf_to_date'][month - 1][rows]
+            tds_before = self._arrays['tds_to_date'][month - 1][rows]
+        else:
+            paid_before = pf_before = tds_before = np.zeros_like(ctc)
+
+        paid_to_date = paid_before + salary + bonus
+        pf_to_date = pf_before + pf
+        remaining = len(MONTHS) - 1 - month
+        taxable_income = np.maximum(paid_to_date + remaining * salary
+                                    - (pf_to_date + remaining * pf) - rules.standard_deduction, 0.0)
+        tax, surcharge, cess = _income_tax(taxable_income, rules)
+        projected_tax = tax + surcharge + cess
+        tds = np.maximum(projected_tax - tds_before, 0.0) / (remaining + 1)
+
+        a['salary'][rows] = salary
+        a['employee_pf'][rows] = pf
+        a['projected_tax'][rows] = projected_tax
+        a['tds'][rows] = tds
+        a['in_hand'][rows] = salary + bonus - pf - tds
+        a['paid_to_date'][rows] = paid_to_date
+        a['pf_to_date'][rows] = pf_to_date
+        a['tds_to_date'][rows] = tds_before + tds
+
+    def columns(self):
+        """Returns ``SCHEDULE_COLUMNS`` -> (employees x 12) array, in ``employee_ids`` order."""
+        self.update()
+        count = len(self.employee_ids)
+        return {name: self._arrays[name][:, :count].T for name in SCHEDULE_COLUMNS}
+
+    def schedule(self, employee_id):
+        """
+        Returns one employee's month-wise schedule.
+
+        Raises:
+            KeyError: If the employee has had no events.
+
+        Returns:
+            dict: 'month' -> ``MONTHS``, then each of ``SCHEDULE_COLUMNS`` ->
+                  a list of 12 amounts.
+        """
+        row = self._rows[employee_id]
+        self.update()
+        return {'month': list(MONTHS),
+                **{name: self._arrays[name][:, row].tolist() for name in SCHEDULE_COLUMNS}}
+
+
+def month_number(value):
+    """Returns the month number (0 = April) for a number or a month name such as 'Oct'."""
+    text = str(value).strip()
+    if text[:3].title() in MONTHS:
+        return MONTHS.index(text[:3].title())
+    month = int(text)
+    if not 0 <= month < len(MONTHS):
+        raise ValueError(f"Month {text!r} is not between 0 (April) and 11 (March)")
+    return month
+
+
+def read_events_csv(path):
+    """Reads an event file; returns (employee_ids, kinds, months, amounts) for ``apply_events``."""
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.DictReader(handle)
+        missing = {'employee_id', 'month', 'kind', 'amount'} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{path}: missing column(s): {', '.join(sorted(missing))}")
+
+        ids, kinds, months, amounts = [], [], [], []
+        for row in reader:
+            if None in (row['month'], row['kind'], row['amount']):
+                # DictReader fills the columns missing from a short row with None.
+                raise ValueError(f"{path}:{reader.line_num}: row has too few columns")
+            try:
+                months.append(month_number(row['month']))
+                amounts.append(float(row['amount']))
+            except ValueError:
+                raise ValueError(f"{path}:{reader.line_num}: invalid month or amount "
+                                 f"{row['month']!r}, {row['amount']!r}")
+            ids.append(row['employee_id'])
+            kinds.append(row['kind'].strip().lower())
+    return ids, kinds, months, amounts
+
+
+def write_schedule_csv(projection, path):
+    """Writes every employee's schedule to a CSV file, one row per employee and month."""
+    columns = projection.columns()
+    values = [columns[name].ravel().tolist() for name in SCHEDULE_COLUMNS]
+    employee_ids = [employee_id for employee_id in projection.employee_ids for _ in MONTHS]
+    months = list(MONTHS) * len(projection)
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(('employee_id', 'month') + SCHEDULE_COLUMNS)
+        writer.writerows((employee_id, month, *(f"{value:.2f}" for value in row))
+                         for employee_id, month, *row in zip(employee_ids, months, *values))
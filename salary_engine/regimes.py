@@ -0,0 +1,287 @@
+"""
+Old vs New Regime comparison.
+
+The New Regime has lower slab rates and a higher standard deduction; the
+Old Regime allows the HRA exemption and the 80C and 80D deductions. Which
+one is cheaper depends on how much an employee can deduct, so besides
+computing both and recommending the cheaper one, the comparison reports
+the break-even deductions: the total of HRA exemption, 80C and 80D at
+which both regimes cost the same. Deductions above it make the Old Regime
+the better choice.
+
+The break-even amount is computed analytically, not by trial runs. Total
+tax (slab tax after rebate, surcharge and cess) is a non-decreasing,
+piecewise-linear function of taxable income, so each regime's tax function
+is compiled once into its linear segments (as the inverse solver does for
+in-hand salary). The Old Regime taxable income at which its tax equals the
+New Regime tax is then found by inverting a single segment.
+
+``compare_regimes`` handles one employee; ``compare_regimes_batch`` (needs
+NumPy) a whole payroll, sharing the regime-independent PF step and
+computing both regimes' taxes and the break-even amounts in one pass.
+"""
+
+from bisect import bisect_right
+
+from salary_engine.core import calculate_salary_breakdown, income_tax
+from salary_engine.inverse import taxable_income_breakpoints
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+REGIMES = ('new', 'old')
+
+# Columns returned by compare_regimes_batch, in output order.
+COMPARISON_COLUMNS = (
+    'ctc',
+    'new_total_tax',
+    'old_total_tax',
+    'new_in_hand',
+    'old_in_hand',
+    'old_deductions',
+    'break_even_deductions',
+    'annual_saving',
+    'recommend_old',
+)
+
+_compiled_tax_segments = {}
+_compiled_break_even_segments = {}
+
+# Slack when locating a tax amount among the segments, to absorb floating
+# point error in the fitted lines.
+_TOLERANCE = 1e-6
+
+
+def compile_tax_segments(financial_year=DEFAULT_FINANCIAL_YEAR, regime='old'):
+    """
+    Returns total tax as a piecewise-linear function of taxable income.
+
+    Each segment is a tuple ``(start, end, slope, intercept, tax_at_start)``
+    covering taxable incomes in ``(start, end]`` (the first one also
+    includes 0); ``tax_at_start`` is the limit of the tax just above
+    ``start``. The function never decreases, so ``tax_at_start`` is sorted.
+    Segments are cached per rule-set version.
+    """
+    rules = load_rules(financial_year, regime)
+    segments = _compiled_tax_segments.get(rules.version)
+    if segments is not None:
+        return segments
+
+    def total_tax(taxable_income):
+        return sum(income_tax(taxable_income, rules))
+
+    breakpoints = [0.0] + sorted(b for b in taxable_income_breakpoints(rules) if b > 0)
+    segments = []
+    for start, end in zip(breakpoints, breakpoints[1:] + [float('inf')]):
+        # Two interior points pin down the line even with a jump at either end.
+        width = (end - start) if end != float('inf') else 1000000.0
+        p, q = start + 0.25 * width, start + 0.75 * width
+        tax_p, tax_q = total_tax(p), total_tax(q)
+        slope = (tax_q - tax_p) / (q - p)
+        intercept = tax_p - slope * p
+        segments.append((start, end, slope, intercept, slope * start + intercept))
+
+    segments = tuple(segments)
+    _compiled_tax_segments[rules.version] = segments
+    return segments
+
+
+def max_taxable_income_for_tax(total_tax, financial_year=DEFAULT_FINANCIAL_YEAR, regime='old'):
+    """Returns the highest taxable income whose total tax does not exceed ``total_tax``."""
+    segments = compile_tax_segments(financial_year, regime)
+    k = bisect_right([segment[4] for segment in segments], total_tax + _TOLERANCE) - 1
+    start, end, slope, intercept, _ = segments[max(k, 0)]
+    if slope <= 0:
+        return end
+    return min(max((total_tax - intercept) / slope, start), end)
+
+
+def compile_break_even_segments(financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Returns the New Regime tax and the break-even Old Regime taxable income,
+    both as piecewise-linear functions of New Regime taxable income.
+
+    The break-even taxable income is ``max_taxable_income_for_tax`` of the
+    New Regime tax. Both depend on the New Regime taxable income alone, so
+    one table answers both and the batch comparison needs a single lookup
+    for them. Each segment is a tuple ``(start, end, tax_slope,
+    tax_intercept, old_slope, old_intercept)`` covering ``(start, end]``.
+    Segments are cached per pair of rule-set versions.
+    """
+    new_rules = load_rules(financial_year, 'new')
+    old_rules = load_rules(financial_year, 'old')
+    key = (new_rules.version, old_rules.version)
+    segments = _compiled_break_even_segments.get(key)
+    if segments is not None:
+        return segments
+
+    new_segments = compile_tax_segments(financial_year, 'new')
+    old_segments = compile_tax_segments(financial_year, 'old')
+
+    # The break-even function changes slope or jumps where the New Regime tax
+    # reaches the start or end of an Old Regime segment (less the tolerance
+    # max_taxable_income_for_tax adds).
+    old_taxes = {tax for start, end, slope, intercept, tax_at_start in old_segments
+                 for tax in (tax_at_start, slope * end + intercept) if tax != float('inf')}
+    breakpoints = {start for start, *_ in new_segments}
+    for start, end, slope, intercept, _ in new_segments:
+        if slope > 0:
+            breakpoints.update(income for income in ((tax - _TOLERANCE - intercept) / slope for tax in old_taxes)
+                               if start < income < end)
+
+    def functions(taxable_income):
+        tax = sum(income_tax(taxable_income, new_rules))
+        return tax, max_taxable_income_for_tax(tax, financial_year, 'old')
+
+    breakpoints = sorted(b for b in breakpoints if b >= 0)
+    segments = []
+    for start, end in zip(breakpoints, breakpoints[1:] + [float('inf')]):
+        # The break-even line goes through two fitted lines, so the open-ended
+        # last segment is fitted over a wide span to keep its slope accurate.
+        width = (end - start) if end != float('inf') else 1e9
+        p, q = start + 0.25 * width, start + 0.75 * width
+        (tax_p, old_p), (tax_q, old_q) = functions(p), functions(q)
+        tax_slope, old_slope = (tax_q - tax_p) / (q - p), (old_q - old_p) / (q - p)
+        segments.append((start, end, tax_slope, tax_p - tax_slope * p, old_slope, old_p - old_slope * p))
+
+    segments = tuple(segments)
+    _compiled_break_even_segments[key] = segments
+    return segments
+
+
+def compare_regimes(ctc_annual, declarations=None, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Calculates a CTC under both regimes and recommends the cheaper one.
+
+    Args:
+        ctc_annual (float): The annual CTC in Indian Rupees.
+        declarations (dict): Declared 80C investments, 80D premiums and rent
+            for the Old Regime, see ``salary_engine.core.DECLARATION_FIELDS``.
+        financial_year (str): Financial year whose tax rules to apply.
+
+    Returns:
+        dict: 'new' and 'old' breakdowns (as ``calculate_salary_breakdown``),
+              'recommended' regime, 'annual_saving' with it, the 'old_deductions'
+              declared (HRA exemption + 80C + 80D) and the
+              'break_even_deductions' at which both regimes cost the same.
+    """
+    new = calculate_salary_breakdown(ctc_annual, financial_year, 'new')
+    old = calculate_salary_breakdown(ctc_annual, financial_year, 'old', declarations)
+    new_tax = new['annual']['Total Annual Income Tax']
+    old_tax = old['annual']['Total Annual Income Tax']
+    old_deductions = (old['annual']['Annual HRA Exemption'] + old['annual']['Annual 80C Deduction']
+                      + old['annual']['Annual 80D Deduction'])
+
+    # Old Regime taxable income before any HRA exemption, 80C or 80D (PF is
+    # part of 80C there); the break-even deductions bring it down to where
+    # both taxes are equal.
+    old_rules = load_rules(financial_year, 'old')
+    taxable_without_deductions = max(_before_deductions(ctc_annual, old['annual']['Annual Employee PF Deduction'],
+                                                        old_rules), 0)
+    break_even = max(taxable_without_deductions
+                     - max_taxable_income_for_tax(new_tax, financial_year, 'old'), 0)
+
+    return {
+        'new': new,
+        'old': old,
+        'recommended': 'old' if old_tax < new_tax else 'new',
+        'annual_saving': abs(new_tax - old_tax),
+        'old_deductions': old_deductions,
+        'break_even_deductions': break_even,
+    }
+
+
+def compare_regimes_batch(ctc_annual, declarations=None, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Vectorized ``compare_regimes`` for a whole payroll. Needs NumPy.
+
+    PF, which does not depend on the regime, is computed once. Taxes are
+    read off compiled piecewise-linear functions (one ``searchsorted`` and a
+    multiply-add per row) instead of going through the slab, rebate,
+    surcharge and cess steps: one lookup on the New Regime taxable income
+    gives both its tax and the break-even amount (see
+    ``compile_break_even_segments``), and one on the Old Regime taxable
+    income gives the Old Regime tax. With the Old Regime deductions, the
+    comparison costs about 1.3 engine passes (bench_regimes.py), against
+    two for running the engine once per regime.
+
+    Args:
+        ctc_annual (array_like): Annual CTCs in Indian Rupees.
+        declarations (dict): ``DECLARATION_FIELDS`` -> one value for
+            everybody or an array with one value per CTC.
+        financial_year (str): Financial year whose tax rules to apply.
+
+    Returns:
+        dict: Column name -> array with the keys of ``COMPARISON_COLUMNS``;
+              ``recommend_old`` is boolean. Taxes and in-hand figures match
+              the scalar engine to within a micro-rupee (the compiled
+              segments are fitted lines, like the lookup index).
+    """
+    import numpy as np
+
+    from salary_engine.batch import _declaration_arrays, _pf, _regime_deductions
+
+    new_rules = load_rules(financial_year, 'new')
+    old_rules = load_rules(financial_year, 'old')
+    ctc = np.asarray(ctc_annual, dtype=np.float64)
+    declarations = _declaration_arrays(declarations, ctc.shape)
+
+    assumed_basic_da, pf = _pf(ctc, new_rules)
+    if (old_rules.pf_rate, old_rules.pf_wage_ceiling_annual, old_rules.assumed_basic_da_share) != \
+            (new_rules.pf_rate, new_rules.pf_wage_ceiling_annual, new_rules.assumed_basic_da_share):
+        assumed_basic_da, pf = _pf(ctc, old_rules)
+    hra_exemption, deduction_80c, deduction_80d = _regime_deductions(
+        old_rules, assumed_basic_da, pf, declarations)
+    old_deductions = hra_exemption + deduction_80c + deduction_80d
+
+    new_taxable = np.maximum(_before_deductions(ctc, pf, new_rules), 0.0)
+    old_before_deductions = _before_deductions(ctc, pf, old_rules)
+    old_taxable_without_deductions = np.maximum(old_before_deductions, 0.0)
+    old_taxable = np.maximum(old_before_deductions - old_deductions, 0.0)
+
+    starts, _, tax_slopes, tax_intercepts, old_slopes, old_intercepts = _segment_arrays(
+        np, financial_year, 'break_even')
+    k = _segment_index(np, starts, new_taxable)
+    new_tax = tax_intercepts[k] + tax_slopes[k] * new_taxable
+    max_old_taxable = old_intercepts[k] + old_slopes[k] * new_taxable
+    old_tax = _evaluate_segments(np, _segment_arrays(np, financial_year, 'old'), old_taxable)
+
+    return {
+        'ctc': ctc,
+        'new_total_tax': new_tax,
+        'old_total_tax': old_tax,
+        'new_in_hand': ctc - new_tax - pf,
+        'old_in_hand': ctc - old_tax - pf,
+        'old_deductions': old_deductions,
+        'break_even_deductions': np.maximum(old_taxable_without_deductions - max_old_taxable, 0.0),
+        'annual_saving': np.abs(new_tax - old_tax),
+        # The slack keeps ties (both taxes 0, say) on the New Regime, as in compare_regimes.
+        'recommend_old': old_tax < new_tax - _TOLERANCE,
+    }
+
+
+def _before_deductions(ctc, pf, rules):
+    """Taxable income before the HRA exemption, 80C and 80D, as the engine computes it."""
+    return ctc - rules.standard_deduction if rules.pf_in_80c else ctc - pf - rules.standard_deduction
+
+
+def _segment_arrays(np, financial_year, regime):
+    """
+    ``compile_tax_segments`` (or, for regime 'break_even',
+    ``compile_break_even_segments``) as one array per tuple field.
+    """
+    if regime == 'break_even':
+        segments = compile_break_even_segments(financial_year)
+    else:
+        segments = compile_tax_segments(financial_year, regime)
+    return tuple(np.array(column) for column in zip(*segments))
+
+
+def _segment_index(np, starts, taxable_income):
+    # Segments cover (start, end], so an income equal to a breakpoint belongs
+    # to the segment on its left.
+    return np.maximum(np.searchsorted(starts, taxable_income, side='left') - 1, 0)
+
+
+def _evaluate_segments(np, segments, taxable_income):
+    starts, _, slopes, intercepts, _ = segments
+    k = _segment_index(np, starts, taxable_income)
+    return intercepts[k] + slopes[k] * taxable_income
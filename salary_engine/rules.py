@@ -0,0 +1,198 @@
+"""
+Versioned tax-rule tables.
+
+Every figure the engine needs for one financial year and regime (slabs,
+standard deduction, PF wage ceiling, 87A rebate, cess and, for the old
+regime, the 80C/80D limits and HRA exemption rules) lives in a JSON file
+under ``salary_engine/rules/`` named ``fy<YEAR>_<regime>.json``. Adding a new
+year is a matter of dropping in a new file; no code changes are needed.
+
+When a rule file is loaded, its slabs are compiled into a cumulative-tax
+table: for every slab we precompute the total tax on all income below the
+slab's lower threshold. Tax on any income is then one ``bisect`` to find the
+slab plus one multiply-add, instead of a cascade of ``if`` blocks.
+
+Surcharge bands are compiled the same way: for each band we precompute the
+tax plus surcharge payable exactly at its threshold, which is all marginal
+relief needs.
+
+Loaded rule sets are cached in memory keyed by (financial year, regime), so
+each file is parsed at most once per process.
+"""
+
+import os
+from bisect import bisect_left, bisect_right
+
+DEFAULT_FINANCIAL_YEAR = '2025-26'
+DEFAULT_REGIME = 'new'
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+
+_loaded_rules = {}
+
+
+class TaxRules:
+    """
+    One compiled rule set (financial year + regime).
+
+    Attributes:
+        financial_year (str): e.g. '2025-26'.
+        regime (str): e.g. 'new'.
+        version (str): Version string from the rule file. Changes whenever
+            the figures in the file change.
+        standard_deduction (float): Annual standard deduction.
+        pf_rate (float): Employee PF rate on Basic + DA.
+        pf_wage_ceiling_annual (float): Annual statutory ceiling on Basic + DA
+            for PF.
+        assumed_basic_da_share (float): Share of CTC assumed to be Basic + DA.
+        rebate_income_limit (float): Section 87A applies up to this taxable income.
+        rebate_max (float): Maximum Section 87A rebate.
+        rebate_marginal_relief (bool): Whether tax just above the rebate limit
+            is capped at the income in excess of the limit.
+        employer_nps_deduction_rate (float): Section 80CCD(2) limit on the
+            employer's NPS contribution, as a share of Basic + DA.
+        deduction_80c_limit (float): Section 80C limit (employee PF plus
+            declared investments); 0 where the regime allows no deductions.
+        deduction_80d_limit (float): Section 80D limit on health insurance
+            premiums (combined for self and parents).
+        hra_exemption (bool): Whether HRA is exempt under Section 10(13A).
+            If so, ``hra_assumed_share`` is HRA as a share of Basic + DA,
+            and the exemption is capped at ``hra_metro_share`` (or
+            ``hra_non_metro_share``) of Basic + DA and at rent paid above
+            ``hra_rent_excess`` of Basic + DA.
+        allows_deductions (bool): Whether any of the above applies.
+        pf_in_80c (bool): Whether employee PF is deducted as part of 80C
+            (Old Regime). Otherwise it is deducted from taxable income
+            directly, as this calculator does under the New Regime.
+        cess_rate (float): Health and education cess rate.
+        thresholds (tuple): Lower threshold of every slab, ascending, from 0.
+        rates (tuple): Tax rate of every slab.
+        base_tax (tuple): Tax on all income below each slab's threshold.
+        surcharge_thresholds (tuple): Surcharge applies to income above these.
+        surcharge_rates (tuple): Surcharge rate of every band.
+        surcharge_caps (tuple): Tax plus surcharge payable at each threshold,
+            used for marginal relief.
+    """
+
+    def __init__(self, data):
+        self.financial_year = data['financial_year']
+        self.regime = data['regime']
+        self.version = data['version']
+        self.description = data.get('description', '')
+
+        self.standard_deduction = data['standard_deduction']
+        self.pf_rate = data['pf']['rate']
+        self.pf_wage_ceiling_annual = data['pf']['wage_ceiling_monthly'] * 12
+        self.assumed_basic_da_share = data['pf']['assumed_basic_da_share']
+        self.rebate_income_limit = data['rebate_87a']['income_limit']
+        self.rebate_max = data['rebate_87a']['max_rebate']
+        self.rebate_marginal_relief = data['rebate_87a'].get('marginal_relief', False)
+        self.employer_nps_deduction_rate = data.get('employer_nps_deduction_rate', 0)
+        deductions = data.get('deductions', {})
+        self.deduction_80c_limit = deductions.get('80c_limit', 0)
+        self.deduction_80d_limit = deductions.get('80d_limit', 0)
+        hra = data.get('hra_exemption')
+        self.hra_exemption = hra is not None
+        self.hra_assumed_share = hra['assumed_share_of_basic'] if hra else 0
+        self.hra_metro_share = hra['metro_share_of_basic'] if hra else 0
+        self.hra_non_metro_share = hra['non_metro_share_of_basic'] if hra else 0
+        self.hra_rent_excess = hra['rent_excess_over_basic'] if hra else 0
+        self.allows_deductions = bool(self.deduction_80c_limit or self.deduction_80d_limit
+                                      or self.hra_exemption)
+        self.pf_in_80c = bool(self.deduction_80c_limit)
+        self.cess_rate = data['cess_rate']
+
+        slabs = data['slabs']
+        thresholds = tuple(slab['from'] for slab in slabs)
+        if not thresholds or thresholds[0] != 0:
+            raise ValueError(f"{self.version}: the first slab must start at 0")
+        if any(low >= high for low, high in zip(thresholds, thresholds[1:])):
+            raise ValueError(f"{self.version}: slab thresholds must be strictly ascending")
+        self.thresholds = thresholds
+        self.rates = tuple(slab['rate'] for slab in slabs)
+
+        # Cumulative table: base_tax[i] is the tax on income == thresholds[i].
+        base_tax = [0]
+        for i in range(1, len(thresholds)):
+            base_tax.append(base_tax[-1] + (thresholds[i] - thresholds[i - 1]) * self.rates[i - 1])
+        self.base_tax = tuple(base_tax)
+
+        bands = data.get('surcharge', [])
+        self.surcharge_thresholds = tuple(band['above'] for band in bands)
+        self.surcharge_rates = tuple(band['rate'] for band in bands)
+        if any(low >= high for low, high in zip(self.surcharge_thresholds, self.surcharge_thresholds[1:])):
+            raise ValueError(f"{self.version}: surcharge thresholds must be strictly ascending")
+        # Marginal relief: tax + surcharge just above a threshold may not exceed
+        # what is payable at the threshold (at the lower band's rate) by more
+        # than the income above the threshold.
+        caps = []
+        for i, threshold in enumerate(self.surcharge_thresholds):
+            previous_rate = self.surcharge_rates[i - 1] if i else 0
+            caps.append(self.slab_tax(threshold) * (1 + previous_rate))
+        self.surcharge_caps = tuple(caps)
+
+    def __repr__(self):
+        return f"TaxRules({self.version!r})"
+
+    def slab_tax(self, income):
+        """Returns the slab tax (before rebate and cess) on a taxable income."""
+        if income <= 0:
+            return 0
+        i = bisect_right(self.thresholds, income) - 1
+        return self.base_tax[i] + (income - self.thresholds[i]) * self.rates[i]
+
+    def surcharge(self, income, tax):
+        """Returns the surcharge on ``tax`` for a taxable income, after marginal relief."""
+        i = bisect_left(self.surcharge_thresholds, income) - 1
+        if i < 0:
+            return 0
+        threshold = self.surcharge_thresholds[i]
+        return min(tax * self.surcharge_rates[i],
+                   self.surcharge_caps[i] + (income - threshold) - tax)
+
+
+def rules_path(financial_year, regime=DEFAULT_REGIME):
+    return os.path.join(RULES_DIR, f"fy{financial_year}_{regime}.json")
+
+
+def available_rules():
+    """Returns a sorted list of (financial_year, regime) pairs that have rule files."""
+    pairs = []
+    for name in os.listdir(RULES_DIR):
+        if name.startswith('fy') and name.endswith('.json'):
+            financial_year, _, regime = name[2:-5].partition('_')
+            pairs.append((financial_year, regime))
+    return sorted(pairs)
+
+
+def load_rules(financial_year=DEFAULT_FINANCIAL_YEAR, regime=DEFAULT_REGIME):
+    """
+    Loads and compiles the rule set for a financial year and regime.
+
+    Rule sets are cached, so repeated calls for the same year are free.
+
+    Args:
+        financial_year (str): Financial year such as '2025-26'.
+        regime (str): Tax regime, 'new' by default.
+
+    Returns:
+        TaxRules: The compiled rule set.
+
+    Raises:
+        ValueError: If there is no rule file for that year and regime.
+    """
+    key = (financial_year, regime)
+    rules = _loaded_rules.get(key)
+    if rules is None:
+        path = rules_path(financial_year, regime)
+        if not os.path.exists(path):
+            known = ', '.join(f"{fy} ({r})" for fy, r in available_rules())
+            raise ValueError(f"No tax rules for FY {financial_year} ({regime} regime). "
+                             f"Available: {known}")
+        # json (and the re module it pulls in) is imported here rather than
+        # at module level to keep importing the engine cheap.
+        import json
+        with open(path, encoding='utf-8') as handle:
+            rules = TaxRules(json.load(handle))
+        _loaded_rules[key] = rules
+    return rules
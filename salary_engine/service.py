@@ -0,0 +1,369 @@
+"""
+Asynchronous HTTP/JSON calculation service.
+
+A small asyncio HTTP/1.1 server (standard library only) so internal tools
+can call the engine over the network instead of embedding their own copy
+of the tax rules:
+
+    python -m salary_engine serve --port 8080
+
+Endpoints:
+    POST /breakdown  {"ctc": 1500000, "financial_year": "2025-26"}
+                     -> same shape as calculate_salary_breakdown
+    POST /inverse    {"monthly_in_hand": 100000} or {"monthly_in_hand": [..]}
+                     -> {"ctc": ...}
+    POST /batch      {"ctc": [..], "financial_year": "2025-26"}
+                     -> columnar arrays, as calculate_salary_breakdown_batch
+    GET  /metrics    -> request count, requests per second, p50/p99 latency
+
+Single-CTC requests that arrive within a short window (2 ms by default) are
+coalesced into one vectorized batch call. Connections are kept alive
+between requests unless the client sends ``Connection: close``.
+
+NumPy is required for this module (``pip install numpy``).
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from salary_engine.batch import BATCH_COLUMNS, calculate_salary_breakdown_batch
+from salary_engine.inverse import solve_ctc_for_in_hand_batch
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 4096
+
+# Requests larger than this are rejected rather than read into memory.
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# /metrics reports recent throughput over this many seconds.
+RECENT_SECONDS = 10
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def breakdown_from_columns(columns, index, rules):
+    """Builds a ``calculate_salary_breakdown``-shaped dict from one batch row."""
+    ctc_annual = float(columns['ctc'][index])
+    pf_employee_annual = float(columns['pf'][index])
+    total_annual_tax = float(columns['total_tax'][index])
+    annual_in_hand_salary = float(columns['in_hand'][index])
+    return {
+        'annual': {
+            'Annual CTC': ctc_annual,
+            'Annual Standard Deduction': rules.standard_deduction,
+            'Annual Employee PF Deduction': pf_employee_annual,
+            'Annual Taxable Income (before rebate)': float(columns['taxable_income'][index]),
+            'Total Annual Income Tax': total_annual_tax,
+            'Annual In-Hand Salary': annual_in_hand_salary,
+        },
+        'monthly': {
+            'Monthly CTC': ctc_annual / 12,
+            'Monthly Employee PF Deduction': pf_employee_annual / 12,
+            'Monthly Income Tax': total_annual_tax / 12,
+            'Monthly In-Hand Salary': annual_in_hand_salary / 12,
+        },
+    }
+
+
+class BreakdownBatcher:
+    """
+    Coalesces single-CTC requests into vectorized engine calls.
+
+    The first request after an idle period starts a timer of ``window``
+    seconds; every request that arrives before it fires (or until
+    ``max_batch`` requests are waiting) is answered by one
+    ``calculate_salary_breakdown_batch`` call per financial year.
+    """
+
+    def __init__(self, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.batched_requests = 0
+        self._pending = []
+        self._timer = None
+
+    def submit(self, ctc_annual, financial_year):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((ctc_annual, financial_year, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.batched_requests += len(pending)
+
+        by_year = {}
+        for request in pending:
+            by_year.setdefault(request[1], []).append(request)
+        for financial_year, requests in by_year.items():
+            try:
+                rules = load_rules(financial_year)
+                columns = calculate_salary_breakdown_batch([r[0] for r in requests], financial_year)
+            except Exception as e:
+                for _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for index, (_, _, future) in enumerate(requests):
+                if not future.done():
+                    future.set_result(breakdown_from_columns(columns, index, rules))
+
+
+class ServiceMetrics:
+    """
+    Request count, throughput and latency percentiles over recent requests.
+
+    Latency percentiles come from the last ``window`` samples. Throughput is
+    counted separately in one-second buckets, so it is not capped by the
+    number of latency samples kept.
+    """
+
+    def __init__(self, window=10000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+        # [second, request count] pairs for the last RECENT_SECONDS seconds.
+        self._per_second = deque(maxlen=RECENT_SECONDS + 1)
+
+    def record(self, seconds, ok):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+        second = int(time.perf_counter())
+        if self._per_second and self._per_second[-1][0] == second:
+            self._per_second[-1][1] += 1
+        else:
+            self._per_second.append([second, 1])
+
+    def snapshot(self):
+        now = time.perf_counter()
+        samples = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000
+
+        # Whole seconds: the current, partly elapsed one plus the RECENT_SECONDS - 1 before it.
+        recent = sum(count for second, count in self._per_second
+                     if int(now) - second < RECENT_SECONDS)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'uptime_seconds': now - self.started,
+            'requests_per_second': self.requests / (now - self.started),
+            'recent_requests_per_second': recent / RECENT_SECONDS,
+            'latency_p50_ms': percentile(0.50),
+            'latency_p99_ms': percentile(0.99),
+        }
+
+
+class CalculationService:
+    """The HTTP server: routing, keep-alive connection handling and metrics."""
+
+    def __init__(self, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.batcher = BreakdownBatcher(batch_window, max_batch)
+        self.metrics = ServiceMetrics()
+        self.routes = {
+            ('POST', '/breakdown'): self.handle_breakdown,
+            ('POST', '/inverse'): self.handle_inverse,
+            ('POST', '/batch'): self.handle_batch,
+            ('GET', '/metrics'): self.handle_metrics,
+        }
+
+    # --- Endpoints ---
+
+    async def handle_breakdown(self, body):
+        ctc = _number(body, 'ctc')
+        if ctc < 0:
+            raise HTTPError(400, "ctc must not be negative")
+        return await self.batcher.submit(ctc, _financial_year(body))
+
+    async def handle_inverse(self, body):
+        targets = body.get('monthly_in_hand')
+        single = not isinstance(targets, list)
+        values = [targets] if single else targets
+        if not values or not all(_is_number(v) and v >= 0 for v in values):
+            raise HTTPError(400, "monthly_in_hand must be a non-negative number or a list of them")
+        ctcs = solve_ctc_for_in_hand_batch(values, _financial_year(body)).tolist()
+        return {'ctc': ctcs[0] if single else ctcs}
+
+    async def handle_batch(self, body):
+        ctcs = body.get('ctc')
+        if not isinstance(ctcs, list) or not all(_is_number(v) and v >= 0 for v in ctcs):
+            raise HTTPError(400, "ctc must be a list of non-negative numbers")
+        columns = calculate_salary_breakdown_batch(ctcs, _financial_year(body))
+        return {name: columns[name].tolist() for name in BATCH_COLUMNS}
+
+    async def handle_metrics(self, body):
+        metrics = self.metrics.snapshot()
+        metrics['coalesced_batches'] = self.batcher.batches
+        metrics['coalesced_requests'] = self.batcher.batched_requests
+        return metrics
+
+    # --- HTTP plumbing ---
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, raw_body = request
+                start = time.perf_counter()
+                status, payload = await self.dispatch(method, path, raw_body)
+                self.metrics.record(time.perf_counter() - start, status == 200)
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                body = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('ascii')
+                    + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            body = json.dumps({'error': str(e)}).encode('utf-8')
+            writer.write(f"HTTP/1.1 {e.status} {STATUS_TEXT[e.status]}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n".encode('ascii') + body)
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, raw_body):
+        path = path.split('?', 1)[0]
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                return 405, {'error': f"{method} not allowed on {path}"}
+            return 404, {'error': f"Unknown endpoint {path}"}
+        try:
+            body = json.loads(raw_body, parse_constant=_reject_constant) if raw_body else {}
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+            return 200, await handler(body)
+        except json.JSONDecodeError:
+            return 400, {'error': "Request body is not valid JSON"}
+        except HTTPError as e:
+            return e.status, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def _is_number(value):
+    # bool is a subclass of int, but true/false are not amounts. Numbers too
+    # large for a float (1e400) parse as infinity.
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _reject_constant(name):
+    # json.loads accepts NaN, Infinity and -Infinity, which are not JSON.
+    raise HTTPError(400, f"{name} is not a valid number")
+
+
+def _number(body, key):
+    value = body.get(key)
+    if not _is_number(value):
+        raise HTTPError(400, f"{key} must be a number")
+    return value
+
+
+def _financial_year(body):
+    financial_year = body.get('financial_year', DEFAULT_FINANCIAL_YEAR)
+    if not isinstance(financial_year, str):
+        raise HTTPError(400, "financial_year must be a string such as '2025-26'")
+    return financial_year
+
+
+async def _readline(reader, status):
+    # readline raises ValueError (readuntil, LimitOverrunError) when a line is
+    # longer than the stream's limit; answer with ``status`` instead.
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(status, "Request line or header too long")
+
+
+async def _read_request(reader):
+    """Reads one HTTP request. Returns None when the client closed the connection."""
+    request_line = await _readline(reader, 400)
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await _readline(reader, 431)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), path, headers, body
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT, batch_window=DEFAULT_BATCH_WINDOW,
+                max_batch=DEFAULT_MAX_BATCH):
+    """Runs the service until interrupted."""
+    service = CalculationService(batch_window, max_batch)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
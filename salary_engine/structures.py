@@ -0,0 +1,317 @@
+"""
+Configurable salary structures: how a CTC is split into components.
+
+``calculate_salary_breakdown`` assumes Basic + DA is a fixed share of the
+CTC and ignores the employer-side parts of the package (employer PF,
+gratuity, employer NPS). Real structures differ by grade, so a structure
+file describes the split instead:
+
+    {
+        "id": "standard",
+        "version": "standard.1",
+        "professional_tax_annual": 2500,
+        "components": [
+            {"name": "basic", "label": "Basic + DA", "type": "earning",
+             "rate": 0.50, "basic_da": true},
+            {"name": "hra", "label": "HRA", "type": "earning", "rate": 0.40, "of": "basic"},
+            {"name": "employer_pf", "label": "Employer PF", "type": "employer_pf"},
+            {"name": "special", "label": "Special Allowance", "type": "earning", "balance": true}
+        ]
+    }
+
+Every component has one amount rule:
+    "rate"            a share of the CTC, or of another component with
+                      "of"; optionally capped with "min" / "max" (annual)
+    "amount"          a fixed annual amount
+    "balance": true   whatever is left of the CTC (at most one component)
+Employer PF takes no amount rule: it is the PF rate times the PF wages
+(the "basic_da" components), capped at the statutory wage ceiling unless
+the structure sets "pf": {"capped": false}.
+
+Component types:
+    earning        paid with the salary and taxable (Basic, HRA, LTA, ...)
+    employer_pf    part of the CTC, not paid out and not taxed
+    retiral        other employer-side benefits such as gratuity; part of
+                   the CTC, not paid out and not taxed
+    employer_nps   part of the CTC, not paid out; taxed as salary but
+                   deductible under Section 80CCD(2) up to the rule set's
+                   share of Basic + DA
+
+The employee pays PF at the same rate on the same wages, and professional
+tax, out of the in-hand salary. Under the new regime neither of them is
+deductible and HRA is not exempt.
+
+Structure files live in ``salary_engine/structures/<id>.json``. Each one is
+compiled once into a flat list of evaluation steps, with component
+references resolved to indices and ordered so that every component comes
+after the ones it depends on, and cached by structure ID. Evaluating a
+CTC is then one pass over that list; the batch engine runs the same steps
+over whole NumPy arrays (``calculate_structure_breakdown_batch``).
+"""
+
+import os
+
+from salary_engine.core import income_tax
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+DEFAULT_STRUCTURE = 'standard'
+
+STRUCTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'structures')
+
+COMPONENT_TYPES = ('earning', 'employer_pf', 'retiral', 'employer_nps')
+
+_loaded_structures = {}
+
+
+class SalaryStructure:
+    """
+    One compiled salary structure.
+
+    Attributes:
+        id (str): Structure ID, e.g. 'standard'.
+        version (str): Version string from the structure file.
+        description (str): Free text from the structure file.
+        names (tuple): Component names, in file order.
+        labels (tuple): Display label of every component.
+        types (tuple): Type of every component, one of ``COMPONENT_TYPES``.
+        pf_rate (float): PF rate, or None for the rule set's rate.
+        pf_capped (bool): Whether PF wages are capped at the wage ceiling.
+        professional_tax (float): Annual professional tax.
+        steps (tuple): ``(index, kind, value, source, minimum, maximum)`` in
+            evaluation order. ``kind`` is 'fixed', 'rate', 'employer_pf' or
+            'balance'; ``source`` is the index of the component a rate
+            applies to, or -1 for the CTC.
+        earnings, basic_da, employer_pf, retirals, employer_nps (tuple):
+            Indices of the components of each kind.
+    """
+
+    def __init__(self, data):
+        self.id = data['id']
+        self.version = data['version']
+        self.description = data.get('description', '')
+        pf = data.get('pf', {})
+        self.pf_rate = pf.get('rate')
+        self.pf_capped = pf.get('capped', True)
+        self.professional_tax = data.get('professional_tax_annual', 0)
+
+        components = data['components']
+        self.names = tuple(component['name'] for component in components)
+        self.labels = tuple(component.get('label', component['name']) for component in components)
+        self.types = tuple(component.get('type', 'earning') for component in components)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"{self.version}: component names must be unique")
+        if 'ctc' in self.names:
+            raise ValueError(f"{self.version}: 'ctc' is reserved and cannot be a component name")
+        for name, kind in zip(self.names, self.types):
+            if kind not in COMPONENT_TYPES:
+                raise ValueError(f"{self.version}: component {name!r} has unknown type {kind!r}; "
+                                 f"expected one of: {', '.join(COMPONENT_TYPES)}")
+
+        def indices(predicate):
+            return tuple(i for i, component in enumerate(components) if predicate(component))
+
+        self.earnings = indices(lambda c: c.get('type', 'earning') == 'earning')
+        self.basic_da = indices(lambda c: c.get('basic_da', False))
+        self.employer_pf = indices(lambda c: c.get('type') == 'employer_pf')
+        self.retirals = indices(lambda c: c.get('type') == 'retiral')
+        self.employer_nps = indices(lambda c: c.get('type') == 'employer_nps')
+        if self.employer_pf and not self.basic_da:
+            raise ValueError(f"{self.version}: employer PF needs at least one 'basic_da' component")
+
+        self.steps = self._compile(components)
+
+    def __repr__(self):
+        return f"SalaryStructure({self.version!r})"
+
+    def _compile(self, components):
+        """Resolves every amount rule into a step and orders the steps by dependency."""
+        index_of = {name: i for i, name in enumerate(self.names)}
+        steps = {}
+        depends_on = {}
+        balance = [i for i, component in enumerate(components) if component.get('balance')]
+        if len(balance) > 1:
+            raise ValueError(f"{self.version}: at most one component can be the balance")
+
+        for i, component in enumerate(components):
+            name = component['name']
+            rules = [key for key in ('rate', 'amount', 'balance') if key in component]
+            if self.types[i] == 'employer_pf':
+                if rules:
+                    raise ValueError(f"{self.version}: employer PF {name!r} is computed from the "
+                                     f"PF wages and cannot have its own rate or amount")
+                steps[i] = (i, 'employer_pf', 0.0, -1, float('-inf'), float('inf'))
+                depends_on[i] = set(self.basic_da)
+            elif len(rules) != 1:
+                raise ValueError(f"{self.version}: component {name!r} needs exactly one of "
+                                 f"'rate', 'amount' or 'balance'")
+            elif 'amount' in component:
+                steps[i] = (i, 'fixed', float(component['amount']), -1, float('-inf'), float('inf'))
+                depends_on[i] = set()
+            elif 'balance' in component:
+                steps[i] = (i, 'balance', 0.0, -1, 0.0, float('inf'))
+                depends_on[i] = set(range(len(components))) - {i}
+            else:
+                of = component.get('of', 'ctc')
+                if of != 'ctc' and of not in index_of:
+                    raise ValueError(f"{self.version}: component {name!r} refers to unknown "
+                                     f"component {of!r}")
+                source = -1 if of == 'ctc' else index_of[of]
+                steps[i] = (i, 'rate', float(component['rate']), source,
+                            float(component.get('min', float('-inf'))),
+                            float(component.get('max', float('inf'))))
+                depends_on[i] = set() if source < 0 else {source}
+
+        # Topological order; anything left over is part of a cycle.
+        ordered, done = [], set()
+        while len(ordered) < len(components):
+            ready = [i for i in range(len(components)) if i not in done and depends_on[i] <= done]
+            if not ready:
+                cycle = ', '.join(self.names[i] for i in range(len(components)) if i not in done)
+                raise ValueError(f"{self.version}: circular component references between: {cycle}")
+            ordered.extend(steps[i] for i in ready)
+            done.update(ready)
+        return tuple(ordered)
+
+    def evaluate(self, ctc_annual, rules):
+        """
+        Splits one CTC into its components.
+
+        Args:
+            ctc_annual (float): The annual CTC in Indian Rupees.
+            rules (TaxRules): Rule set providing the PF rate and wage ceiling.
+
+        Returns:
+            list: Annual amount of every component, in ``names`` order.
+
+        Raises:
+            ValueError: If the other components add up to more than the CTC,
+                so that the balance would be negative.
+        """
+        pf_rate = rules.pf_rate if self.pf_rate is None else self.pf_rate
+        amounts = [0.0] * len(self.names)
+        for index, kind, value, source, minimum, maximum in self.steps:
+            if kind == 'fixed':
+                amount = value
+            elif kind == 'rate':
+                amount = min(max((ctc_annual if source < 0 else amounts[source]) * value, minimum), maximum)
+            elif kind == 'employer_pf':
+                wages = sum(amounts[i] for i in self.basic_da)
+                if self.pf_capped:
+                    wages = min(wages, rules.pf_wage_ceiling_annual)
+                amount = pf_rate * wages
+            else:
+                # The balance is always evaluated last, when only its own slot is still 0.
+                amount = ctc_annual - sum(amounts)
+                if amount < minimum:
+                    raise self._balance_error(index, ctc_annual, amount)
+                amount = max(amount, minimum)
+            amounts[index] = amount
+        return amounts
+
+    def _balance_error(self, index, ctc_annual, balance):
+        return ValueError(f"{self.version}: the components add up to more than a CTC of "
+                          f"{ctc_annual:,.2f}; {self.names[index]!r} would be {balance:,.2f}")
+
+
+def structure_path(structure_id, directory=STRUCTURES_DIR):
+    return os.path.join(directory, f"{structure_id}.json")
+
+
+def available_structures(directory=STRUCTURES_DIR):
+    """Returns the sorted IDs of the structure files in ``directory``."""
+    return sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def load_structure(structure_id=DEFAULT_STRUCTURE, directory=STRUCTURES_DIR):
+    """
+    Loads and compiles a salary structure.
+
+    Structures are cached by directory and ID, so each file is parsed and
+    compiled at most once per process.
+
+    Args:
+        structure_id (str): Structure ID, the file name without ``.json``.
+        directory (str): Directory holding the structure files.
+
+    Returns:
+        SalaryStructure: The compiled structure.
+
+    Raises:
+        ValueError: If there is no such structure or its file is invalid.
+    """
+    key = (directory, structure_id)
+    structure = _loaded_structures.get(key)
+    if structure is None:
+        path = structure_path(structure_id, directory)
+        if os.path.basename(structure_id) != structure_id or not os.path.exists(path):
+            known = ', '.join(available_structures(directory))
+            raise ValueError(f"No salary structure {structure_id!r}. Available: {known}")
+        import json
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        if data.get('id') != structure_id:
+            raise ValueError(f"{path}: 'id' must match the file name ({structure_id!r})")
+        structure = SalaryStructure(data)
+        _loaded_structures[key] = structure
+    return structure
+
+
+def calculate_structure_breakdown(ctc_annual, structure_id=DEFAULT_STRUCTURE,
+                                  financial_year=DEFAULT_FINANCIAL_YEAR, directory=STRUCTURES_DIR):
+    """
+    Calculates the salary breakdown for a CTC paid under a salary structure.
+
+    Args:
+        ctc_annual (float): The annual CTC in Indian Rupees.
+        structure_id (str): Salary structure to split the CTC with.
+        financial_year (str): Financial year whose tax rules to apply.
+        directory (str): Directory holding the structure files.
+
+    Returns:
+        dict: 'components' (label -> annual amount), 'annual' and 'monthly'
+              breakdowns.
+
+    Raises:
+        ValueError: If the structure's components add up to more than the CTC.
+    """
+    rules = load_rules(financial_year)
+    structure = load_structure(structure_id, directory)
+    amounts = structure.evaluate(ctc_annual, rules)
+
+    gross_salary = sum(amounts[i] for i in structure.earnings)
+    basic_da = sum(amounts[i] for i in structure.basic_da)
+    # The employee matches the employer's PF contribution out of the salary.
+    employee_pf = sum(amounts[i] for i in structure.employer_pf)
+    employer_nps = sum(amounts[i] for i in structure.employer_nps)
+
+    # Employer NPS is taxed as salary, then deducted under 80CCD(2) up to a
+    # share of Basic + DA.
+    nps_deduction = min(employer_nps, rules.employer_nps_deduction_rate * basic_da)
+    taxable_income = max(gross_salary + employer_nps - nps_deduction - rules.standard_deduction, 0)
+
+    tax_before_cess, surcharge, health_cess = income_tax(taxable_income, rules)
+    total_tax = tax_before_cess + surcharge + health_cess
+    in_hand = gross_salary - employee_pf - structure.professional_tax - total_tax
+
+    return {
+        'components': dict(zip(structure.labels, amounts)),
+        'annual': {
+            'Annual CTC': ctc_annual,
+            'Annual Gross Salary': gross_salary,
+            'Annual Standard Deduction': rules.standard_deduction,
+            'Annual Employee PF Deduction': employee_pf,
+            'Annual Employer NPS Deduction (80CCD(2))': nps_deduction,
+            'Annual Professional Tax': structure.professional_tax,
+            'Annual Taxable Income (before rebate)': taxable_income,
+            'Total Annual Income Tax': total_tax,
+            'Annual In-Hand Salary': in_hand,
+        },
+        'monthly': {
+            'Monthly CTC': ctc_annual / 12,
+            'Monthly Gross Salary': gross_salary / 12,
+            'Monthly Employee PF Deduction': employee_pf / 12,
+            'Monthly Professional Tax': structure.professional_tax / 12,
+            'Monthly Income Tax': total_tax / 12,
+            'Monthly In-Hand Salary': in_hand / 12,
+        },
+    }
@@ -0,0 +1,119 @@
+"""
+Salary sweeps: the breakdown over a whole range of CTCs in one batch call.
+
+Used by the desktop app's comparison table and by
+``python -m salary_engine sweep``. Besides the usual figures, every point
+gets its effective tax rate, its marginal tax rate (tax on the next rupee
+of CTC) and a flag for the 87A rebate cliff: points just above the rebate
+limit whose in-hand salary is lower than at the limit itself.
+
+NumPy is required for this module (``pip install numpy``).
+"""
+
+import csv
+
+import numpy as np
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.inverse import ctc_for_taxable_income
+from salary_engine.rules import DEFAULT_FINANCIAL_YEAR, load_rules
+
+LAKH = 100000
+
+# Columns returned by salary_sweep, in display order, with their headings.
+SWEEP_COLUMNS = {
+    'ctc': "Annual CTC",
+    'monthly_in_hand': "Monthly In-Hand",
+    'in_hand': "Annual In-Hand",
+    'total_tax': "Annual Tax",
+    'effective_rate': "Effective Rate",
+    'marginal_rate': "Marginal Rate",
+    'rebate_cliff': "Rebate Cliff",
+}
+
+MONEY_COLUMNS = ('ctc', 'monthly_in_hand', 'in_hand', 'total_tax')
+
+# Safety limit so a typo in the step cannot allocate gigabytes.
+MAX_SWEEP_POINTS = 10000000
+
+
+def sweep_points(start_lpa, stop_lpa, step_lpa):
+    """Returns the CTCs (in ₹) from ``start_lpa`` to ``stop_lpa`` inclusive, in LPA steps."""
+    if step_lpa <= 0:
+        raise ValueError("Sweep step must be a positive number.")
+    if start_lpa < 0 or stop_lpa < start_lpa:
+        raise ValueError("Sweep range must satisfy 0 <= start <= stop.")
+    count = int(round((stop_lpa - start_lpa) / step_lpa, 9)) + 1
+    if count > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep would have {count:,} points; the limit is {MAX_SWEEP_POINTS:,}.")
+    return (start_lpa + step_lpa * np.arange(count)) * LAKH
+
+
+def salary_sweep(ctc_annual, financial_year=DEFAULT_FINANCIAL_YEAR):
+    """
+    Calculates the breakdown and tax rates for every CTC in a range.
+
+    Args:
+        ctc_annual (array_like): Annual CTCs in Indian Rupees, e.g. from
+            ``sweep_points``.
+        financial_year (str): Financial year whose tax rules to apply.
+
+    Returns:
+        dict: Column name -> array, with the keys of ``SWEEP_COLUMNS``. Rates
+              are fractions (0.1 == 10%); ``rebate_cliff`` is boolean.
+    """
+    rules = load_rules(financial_year)
+    ctc = np.asarray(ctc_annual, dtype=np.float64)
+    columns = calculate_salary_breakdown_batch(ctc, financial_year)
+    next_rupee = calculate_salary_breakdown_batch(ctc + 1, financial_year)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        effective_rate = np.where(ctc > 0, columns['total_tax'] / ctc, 0.0)
+    marginal_rate = next_rupee['total_tax'] - columns['total_tax']
+
+    limit_ctc = ctc_for_taxable_income(rules, rules.rebate_income_limit)
+    in_hand_at_limit = calculate_salary_breakdown(limit_ctc, financial_year)['annual']['Annual In-Hand Salary']
+    rebate_cliff = (columns['taxable_income'] > rules.rebate_income_limit) & (columns['in_hand'] < in_hand_at_limit)
+
+    return {
+        'ctc': ctc,
+        'monthly_in_hand': columns['in_hand'] / 12,
+        'in_hand': columns['in_hand'],
+        'total_tax': columns['total_tax'],
+        'effective_rate': effective_rate,
+        'marginal_rate': marginal_rate,
+        'rebate_cliff': rebate_cliff,
+    }
+
+
+def format_sweep_row(sweep, index):
+    """Returns one sweep row as display strings, in ``SWEEP_COLUMNS`` order."""
+    return (
+        f"₹{sweep['ctc'][index]:,.2f}",
+        f"₹{sweep['monthly_in_hand'][index]:,.2f}",
+        f"₹{sweep['in_hand'][index]:,.2f}",
+        f"₹{sweep['total_tax'][index]:,.2f}",
+        f"{sweep['effective_rate'][index]:.2%}",
+        f"{sweep['marginal_rate'][index]:.2%}",
+        "yes" if sweep['rebate_cliff'][index] else "",
+    )
+
+
+def _csv_value(name, value):
+    if name == 'rebate_cliff':
+        return int(value)
+    if name in MONEY_COLUMNS:
+        return f"{value:.2f}"
+    return f"{value:.6f}"
+
+
+def write_sweep_csv(sweep, path):
+    """Writes a sweep to a CSV file with one row per CTC."""
+    names = list(SWEEP_COLUMNS)
+    values = [sweep[name].tolist() for name in names]
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(names)
+        writer.writerows([_csv_value(name, value) for name, value in zip(names, row)]
+                         for row in zip(*values))
@@ -0,0 +1,313 @@
+"""
+Opt-in audit trail and stage timings for the engine.
+
+For a payroll audit every figure has to be traceable to the rule that
+produced it: which slab the taxable income fell in, whether the PF wage
+ceiling or the 87A rebate applied, how much surcharge relief was given and
+what the cess came to. The engine computes all of that and throws it away;
+pass a ``CalculationTrace`` and it keeps one compact record per
+calculation instead.
+
+    from salary_engine.trace import CalculationTrace, read_trace_log
+
+    trace = CalculationTrace()
+    calculate_salary_breakdown(1500000, trace=trace)
+    calculate_salary_breakdown_batch(ctcs, trace=trace)
+    trace.write('payroll.trace')  # appends; call again for the next chunk
+    trace.columns()['rebate_87a']
+    read_trace_log('payroll.trace')  # NumPy record array, one row per calculation
+
+Scalar calls add a tuple per call. Batch calls add their columns as arrays
+(the engine's own arrays where possible, so nothing is copied), never a
+dict per row. Batch calls also add their time to per-stage counters
+(``stage_seconds``); ``CalculationTrace(records=False)`` keeps only the
+counters.
+
+Without a trace the engine checks ``trace is not None`` once per call and
+does nothing else.
+
+The log is a small header followed by fixed-size little-endian records
+(``TRACE_FIELDS``), so writing only ever appends and a log cut short by a
+crash loses at most the last, partial record. NumPy is needed to build the
+columns and to read and write logs, and is imported when first needed.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from time import perf_counter
+
+# Fields of a trace record, in order, with their NumPy types. Amounts are
+# annual, in rupees.
+TRACE_FIELDS = (
+    ('call', '<u4'),                # Engine call the record came from (0, 1, ... per trace)
+    ('row', '<u4'),                 # Position of the CTC in that call's input (0 for scalar calls)
+    ('rules_version', 'S16'),       # Rule set applied, e.g. b'2025-26-new.3'
+    ('ctc', '<f8'),
+    ('assumed_basic_da', '<f8'),
+    ('pf_capped', '?'),             # Basic + DA above the PF wage ceiling
+    ('pf', '<f8'),
+    ('standard_deduction', '<f8'),
+    ('hra_exemption', '<f8'),       # HRA, 80C and 80D are 0 under the New Regime
+    ('deduction_80c', '<f8'),
+    ('deduction_80d', '<f8'),
+    ('taxable_income', '<f8'),
+    ('slab', 'i1'),                 # Index of the slab the taxable income falls in
+    ('slab_rate', '<f8'),
+    ('slab_tax', '<f8'),            # Tax from the slabs, before the 87A rebate
+    ('rebate_87a', '<f8'),          # Rebate taken off at or below the rebate limit
+    ('rebate_relief', '<f8'),       # 87A marginal relief taken off just above it
+    ('surcharge_band', 'i1'),       # Index of the surcharge band, -1 for none
+    ('surcharge_rate', '<f8'),
+    ('surcharge_relief', '<f8'),    # Taken off the full surcharge by marginal relief
+    ('surcharge', '<f8'),
+    ('cess', '<f8'),
+    ('total_tax', '<f8'),
+    ('in_hand', '<f8'),
+)
+
+TRACE_COLUMNS = tuple(name for name, _ in TRACE_FIELDS)
+
+# Engine stages timed in batch calls, in order.
+STAGES = ('pf', 'taxable_income', 'income_tax', 'columns', 'trace')
+
+LOG_MAGIC = b'SALTRACE'
+LOG_VERSION = 1
+
+
+class CalculationTrace:
+    """
+    Collects trace records and stage timings from engine calls.
+
+    Attributes:
+        records (bool): Whether calculations are recorded. If False only the
+            stage counters are kept.
+        calls (int): Number of engine calls traced so far.
+        stage_calls (dict): Stage -> number of times it ran.
+        stage_rows (dict): Stage -> number of rows it processed.
+        stage_seconds (dict): Stage -> total seconds spent in it.
+    """
+
+    def __init__(self, records=True):
+        self.records = records
+        self.calls = 0
+        self.stage_calls = dict.fromkeys(STAGES, 0)
+        self.stage_rows = dict.fromkeys(STAGES, 0)
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        # Scalar records waiting to become a chunk, and the chunks so far:
+        # (row count, column name -> array or one value for every row).
+        self._pending = []
+        self._chunks = []
+
+    def __len__(self):
+        return len(self._pending) + sum(length for length, _ in self._chunks)
+
+    def start_call(self):
+        """Counts a new engine call; returns its number."""
+        self.calls += 1
+        return self.calls - 1
+
+    def lap(self, stage, since, rows):
+        """
+        Adds the time since ``since`` (a ``time.perf_counter()`` value) to a
+        stage and returns the current time, to start the next stage.
+        """
+        now = perf_counter()
+        self.stage_calls[stage] += 1
+        self.stage_rows[stage] += rows
+        self.stage_seconds[stage] += now - since
+        return now
+
+    def record(self, rules, ctc, assumed_basic_da, pf, deductions, taxable_income,
+               tax, surcharge, cess, total_tax, in_hand):
+        """Records one scalar calculation (see ``salary_engine.core``)."""
+        if not self.records:
+            return
+        call = self.start_call()
+        slab = bisect_right(rules.thresholds, taxable_income) - 1
+        slab_tax = rules.slab_tax(taxable_income)
+        within_rebate = taxable_income <= rules.rebate_income_limit
+        band = bisect_left(rules.surcharge_thresholds, taxable_income) - 1
+        surcharge_rate = rules.surcharge_rates[band] if band >= 0 else 0
+        self._pending.append((
+            call, 0, rules.version, ctc, assumed_basic_da,
+            assumed_basic_da > rules.pf_wage_ceiling_annual, pf, rules.standard_deduction,
+            *deductions, taxable_income, slab, rules.rates[slab], slab_tax,
+            slab_tax - tax if within_rebate else 0, 0 if within_rebate else slab_tax - tax,
+            band, surcharge_rate, tax * surcharge_rate - surcharge if band >= 0 else 0,
+            surcharge, cess, total_tax, in_hand,
+        ))
+
+    def record_batch(self, rules, rows, columns, assumed_basic_da):
+        """
+        Records a batch calculation from the columns the batch engine
+        returned (see ``salary_engine.batch``). The arrays are kept, not
+        copied, so they must not be modified afterwards.
+
+        Args:
+            rules (TaxRules): Rule set the batch was calculated with.
+            rows (ndarray): Position of each row in the engine call's input,
+                or None if the rows are the whole input, in order.
+            columns (dict): Batch engine columns for these rows.
+            assumed_basic_da (ndarray): Assumed Basic + DA of each row.
+        """
+        if not self.records:
+            return
+        import numpy as np
+
+        self._flush()
+        ctc = columns['ctc']
+        taxable_income = columns['taxable_income']
+        tax = columns['tax_before_cess']
+        surcharge = columns['surcharge']
+        thresholds = np.asarray(rules.thresholds, dtype=np.float64)
+        # The tables have a handful of entries, so one comparison per
+        # threshold is cheaper than a binary search per row.
+        slab = np.zeros(len(ctc), dtype=np.int8)
+        for threshold in rules.thresholds[1:]:
+            slab += taxable_income >= threshold
+        slab_rate = np.asarray(rules.rates, dtype=np.float64)[slab]
+        slab_tax = np.asarray(rules.base_tax, dtype=np.float64)[slab] + (taxable_income - thresholds[slab]) * slab_rate
+        within_rebate = taxable_income <= rules.rebate_income_limit
+        rebated = slab_tax - tax
+
+        chunk = {
+            'call': self.calls - 1,
+            'row': rows,
+            'rules_version': rules.version,
+            'ctc': ctc,
+            'assumed_basic_da': assumed_basic_da,
+            'pf_capped': assumed_basic_da > rules.pf_wage_ceiling_annual,
+            'pf': columns['pf'],
+            'standard_deduction': rules.standard_deduction,
+            'hra_exemption': columns.get('hra_exemption', 0.0),
+            'deduction_80c': columns.get('deduction_80c', 0.0),
+            'deduction_80d': columns.get('deduction_80d', 0.0),
+            'taxable_income': taxable_income,
+            'slab': slab,
+            'slab_rate': slab_rate,
+            'slab_tax': slab_tax,
+            'rebate_87a': np.where(within_rebate, rebated, 0.0),
+            'rebate_relief': np.where(within_rebate, 0.0, rebated),
+            'surcharge_band': -1,
+            'surcharge_rate': 0.0,
+            'surcharge_relief': 0.0,
+            'surcharge': surcharge,
+            'cess': columns['cess'],
+            'total_tax': columns['total_tax'],
+            'in_hand': columns['in_hand'],
+        }
+        if rules.surcharge_thresholds:
+            band = np.full(len(ctc), -1, dtype=np.int8)
+            for threshold in rules.surcharge_thresholds:
+                band += taxable_income > threshold
+            in_band = band >= 0
+            surcharge_rate = np.where(in_band, np.asarray(rules.surcharge_rates)[np.maximum(band, 0)], 0.0)
+            chunk['surcharge_band'] = band
+            chunk['surcharge_rate'] = surcharge_rate
+            chunk['surcharge_relief'] = np.where(in_band, tax * surcharge_rate - surcharge, 0.0)
+        self._chunks.append((len(ctc), chunk))
+
+    def _flush(self):
+        # Turns the pending scalar records into a chunk, keeping the order
+        # of scalar and batch records.
+        if self._pending:
+            self._chunks.append((len(self._pending), dict(zip(TRACE_COLUMNS, zip(*self._pending)))))
+            self._pending = []
+
+    def to_records(self):
+        """Returns every record so far as a NumPy record array with ``TRACE_FIELDS``."""
+        import numpy as np
+
+        self._flush()
+        records = np.empty(len(self), dtype=list(TRACE_FIELDS))
+        start = 0
+        for length, chunk in self._chunks:
+            for name in TRACE_COLUMNS:
+                value = chunk[name]
+                if value is None:  # Rows of a whole batch, in order.
+                    value = np.arange(length)
+                records[name][start:start + length] = value
+            start += length
+        return records
+
+    def columns(self):
+        """Returns every record so far as column name -> array, in ``TRACE_FIELDS`` order."""
+        records = self.to_records()
+        return {name: records[name] for name in TRACE_COLUMNS}
+
+    def write(self, path):
+        """
+        Appends the records so far to a trace log and clears them, so that
+        calling this after every chunk of a payroll run writes each record
+        once. The stage counters are kept.
+
+        Raises:
+            ValueError: If ``path`` is not a trace log with the same fields.
+        """
+        records = self.to_records()
+        with open(path, 'ab') as handle:
+            if handle.tell() == 0:
+                handle.write(_log_header())
+            else:
+                _check_header(path)
+            handle.write(records.tobytes())
+        self.clear()
+        return len(records)
+
+    def clear(self):
+        """Drops the records so far; the stage counters and call count are kept."""
+        self._pending = []
+        self._chunks = []
+
+    def stage_report(self):
+        """Returns (stage, calls, rows, seconds, rows per second) for every stage that ran."""
+        report = []
+        for stage in STAGES:
+            seconds = self.stage_seconds[stage]
+            if self.stage_calls[stage]:
+                rate = self.stage_rows[stage] / seconds if seconds > 0 else float('inf')
+                report.append((stage, self.stage_calls[stage], self.stage_rows[stage], seconds, rate))
+        return report
+
+
+def _log_header():
+    fields = json.dumps([list(field) for field in TRACE_FIELDS]).encode('ascii')
+    return LOG_MAGIC + bytes([LOG_VERSION]) + len(fields).to_bytes(4, 'little') + fields
+
+
+def _read_header(handle, path):
+    start = handle.read(len(LOG_MAGIC) + 5)
+    if len(start) < len(LOG_MAGIC) + 5 or not start.startswith(LOG_MAGIC):
+        raise ValueError(f"{path} is not a trace log")
+    if start[len(LOG_MAGIC)] != LOG_VERSION:
+        raise ValueError(f"{path}: unsupported trace log version {start[len(LOG_MAGIC)]}")
+    fields = json.loads(handle.read(int.from_bytes(start[-4:], 'little')).decode('ascii'))
+    return [tuple(field) for field in fields]
+
+
+def _check_header(path):
+    with open(path, 'rb') as handle:
+        if _read_header(handle, path) != list(TRACE_FIELDS):
+            raise ValueError(f"{path} was written with different trace fields; use a new log")
+
+
+def read_trace_log(path):
+    """
+    Reads a trace log written by ``CalculationTrace.write``.
+
+    Returns:
+        numpy.ndarray: Record array with the log's fields, one row per
+            calculation in the order they were written. A partial record at
+            the end (from a writer that did not finish) is left out.
+
+    Raises:
+        ValueError: If the file is not a trace log.
+    """
+    import numpy as np
+
+    with open(path, 'rb') as handle:
+        dtype = np.dtype(_read_header(handle, path))
+        data = handle.read()
+    whole = len(data) - len(data) % dtype.itemsize
+    return np.frombuffer(data[:whole], dtype=dtype).copy()
+
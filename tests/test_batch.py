@@ -0,0 +1,18 @@
+"""
+Tests for the vectorized batch engine.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from salary_engine.batch import BATCH_COLUMNS, DEDUCTION_COLUMNS, calculate_salary_breakdown_batch
+
+
+@pytest.mark.parametrize('regime, names', [('new', BATCH_COLUMNS), ('old', BATCH_COLUMNS + DEDUCTION_COLUMNS)])
+def test_empty_payroll_with_one_year_per_row(regime, names):
+    columns = calculate_salary_breakdown_batch(np.array([]), np.array([], dtype=str), regime)
+    assert set(columns) == set(names)
+    for values in columns.values():
+        assert values.dtype == np.float64 and values.shape == (0,)
+    assert set(calculate_salary_breakdown_batch([], '2025-26', regime)) == set(names)
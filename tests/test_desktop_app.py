@@ -0,0 +1,42 @@
+"""
+Tests for the Tkinter desktop app's incremental result rendering.
+"""
+
+import pytest
+
+tk = pytest.importorskip('tkinter')
+
+from Salary_Calculator import SalaryCalculatorWindow
+
+
+@pytest.fixture
+def window():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.withdraw()
+    yield SalaryCalculatorWindow(root)
+    root.destroy()
+
+
+def show(window, ctc):
+    window.ctc_entry.delete(0, tk.END)
+    window.ctc_entry.insert(0, str(ctc))
+    return window.calculate_and_display()
+
+
+def test_second_render_rewrites_changed_values_in_place(window):
+    assert show(window, 1500000)
+    text = window.output_text
+    tag = window.line_tags[('annual', 'Annual CTC')]
+    start = text.index(text.tag_ranges(tag)[0])
+    standard_deduction = text.get(*text.tag_ranges(window.line_tags[('annual', 'Annual Standard Deduction')]))
+
+    assert show(window, 1600000)
+    first, last = text.tag_ranges(tag)
+    assert text.index(first) == start
+    assert text.get(first, last) == "Annual CTC: ₹1,600,000.00"
+    # Unchanged lines keep their text, and the widget holds one copy of each line.
+    assert text.get(*text.tag_ranges(window.line_tags[('annual', 'Annual Standard Deduction')])) == standard_deduction
+    assert text.get(1.0, 'end').count("Annual CTC:") == 1
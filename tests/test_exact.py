@@ -0,0 +1,166 @@
+"""
+Reconciliation tests for the exact integer-paise mode.
+
+A large seeded payroll is run through the int64 batch path and, on a
+sample of rows, through the scalar function, whose figures are rounded
+independently. The two must agree to the paisa on every row and in total,
+and every employee's figures must add up (CTC = in-hand + tax + PF). The
+sampled rows and their totals are also reconciled against a reference
+computed per row in ``decimal.Decimal`` rupees straight from the float
+rule tables, with the rounding documented in ``salary_engine.exact``.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from salary_engine.exact import (MAX_CTC, PAISE_COLUMNS, PAISE_DEDUCTION_COLUMNS, calculate_salary_breakdown_paise,
+                                 calculate_salary_breakdown_paise_batch, to_paise, to_rupees)
+from salary_engine.rules import load_rules
+
+ROWS = 200000
+SAMPLE = 4000
+
+# Batch column -> scalar annual key.
+SCALAR_KEYS = {
+    'ctc': 'Annual CTC',
+    'pf': 'Annual Employee PF Deduction',
+    'taxable_income': 'Annual Taxable Income (before rebate)',
+    'total_tax': 'Total Annual Income Tax',
+    'in_hand': 'Annual In-Hand Salary',
+    'hra_exemption': 'Annual HRA Exemption',
+    'deduction_80c': 'Annual 80C Deduction',
+    'deduction_80d': 'Annual 80D Deduction',
+}
+
+
+@pytest.fixture(scope='module', params=('new', 'old'))
+def payroll(request):
+    """(regime, CTCs, declarations, batch columns, sampled rows, scalar results of those rows)."""
+    regime = request.param
+    rng = np.random.default_rng(2024)
+    ctcs = np.round(rng.lognormal(np.log(1500000), 0.9, size=ROWS), 2)
+    # The extremes, and CTCs a paisa apart.
+    ctcs[:6] = (0, 0.01, 1200000.00, 1200000.01, 1275000.99, MAX_CTC)
+    declarations = None
+    if regime == 'old':
+        declarations = {
+            'investments_80c': np.round(rng.uniform(0, 200000, size=ROWS)),
+            'health_insurance_80d': np.round(rng.uniform(0, 60000, size=ROWS), 2),
+            'rent_paid': np.round(rng.uniform(0, 900000, size=ROWS)),
+            'metro': rng.random(ROWS) < 0.5,
+        }
+    columns = calculate_salary_breakdown_paise_batch(ctcs, regime=regime, declarations=declarations)
+    sample = np.concatenate([np.arange(6), rng.choice(np.arange(6, ROWS), size=SAMPLE, replace=False)])
+    scalar = []
+    for i in sample.tolist():
+        row_declarations = ({field: values[i].item() for field, values in declarations.items()}
+                            if declarations else None)
+        scalar.append(calculate_salary_breakdown_paise(ctcs[i].item(), regime=regime,
+                                                       declarations=row_declarations)['annual'])
+    return regime, ctcs, declarations, columns, sample, scalar
+
+
+def rounded(amount, unit):
+    """``amount`` rounded half up to a multiple of ``unit`` rupees."""
+    return (amount / unit).quantize(Decimal(1), rounding=ROUND_HALF_UP) * unit
+
+
+def reference_breakdown(ctc, regime, declarations):
+    """(PF, total tax, in-hand) in Decimal rupees, computed independently of salary_engine.exact."""
+    rules = load_rules(regime=regime)
+    paisa, rupee, ten = Decimal('0.01'), Decimal(1), Decimal(10)
+
+    def d(value):
+        return Decimal(str(value))
+
+    def slab_tax(income):
+        tax = Decimal(0)
+        bounds = list(rules.thresholds[1:]) + [None]
+        for threshold, bound, rate in zip(rules.thresholds, bounds, rules.rates):
+            if income > threshold:
+                top = income if bound is None else min(income, d(bound))
+                tax += rounded((top - d(threshold)) * d(rate), paisa)
+        return tax
+
+    ctc = d(ctc)
+    basic_da = rounded(ctc * d(rules.assumed_basic_da_share), paisa)
+    pf = rounded(min(basic_da, d(rules.pf_wage_ceiling_annual)) * d(rules.pf_rate), rupee)
+    taxable = ctc - d(rules.standard_deduction) - (0 if rules.pf_in_80c else pf)
+    if rules.allows_deductions:
+        city_share = rules.hra_metro_share if declarations['metro'] else rules.hra_non_metro_share
+        hra_exemption = max(Decimal(0), min(rounded(basic_da * d(rules.hra_assumed_share), paisa),
+                                            d(declarations['rent_paid'])
+                                            - rounded(basic_da * d(rules.hra_rent_excess), paisa),
+                                            rounded(basic_da * d(city_share), paisa)))
+        taxable -= (hra_exemption
+                    + min(pf + d(declarations['investments_80c']), d(rules.deduction_80c_limit))
+                    + min(d(declarations['health_insurance_80d']), d(rules.deduction_80d_limit)))
+    taxable = rounded(max(taxable, Decimal(0)), ten)
+
+    tax = slab_tax(taxable)
+    if taxable <= d(rules.rebate_income_limit):
+        tax = max(Decimal(0), tax - d(rules.rebate_max))
+    elif rules.rebate_marginal_relief:
+        tax = min(tax, taxable - d(rules.rebate_income_limit))
+    surcharge = Decimal(0)
+    for i, threshold in reversed(list(enumerate(rules.surcharge_thresholds))):
+        if taxable > threshold:
+            # Tax plus surcharge at the threshold, plus the income above it.
+            cap = rounded(slab_tax(d(threshold)) * (1 + (d(rules.surcharge_rates[i - 1]) if i else 0)), paisa)
+            surcharge = rounded(min(rounded(tax * d(rules.surcharge_rates[i]), paisa),
+                                    cap + taxable - d(threshold) - tax), rupee)
+            break
+    cess = rounded((tax + surcharge) * d(rules.cess_rate), rupee)
+    total_tax = rounded(tax + surcharge + cess, ten)
+    return pf, total_tax, ctc - total_tax - pf
+
+
+def test_batch_matches_scalar(payroll):
+    regime, _, _, columns, sample, scalar = payroll
+    names = [name for name in PAISE_COLUMNS + PAISE_DEDUCTION_COLUMNS if name in SCALAR_KEYS and name in columns]
+    assert ('hra_exemption' in names) == (regime == 'old')
+    for name in names:
+        assert columns[name].dtype == np.int64
+        expected = [annual[SCALAR_KEYS[name]] for annual in scalar]
+        assert columns[name][sample].tolist() == expected, name
+
+
+def test_ctc_converted_exactly(payroll):
+    _, ctcs, _, columns, _, _ = payroll
+    # Every CTC has whole paise, so the conversion is exact.
+    assert columns['ctc'].tolist() == [to_paise(f"{ctc:.2f}") for ctc in ctcs.tolist()]
+
+
+def test_every_payslip_adds_up(payroll):
+    _, _, _, columns, _, scalar = payroll
+    assert np.array_equal(columns['ctc'], columns['in_hand'] + columns['total_tax'] + columns['pf'])
+    for annual in scalar:
+        # As printed on the payslip, in rupees and paise.
+        assert (to_rupees(annual['Annual CTC'])
+                == to_rupees(annual['Annual In-Hand Salary']) + to_rupees(annual['Total Annual Income Tax'])
+                + to_rupees(annual['Annual Employee PF Deduction']))
+
+
+def test_totals_reconcile(payroll):
+    regime, ctcs, declarations, columns, sample, scalar = payroll
+    names = ('pf', 'total_tax', 'in_hand')
+    totals = dict.fromkeys(names, Decimal(0))
+    for i in sample.tolist():
+        row_declarations = {field: values[i].item() for field, values in declarations.items()} if declarations else None
+        expected = reference_breakdown(ctcs[i].item(), regime, row_declarations)
+        actual = tuple(to_rupees(columns[name][i]) for name in names)
+        assert actual == expected, (ctcs[i].item(), actual, expected)
+        # The components add up to the CTC, to the paisa.
+        assert sum(actual) == to_rupees(columns['ctc'][i])
+        for name, amount in zip(names, expected):
+            totals[name] += amount
+
+    for name in names:
+        # The int64 batch total and the scalar payslips over the sample,
+        # against the Decimal reference total.
+        assert to_rupees(int(np.sum(columns[name][sample]))) == totals[name], name
+        assert sum(to_rupees(annual[SCALAR_KEYS[name]]) for annual in scalar) == totals[name], name
+    assert to_rupees(int(np.sum(columns['ctc'][sample]))) == sum(totals.values())
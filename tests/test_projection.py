@@ -0,0 +1,48 @@
+"""
+Tests for the month-by-month payroll projection.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from salary_engine.projection import SCHEDULE_COLUMNS, PayrollProjection, read_events_csv
+
+
+def project(*batches):
+    projection = PayrollProjection()
+    for batch in batches:
+        employee_ids, kinds, months, amounts = zip(*batch)
+        projection.apply_events(employee_ids, kinds, months, amounts)
+    return projection
+
+
+def test_back_dated_event_stops_at_the_next_change():
+    # A raise in November is applied first; a correction from June arrives later.
+    projection = project([('e1', 'ctc', 0, 1000000), ('e1', 'ctc', 8, 1200000)],
+                         [('e1', 'ctc', 2, 1100000)])
+    assert projection.schedule('e1')['ctc'] == [1000000] * 2 + [1100000] * 6 + [1200000] * 4
+
+
+def test_events_in_several_files_match_one_file():
+    rng = np.random.default_rng(7)
+    events = [(f"e{rng.integers(50)}", 'ctc' if rng.random() < 0.7 else 'bonus',
+               int(rng.integers(12)), float(np.round(rng.uniform(0, 4000000))))
+              for _ in range(400)]
+    # Files applied in turn, later ones reaching back before earlier ones.
+    files = project(*(events[i:i + 40] for i in range(0, len(events), 40)))
+    # The same events in one file, grouped by employee in first-seen order
+    # (the files' row order) and otherwise in the order they arrived.
+    rows = {employee_id: row for row, employee_id in enumerate(files.employee_ids)}
+    one_file = project(sorted(events, key=lambda event: rows[event[0]]))
+    assert files.employee_ids == one_file.employee_ids
+    expected, actual = one_file.columns(), files.columns()
+    for name in SCHEDULE_COLUMNS:
+        np.testing.assert_array_equal(actual[name], expected[name], err_msg=name)
+
+
+def test_short_event_row_is_reported(tmp_path):
+    path = tmp_path / 'events.csv'
+    path.write_text('employee_id,month,kind,amount\ne1,0,ctc,1000000\ne2,3\n', encoding='utf-8')
+    with pytest.raises(ValueError, match=r'events\.csv:3: row has too few columns'):
+        read_events_csv(path)
@@ -0,0 +1,46 @@
+"""
+Tests for splitting a CTC with a salary structure.
+"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from salary_engine.batch import calculate_structure_breakdown_batch
+from salary_engine.structures import calculate_structure_breakdown
+
+
+def test_balance_fills_the_ctc():
+    results = calculate_structure_breakdown(2000000, 'senior')
+    assert sum(results['components'].values()) == pytest.approx(2000000, abs=1e-6)
+
+
+def test_components_above_the_ctc_are_rejected():
+    # The senior structure's fixed LTA and Basic-based components exceed a CTC of ₹1L.
+    with pytest.raises(ValueError, match="more than a CTC of 100,000.00"):
+        calculate_structure_breakdown(100000, 'senior')
+    with pytest.raises(ValueError, match="more than a CTC of 100,000.00"):
+        calculate_structure_breakdown_batch([2000000, 100000], ['standard', 'senior'])
+
+
+def test_minimum_amount_is_applied(tmp_path):
+    # Basic + DA is 40% of CTC, but at least ₹2,40,000 a year.
+    (tmp_path / 'floor.json').write_text(json.dumps({
+        'id': 'floor',
+        'version': 'floor.1',
+        'components': [
+            {'name': 'basic', 'label': 'Basic + DA', 'type': 'earning', 'rate': 0.40, 'min': 240000,
+             'basic_da': True},
+            {'name': 'special', 'label': 'Special Allowance', 'type': 'earning', 'balance': True},
+        ],
+    }), encoding='utf-8')
+    ctcs = [400000, 600000, 1000000]
+    expected = [240000, 240000, 400000]
+    scalar = [calculate_structure_breakdown(ctc, 'floor', directory=str(tmp_path))['components']['Basic + DA']
+              for ctc in ctcs]
+    batch = calculate_structure_breakdown_batch(ctcs, 'floor', directory=str(tmp_path))
+    assert scalar == pytest.approx(expected)
+    assert batch['basic_da'].tolist() == pytest.approx(expected)
+    assert batch['gross_salary'].tolist() == pytest.approx(ctcs)
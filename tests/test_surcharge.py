@@ -0,0 +1,94 @@
+"""
+Property tests for the slab, 87A and surcharge rules.
+
+Every rule set is run over random incomes and over incomes just around
+the 87A limit and each surcharge threshold, and checked for invariants
+that must hold whatever the slab figures are.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from salary_engine.batch import calculate_salary_breakdown_batch
+from salary_engine.core import calculate_salary_breakdown
+from salary_engine.rules import available_rules, load_rules
+
+# Allowed floating point slack, in rupees.
+EPSILON = 1e-6
+
+RULE_SETS = available_rules()
+
+
+def taxable_to_ctc(rules, taxable_income):
+    """The CTC whose taxable income (without declarations) is ``taxable_income``, above the PF ceiling."""
+    return taxable_income + rules.pf_rate * rules.pf_wage_ceiling_annual + rules.standard_deduction
+
+
+def sample_ctcs(rules, seed, samples=20000):
+    """Random CTCs up to ₹30 Cr, plus CTCs within ₹5L above and ₹1 around every threshold."""
+    rng = np.random.default_rng(seed)
+    limits = [rules.rebate_income_limit] + list(rules.surcharge_thresholds)
+    near = [taxable_to_ctc(rules, limit + offsets)
+            for limit in limits
+            for offsets in (rng.uniform(0, 500000, samples // (2 * len(limits))),
+                            np.array([-1.0, -0.01, 0.0, 0.01, 1.0]))]
+    spread = rng.uniform(0, 300000000, samples // 2)
+    return np.sort(np.concatenate([spread] + near))
+
+
+@pytest.fixture(params=RULE_SETS, ids=[f"{fy}-{regime}" for fy, regime in RULE_SETS])
+def case(request):
+    financial_year, regime = request.param
+    rules = load_rules(financial_year, regime)
+    ctcs = sample_ctcs(rules, seed=7)
+    columns = calculate_salary_breakdown_batch(ctcs, financial_year, regime)
+    return financial_year, regime, rules, ctcs, columns
+
+
+def test_batch_matches_scalar(case):
+    financial_year, regime, _, ctcs, columns = case
+    scalar = np.array([calculate_salary_breakdown(ctc, financial_year, regime)['annual']['Total Annual Income Tax']
+                       for ctc in ctcs.tolist()])
+    assert np.array_equal(scalar, columns['total_tax'])
+
+
+def test_total_tax_never_decreases_with_income(case):
+    *_, columns = case
+    assert (np.diff(columns['total_tax']) >= -EPSILON).all()
+
+
+def test_87a_marginal_relief_cap(case):
+    _, _, rules, _, columns = case
+    if not rules.rebate_marginal_relief:
+        pytest.skip("no 87A marginal relief in this rule set")
+    income = columns['taxable_income']
+    above = income > rules.rebate_income_limit
+    assert above.any()
+    assert (columns['tax_before_cess'][above] <= income[above] - rules.rebate_income_limit + EPSILON).all()
+
+
+def test_no_tax_up_to_the_87a_limit_when_fully_rebated(case):
+    _, _, rules, _, columns = case
+    within = columns['taxable_income'] <= rules.rebate_income_limit
+    full_rebate = np.array([rules.slab_tax(income) <= rules.rebate_max
+                            for income in columns['taxable_income'][within].tolist()], dtype=bool)
+    assert (columns['tax_before_cess'][within][full_rebate] == 0).all()
+
+
+def test_surcharge_marginal_relief_and_band_rate(case):
+    _, _, rules, _, columns = case
+    income = columns['taxable_income']
+    tax = columns['tax_before_cess']
+    surcharge = columns['surcharge']
+    assert (surcharge[income <= rules.surcharge_thresholds[0]] == 0).all()
+
+    upper_limits = rules.surcharge_thresholds[1:] + (float('inf'),)
+    for threshold, upper, rate, cap in zip(rules.surcharge_thresholds, upper_limits,
+                                           rules.surcharge_rates, rules.surcharge_caps):
+        band = (income > threshold) & (income <= upper)
+        assert band.any()
+        # Crossing the threshold costs no more than the income above it...
+        assert (tax[band] + surcharge[band] <= cap + (income[band] - threshold) + EPSILON).all()
+        # ...and the surcharge never exceeds the band's full rate.
+        assert (surcharge[band] <= tax[band] * rate + EPSILON).all()